@@ -0,0 +1,3 @@
+"""
+Benchmarki wydajności API (wyszukiwanie, czat) - patrz benchmarks/run.py.
+"""
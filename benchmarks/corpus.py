@@ -0,0 +1,180 @@
+"""
+Syntetyczny korpus prawny do benchmarków
+========================================
+Deterministyczny (ziarno) zbiór "aktów prawnych" podzielonych na artykuły
+i ustępy w kategoriach modułów API (ksef, b2b, zus, vat, default), z
+metadanymi act/article/paragraph jak przy ingestii ISAP. Embeddingi
+fragmentów liczone są tą samą funkcją co w fake Ollama, więc pytania
+benchmarku trafiają w tematycznie pasujące fragmenty.
+
+Seedowanie czyści tabele documents/chunks - dozwolone tylko w bazie,
+której nazwa zawiera "bench" (BENCH_DATABASE_URL).
+"""
+import csv
+import io
+import json
+import random
+from typing import Any, Dict, Iterator, List, Tuple
+
+from benchmarks.fake_ollama import EMBEDDING_DIM, format_vector, hash_embedding
+
+# kategoria -> (skrót aktu, tytuł, źródło, słownictwo)
+ACTS: Dict[str, Tuple[str, str, str, List[str]]] = {
+    "vat": ("vat", "Ustawa o podatku od towarów i usług", "Dz.U. 2004 Nr 54 poz. 535", [
+        "podatnik", "faktura", "stawka", "odliczenie", "podatek naliczony", "podatek należny",
+        "dostawa towarów", "świadczenie usług", "eksport", "wewnątrzwspólnotowa dostawa",
+        "mechanizm podzielonej płatności", "ewidencja", "deklaracja", "JPK_V7M", "zwolnienie",
+    ]),
+    "ksef": ("ksef", "Krajowy System e-Faktur", "Dz.U. 2023 poz. 1598", [
+        "faktura ustrukturyzowana", "numer KSeF", "tryb offline", "uwierzytelnienie",
+        "token", "schemat FA(3)", "wystawienie", "odbiór faktury", "awaria systemu",
+        "pełnomocnictwo", "identyfikator", "obowiązek", "termin wdrożenia", "korekta",
+    ]),
+    "zus": ("sus", "Ustawa o systemie ubezpieczeń społecznych", "Dz.U. 1998 Nr 137 poz. 887", [
+        "składka emerytalna", "składka rentowa", "ubezpieczenie chorobowe", "płatnik składek",
+        "podstawa wymiaru", "ulga na start", "mały ZUS plus", "zgłoszenie do ubezpieczeń",
+        "składka zdrowotna", "przedsiębiorca", "deklaracja rozliczeniowa", "termin płatności",
+    ]),
+    "b2b": ("kp", "Kodeks pracy", "Dz.U. 1974 Nr 24 poz. 141", [
+        "stosunek pracy", "umowa o pracę", "kierownictwo pracodawcy", "wynagrodzenie",
+        "czas pracy", "miejsce pracy", "podporządkowanie", "umowa cywilnoprawna",
+        "inspekcja pracy", "ustalenie istnienia stosunku pracy", "świadczenie pracy", "urlop",
+    ]),
+    "default": ("op", "Ordynacja podatkowa", "Dz.U. 1997 Nr 137 poz. 926", [
+        "zobowiązanie podatkowe", "organ podatkowy", "interpretacja indywidualna", "przedawnienie",
+        "odsetki za zwłokę", "korekta deklaracji", "czynny żal", "kontrola podatkowa",
+        "pełnomocnik", "doręczenie", "termin", "decyzja",
+    ]),
+}
+
+TEMPLATES = [
+    "{a} jest obowiązany do {b} w terminie określonym w przepisach, z uwzględnieniem {c}.",
+    "W przypadku gdy {a} dotyczy {b}, stosuje się odpowiednio przepisy o {c}.",
+    "Przepisu ust. 1 nie stosuje się, jeżeli {a} nie obejmuje {b} ani {c}.",
+    "{a} ustala się na podstawie {b}, a {c} dokumentuje się w ewidencji.",
+    "Minister właściwy do spraw finansów publicznych określi, w drodze rozporządzenia, {a} oraz {b}.",
+]
+
+QUESTION_TEMPLATES = [
+    "Jaki jest termin na {a}?",
+    "Czy {a} obejmuje {b}?",
+    "Jak rozliczyć {a} przy {b}?",
+    "Kiedy stosuje się przepisy o {a}?",
+]
+
+
+def _sentence(rng: random.Random, vocabulary: List[str]) -> str:
+    a, b, c = rng.sample(vocabulary, 3)
+    text = rng.choice(TEMPLATES).format(a=a, b=b, c=c)
+    return text[0].upper() + text[1:]
+
+
+def generate_corpus(chunks: int, seed: int = 42, chunks_per_document: int = 20) -> Iterator[Dict[str, Any]]:
+    """Dokumenty (akty podzielone na części) z listą fragmentów; łącznie `chunks` fragmentów."""
+    rng = random.Random(seed)
+    categories = sorted(ACTS)
+    produced = 0
+    part = 0
+    while produced < chunks:
+        category = categories[part % len(categories)]
+        act, title, source, vocabulary = ACTS[category]
+        count = min(chunks_per_document, chunks - produced)
+        first_article = part // len(categories) * chunks_per_document + 1
+        document_chunks = []
+        for offset in range(count):
+            article = str(first_article + offset)
+            paragraph = str(rng.randint(1, 5))
+            content = f"Art. {article} ust. {paragraph}. " + " ".join(
+                _sentence(rng, vocabulary) for _ in range(rng.randint(3, 6)))
+            document_chunks.append({
+                "chunk_index": offset,
+                "content": content,
+                "metadata": {"act": act, "article": article, "paragraph": paragraph, "bench": True},
+            })
+        yield {
+            "title": f"{title} (część {part // len(categories) + 1})",
+            "source": source,
+            "category": category,
+            "content": "\n\n".join(c["content"] for c in document_chunks),
+            "chunks": document_chunks,
+        }
+        produced += count
+        part += 1
+
+
+def sample_queries(count: int, seed: int = 7) -> List[Tuple[str, str]]:
+    """Pytania (tekst, kategoria) zbudowane ze słownictwa korpusu."""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        category = rng.choice(sorted(ACTS))
+        a, b = rng.sample(ACTS[category][3], 2)
+        queries.append((rng.choice(QUESTION_TEMPLATES).format(a=a, b=b), category))
+    return queries
+
+
+def corpus_marker(chunks: int, seed: int, dim: int) -> str:
+    return f"bench:chunks={chunks},seed={seed},dim={dim}"
+
+
+def _chunk_rows(document_id: int, document: Dict[str, Any], dim: int) -> Iterator[List[Any]]:
+    for chunk in document["chunks"]:
+        yield [
+            document_id,
+            chunk["chunk_index"],
+            chunk["content"],
+            format_vector(hash_embedding(chunk["content"], dim)),
+            len(chunk["content"].split()),
+            json.dumps(chunk["metadata"], ensure_ascii=False),
+        ]
+
+
+def seed_database(conn, chunks: int, seed: int = 42, dim: int = EMBEDDING_DIM, force: bool = False,
+                  batch_documents: int = 50) -> Dict[str, Any]:
+    """Wypełnia bazę korpusem; pomija, gdy baza ma już korpus o tych parametrach."""
+    marker = corpus_marker(chunks, seed, dim)
+    with conn.cursor() as cur:
+        cur.execute("SELECT current_database(), obj_description('chunks'::regclass, 'pg_class')")
+        database, current = cur.fetchone()
+        if "bench" not in database:
+            raise RuntimeError(f"Refusing to seed database {database!r}: name must contain 'bench'")
+        if current == marker and not force:
+            return {"seeded": False, "marker": marker}
+
+        cur.execute("TRUNCATE documents, chunks RESTART IDENTITY CASCADE")
+        documents = 0
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        pending = 0
+        for document in generate_corpus(chunks, seed):
+            cur.execute(
+                "INSERT INTO documents (title, source, category, content) VALUES (%s, %s, %s, %s) RETURNING id",
+                (document["title"], document["source"], document["category"], document["content"]),
+            )
+            document_id = cur.fetchone()[0]
+            writer.writerows(_chunk_rows(document_id, document, dim))
+            documents += 1
+            pending += 1
+            if pending >= batch_documents:
+                _copy_chunks(cur, buffer)
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        if pending:
+            _copy_chunks(cur, buffer)
+        cur.execute(f"COMMENT ON TABLE chunks IS '{marker}'")
+        conn.commit()
+        # Statystyki planera jak na produkcyjnej bazie po autovacuum
+        conn.autocommit = True
+        cur.execute("ANALYZE documents")
+        cur.execute("ANALYZE chunks")
+        conn.autocommit = False
+    return {"seeded": True, "marker": marker, "documents": documents, "chunks": chunks}
+
+
+def _copy_chunks(cur, buffer: io.StringIO):
+    buffer.seek(0)
+    cur.copy_expert(
+        "COPY chunks (document_id, chunk_index, content, embedding, tokens, metadata) FROM STDIN WITH (FORMAT csv)",
+        buffer,
+    )
@@ -0,0 +1,369 @@
+"""
+Fake Ollama - deterministyczny zamiennik Ollama do benchmarków i testów chaosu
+==============================================================================
+Serwer HTTP (stdlib) z podzbiorem API Ollama używanym przez API:
+
+- POST /api/embeddings - wektor z haszy słów tekstu (te same słowa -> bliskie
+  wektory, więc wyszukiwanie wektorowe zwraca sensowne fragmenty),
+- POST /api/generate - odpowiedź po czasie "prompt eval", potem tokeny
+  w tempie `tokens_per_second`; `stream: true` (domyślnie, jak w Ollama)
+  wysyła NDJSON token po tokenie,
+- GET  /api/tags, GET /api/ps - model zawsze zainstalowany i w pamięci.
+
+Awarie na żądanie (`Faults`): odsetek błędów 500, zawieszeń (odpowiedź po
+`hang_seconds` - klient dostaje timeout) i zerwanych połączeń, albo
+"następne N żądań" w wybranym trybie. Losowanie z ziarnem - ta sama
+kolejność żądań daje te same awarie. Sterowanie w trakcie działania:
+
+    POST /_fake/faults {"error_rate": 0.1, "fail_next": 3, "mode": "timeout"}
+    GET  /_fake/stats
+
+    python -m benchmarks.fake_ollama --port 11435 --tokens-per-second 20
+    OLLAMA_URL=http://localhost:11435 uvicorn main:app
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+# Wymiar kolumny chunks.embedding (vector(4096))
+EMBEDDING_DIM = 4096
+FAULT_MODES = ("error", "timeout", "disconnect")
+
+_WORD = re.compile(r"\w{3,}", re.UNICODE)
+
+
+def hash_embedding(text: str, dim: int = EMBEDDING_DIM) -> List[float]:
+    """Znormalizowany wektor "feature hashing" słów tekstu (deterministyczny)."""
+    vector = [0.0] * dim
+    for word in _WORD.findall(text.lower()):
+        digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+        index = int.from_bytes(digest[:4], "little") % dim
+        vector[index] += 1.0 if digest[4] & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector))
+    if not norm:
+        # Pusty tekst - stały wektor jednostkowy zamiast zerowego (cosine z zerem = NaN)
+        vector[0] = 1.0
+        return vector
+    return [v / norm for v in vector]
+
+
+def format_vector(vector: List[float]) -> str:
+    """Literał pgvector; zera bez części ułamkowej (wektory są rzadkie)."""
+    return "[" + ",".join("0" if v == 0 else f"{v:.5f}" for v in vector) + "]"
+
+
+@dataclass
+class Faults:
+    """Wstrzykiwane awarie; `fail_next` ma pierwszeństwo przed losowaniem."""
+
+    error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    disconnect_rate: float = 0.0
+    hang_seconds: float = 30.0
+    fail_next: int = 0
+    mode: str = "error"
+    # Ścieżki objęte awariami (puste = wszystkie /api/*)
+    paths: List[str] = field(default_factory=list)
+
+
+@dataclass
+class FakeOllamaConfig:
+    model: str = "mwiewior/bielik"
+    dim: int = EMBEDDING_DIM
+    embed_latency_ms: float = 20.0
+    # Czas do pierwszego tokenu (prompt eval) i tempo generacji
+    generate_latency_ms: float = 500.0
+    tokens_per_second: float = 50.0
+    max_tokens: int = 64
+    response: str = ("Zgodnie z przepisami przytoczonymi w kontekście podatnik powinien "
+                     "wystawić fakturę i rozliczyć podatek w terminie określonym w ustawie.")
+    seed: int = 0
+    faults: Faults = field(default_factory=Faults)
+
+
+class FakeOllamaState:
+    """Konfiguracja, awarie i liczniki współdzielone przez wątki serwera."""
+
+    def __init__(self, config: FakeOllamaConfig):
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {}
+
+    def count(self, key: str):
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def set_faults(self, **changes: Any) -> Faults:
+        with self._lock:
+            unknown = set(changes) - set(asdict(self.config.faults))
+            if unknown:
+                raise ValueError(f"Unknown fault settings: {', '.join(sorted(unknown))}")
+            if changes.get("mode", self.config.faults.mode) not in FAULT_MODES:
+                raise ValueError(f"mode must be one of {FAULT_MODES}")
+            self.config.faults = Faults(**{**asdict(self.config.faults), **changes})
+            return self.config.faults
+
+    def draw_fault(self, path: str) -> Optional[str]:
+        """Tryb awarii dla tego żądania albo None."""
+        with self._lock:
+            faults = self.config.faults
+            if faults.paths and path not in faults.paths:
+                return None
+            if faults.fail_next > 0:
+                faults.fail_next -= 1
+                mode = faults.mode
+            else:
+                roll = self._rng.random()
+                mode = None
+                for candidate, rate in (("error", faults.error_rate), ("timeout", faults.timeout_rate),
+                                        ("disconnect", faults.disconnect_rate)):
+                    if roll < rate:
+                        mode = candidate
+                        break
+                    roll -= rate
+            if mode:
+                key = f"fault.{mode}"
+                self.stats[key] = self.stats.get(key, 0) + 1
+            return mode
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    server_version = "FakeOllama/1.0"
+    protocol_version = "HTTP/1.1"
+    state: FakeOllamaState
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def config(self) -> FakeOllamaConfig:
+        return self.state.config
+
+    # ─── Odpowiedzi ───
+
+    def _send_json(self, payload: Dict[str, Any], status: int = 200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _start_stream(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _send_chunk(self, payload: Dict[str, Any]):
+        data = (json.dumps(payload) + "\n").encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _end_stream(self):
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _disconnect(self):
+        self.close_connection = True
+        self.connection.close()
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _apply_fault(self, mode: Optional[str]) -> bool:
+        """Obsługuje awarię; True - żądanie zakończone."""
+        if mode == "error":
+            self._send_json({"error": "fake ollama: injected failure"}, 500)
+        elif mode == "timeout":
+            time.sleep(self.config.faults.hang_seconds)
+            self._send_json({"error": "fake ollama: injected timeout"}, 503)
+        elif mode == "disconnect":
+            self._disconnect()
+        return mode is not None
+
+    def _known_model(self, payload: Dict[str, Any]) -> bool:
+        name = (payload.get("model") or "").split(":")[0]
+        if name == self.config.model:
+            return True
+        self._send_json({"error": f"model '{payload.get('model')}' not found"}, 404)
+        return False
+
+    # ─── Endpointy ───
+
+    def do_GET(self):
+        self.state.count(self.path)
+        model = {"name": f"{self.config.model}:latest", "model": f"{self.config.model}:latest", "size": 0}
+        if self.path == "/api/tags":
+            self._send_json({"models": [model]})
+        elif self.path == "/api/ps":
+            self._send_json({"models": [{**model, "expires_at": "2999-01-01T00:00:00Z", "size_vram": 0}]})
+        elif self.path == "/_fake/stats":
+            self._send_json({"stats": dict(self.state.stats), "faults": asdict(self.config.faults)})
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def do_POST(self):
+        self.state.count(self.path)
+        try:
+            payload = self._read_json()
+        except ValueError:
+            self._send_json({"error": "invalid JSON"}, 400)
+            return
+        if self.path == "/_fake/faults":
+            try:
+                self._send_json({"faults": asdict(self.state.set_faults(**payload))})
+            except (TypeError, ValueError) as e:
+                self._send_json({"error": str(e)}, 400)
+            return
+        if self.path not in ("/api/embeddings", "/api/generate"):
+            self._send_json({"error": "not found"}, 404)
+            return
+        if self._apply_fault(self.state.draw_fault(self.path)) or not self._known_model(payload):
+            return
+        if self.path == "/api/embeddings":
+            time.sleep(self.config.embed_latency_ms / 1000)
+            self._send_json({"embedding": hash_embedding(payload.get("prompt") or "", self.config.dim)})
+        else:
+            self._generate(payload)
+
+    def _generate(self, payload: Dict[str, Any]):
+        prompt = payload.get("prompt") or ""
+        stream = payload.get("stream", True)
+        base = {"model": payload.get("model", self.config.model)}
+        if not prompt:
+            # Pusty prompt tylko ładuje model (rozgrzewanie)
+            final = {**base, "created_at": _now(), "response": "", "done": True, "load_duration": 0}
+            if stream:
+                self._start_stream()
+                self._send_chunk(final)
+                self._end_stream()
+            else:
+                self._send_json(final)
+            return
+
+        limit = (payload.get("options") or {}).get("num_predict") or self.config.max_tokens
+        tokens = _tokens(self.config.response)[:max(1, min(int(limit), self.config.max_tokens))]
+        delay = 1 / self.config.tokens_per_second if self.config.tokens_per_second > 0 else 0
+        time.sleep(self.config.generate_latency_ms / 1000)
+        started = time.perf_counter()
+        if stream:
+            self._start_stream()
+            for token in tokens:
+                time.sleep(delay)
+                self._send_chunk({**base, "created_at": _now(), "response": token, "done": False})
+        else:
+            time.sleep(delay * len(tokens))
+        eval_ns = int((time.perf_counter() - started) * 1e9)
+        final = {
+            **base,
+            "created_at": _now(),
+            "done": True,
+            "done_reason": "length" if len(tokens) < len(_tokens(self.config.response)) else "stop",
+            "prompt_eval_count": len(prompt.split()),
+            "prompt_eval_duration": int(self.config.generate_latency_ms * 1e6),
+            "eval_count": len(tokens),
+            "eval_duration": eval_ns,
+            "load_duration": 0,
+        }
+        if stream:
+            self._send_chunk({**final, "response": ""})
+            self._end_stream()
+        else:
+            self._send_json({**final, "response": "".join(tokens)})
+
+
+def _tokens(text: str) -> List[str]:
+    """Podział jak u tokenizerów BPE: słowo razem z poprzedzającą spacją."""
+    return re.findall(r"\s*\S+", text)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class FakeOllama:
+    """Serwer w wątku w tle: `with FakeOllama(config) as ollama: ollama.url`."""
+
+    def __init__(self, config: Optional[FakeOllamaConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.state = FakeOllamaState(config or FakeOllamaConfig())
+        handler = type("Handler", (FakeOllamaHandler,), {"state": self.state})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return dict(self.state.stats)
+
+    def set_faults(self, **changes: Any) -> Faults:
+        return self.state.set_faults(**changes)
+
+    def clear_faults(self):
+        self.state.set_faults(**asdict(Faults(hang_seconds=self.state.config.faults.hang_seconds)))
+
+    def start(self) -> "FakeOllama":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="fake-ollama", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "FakeOllama":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deterministyczny zamiennik Ollama")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--model", default=FakeOllamaConfig.model)
+    parser.add_argument("--dim", type=int, default=EMBEDDING_DIM)
+    parser.add_argument("--embed-latency-ms", type=float, default=FakeOllamaConfig.embed_latency_ms)
+    parser.add_argument("--generate-latency-ms", type=float, default=FakeOllamaConfig.generate_latency_ms)
+    parser.add_argument("--tokens-per-second", type=float, default=FakeOllamaConfig.tokens_per_second)
+    parser.add_argument("--max-tokens", type=int, default=FakeOllamaConfig.max_tokens)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--disconnect-rate", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=Faults.hang_seconds)
+    args = parser.parse_args()
+    config = FakeOllamaConfig(
+        model=args.model, dim=args.dim, embed_latency_ms=args.embed_latency_ms,
+        generate_latency_ms=args.generate_latency_ms, tokens_per_second=args.tokens_per_second,
+        max_tokens=args.max_tokens, seed=args.seed,
+        faults=Faults(error_rate=args.error_rate, timeout_rate=args.timeout_rate,
+                      disconnect_rate=args.disconnect_rate, hang_seconds=args.hang_seconds),
+    )
+    server = FakeOllama(config, host=args.host, port=args.port)
+    print(f"Fake Ollama on {server.url} (model {config.model}, dim {config.dim}, "
+          f"{config.tokens_per_second} tok/s)")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Gunicorn - produkcyjne uruchomienie API
+=======================================
+    gunicorn -c gunicorn.conf.py main:app
+
+- WEB_CONCURRENCY procesów uvicorn (domyślnie liczba rdzeni),
+- `preload_app`: aplikacja importowana raz w procesie master, potem
+  `services.warmup.preload()` (migracje, indeks cytowań, centroidy
+  routera modułów) i `gc.freeze()` - workery dzielą ten stan po fork
+  jako strony copy-on-write,
+- WEB_CONCURRENCY trafia do środowiska przed importem aplikacji, więc
+  pula DB, cache L1 i limity rejestrów dzielą budżety instancji przez
+  liczbę procesów (services.runtime),
+- metryki Prometheus w trybie wieloprocesowym (PROMETHEUS_MULTIPROC_DIR).
+
+Dev bez zmian: `uvicorn main:app --reload` (jeden proces).
+"""
+import gc
+import multiprocessing
+import os
+import shutil
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY") or multiprocessing.cpu_count())
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+# Generacja odpowiedzi przez Ollama trwa do kilkudziesięciu sekund
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "180"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+# Okresowy restart workera (0 = wyłączony); jitter rozkłada restarty w czasie
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "0"))
+
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+# Musi być ustawione przed importem prometheus_client (preload aplikacji)
+PROMETHEUS_MULTIPROC_DIR = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/bielik-prometheus")
+shutil.rmtree(PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
+os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+
+def when_ready(server):
+    """Master po imporcie aplikacji, przed uruchomieniem workerów."""
+    from services.warmup import preload
+
+    try:
+        preload()
+    except Exception as e:
+        # Nieudane migracje - workery bez schematu zwracałyby tylko 500
+        server.log.error(f"Preload failed, not starting workers: {e}")
+        server.halt(reason="preload failed", exit_status=1)
+    # Obiekty z preloadu poza GC - zbieranie nie dotyka ich stron po fork
+    gc.freeze()
+    server.log.info(f"Preload done, starting {workers} workers")
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -5,15 +5,23 @@ FastAPI z RAG dla polskich przedsiębiorców
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
-from routers import chat, documents, health, layout, commands_documents, events, projects, commands_projects, context, sources
+from routers import chat, documents, imports, health, layout, commands_documents, events, projects, commands_projects, context, sources, metrics, jobs
+from services import migrations, warmup
+from services.db import db_pool
+from services.health import health_monitor
+from services.metrics import MetricsMiddleware
+from services.tracing import TraceContextFilter, TracingMiddleware
 
 # Konfiguracja logowania
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    format='%(asctime)s - %(name)s - %(levelname)s - [%(trace_id)s] %(message)s'
 )
+for _handler in logging.getLogger().handlers:
+    _handler.addFilter(TraceContextFilter())
 logger = logging.getLogger(__name__)
 
 
@@ -21,8 +29,24 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Lifecycle events dla aplikacji."""
     logger.info("🦅 Bielik MVP API uruchamia się...")
+
+    if migrations.MIGRATE_ON_STARTUP:
+        # Błąd migracji przerywa start - bez schematu zapytania i tak kończyłyby się 500
+        applied = await asyncio.to_thread(migrations.migrate)
+        logger.info(f"Migracje schematu: {applied or 'schemat aktualny'}")
+
+    background_tasks = [health_monitor.start()]
+    if warmup.WARMUP_ON_STARTUP:
+        # W tle - /health/live odpowiada od razu, model ładuje się równolegle
+        background_tasks.append(asyncio.create_task(asyncio.to_thread(warmup.warm)))
+
     yield
+
     logger.info("🦅 Bielik MVP API zatrzymuje się...")
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    db_pool.close()
 
 
 app = FastAPI(
@@ -54,11 +78,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Total-Count-Estimate", "X-Trace-Id"],
 )
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)  # najbardziej zewnętrzny: trace_id widoczny w całym żądaniu
 
 # Routery
 app.include_router(health.router, tags=["health"])
+app.include_router(metrics.router, tags=["metrics"])
 app.include_router(chat.router, prefix="/api/v1", tags=["chat"])
+app.include_router(imports.router, prefix="/api/v1", tags=["documents"])  # przed /documents/{document_id}
 app.include_router(documents.router, prefix="/api/v1", tags=["documents"])
 app.include_router(layout.router, prefix="/api/v1", tags=["layout"])
 app.include_router(commands_documents.router, prefix="/api/v1", tags=["commands-documents"])
@@ -67,6 +96,7 @@ app.include_router(projects.router, prefix="/api/v1", tags=["projects"])
 app.include_router(commands_projects.router, prefix="/api/v1", tags=["commands-projects"])
 app.include_router(context.router, prefix="/api/v1", tags=["context"])
 app.include_router(sources.router, prefix="/api/v1", tags=["sources"])
+app.include_router(jobs.router, prefix="/api/v1", tags=["jobs"])
 
 
 @app.get("/", tags=["root"])
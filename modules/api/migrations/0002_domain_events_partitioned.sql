@@ -0,0 +1,63 @@
+-- Event store partycjonowany po miesiącach created_at (services/events.py):
+-- zapytania z zakresem czasu trafiają tylko do właściwych partycji, a stare
+-- miesiące można odpiąć i zarchiwizować (apply_retention) bez DELETE na
+-- dużej tabeli. Zwykła tabela domain_events z pierwotnego schematu jest
+-- przepisywana do partycjonowanej z zachowaniem eventów.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_class WHERE oid = to_regclass('public.domain_events') AND relkind = 'r') THEN
+        ALTER TABLE domain_events RENAME TO domain_events_unpartitioned;
+        ALTER TABLE domain_events_unpartitioned RENAME CONSTRAINT domain_events_pkey TO domain_events_unpartitioned_pkey;
+        ALTER INDEX IF EXISTS idx_domain_events_agg RENAME TO idx_domain_events_unpartitioned_agg;
+    END IF;
+END;
+$$;
+
+CREATE TABLE IF NOT EXISTS domain_events (
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
+    aggregate_type TEXT NOT NULL,
+    aggregate_id TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    payload JSONB NOT NULL,
+    metadata JSONB DEFAULT '{}',
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE INDEX IF NOT EXISTS idx_domain_events_agg
+    ON domain_events(aggregate_type, aggregate_id, created_at);
+
+-- Tworzy (idempotentnie) partycję miesięczną dla podanej daty
+CREATE OR REPLACE FUNCTION ensure_domain_events_partition(for_date DATE)
+RETURNS TEXT AS $$
+DECLARE
+    month_start DATE := date_trunc('month', for_date)::date;
+    month_end DATE := (date_trunc('month', for_date) + INTERVAL '1 month')::date;
+    partition_name TEXT := 'domain_events_' || to_char(month_start, 'YYYY_MM');
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF domain_events FOR VALUES FROM (%L) TO (%L)',
+        partition_name, month_start, month_end
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+    IF to_regclass('public.domain_events_unpartitioned') IS NOT NULL THEN
+        PERFORM ensure_domain_events_partition(m.month::date)
+        FROM (
+            SELECT DISTINCT date_trunc('month', COALESCE(created_at, NOW())) AS month
+            FROM domain_events_unpartitioned
+        ) m;
+        INSERT INTO domain_events (id, aggregate_type, aggregate_id, event_type, payload, metadata, created_at)
+        SELECT id, aggregate_type, aggregate_id, event_type, payload, metadata, COALESCE(created_at, NOW())
+        FROM domain_events_unpartitioned;
+        DROP TABLE domain_events_unpartitioned;
+    END IF;
+END;
+$$;
+
+SELECT ensure_domain_events_partition(CURRENT_DATE);
+SELECT ensure_domain_events_partition((CURRENT_DATE + INTERVAL '1 month')::date);
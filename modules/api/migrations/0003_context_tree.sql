@@ -0,0 +1,36 @@
+-- Read model Kontakty -> Projekty -> Pliki, aktualizowany przyrostowo z
+-- eventów projektów (services/context_tree.py), i wersje read modeli
+-- (źródło ETagów). Wypełniany z istniejących projektów.
+CREATE TABLE IF NOT EXISTS context_tree (
+    project_id INTEGER PRIMARY KEY,
+    contact TEXT NOT NULL,
+    name TEXT,
+    description TEXT,
+    files JSONB NOT NULL DEFAULT '[]',
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_context_tree_contact ON context_tree(contact, project_id DESC);
+
+CREATE TABLE IF NOT EXISTS read_model_versions (
+    name TEXT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+INSERT INTO context_tree (project_id, contact, name, description, files)
+SELECT
+    p.id,
+    COALESCE(p.contact, 'Inne'),
+    p.name,
+    p.description,
+    COALESCE(
+        (SELECT jsonb_agg(jsonb_build_object('id', f.id, 'filename', f.filename, 'path', f.path) ORDER BY f.id)
+         FROM project_files f WHERE f.project_id = p.id),
+        '[]'::jsonb
+    )
+FROM projects p
+ON CONFLICT (project_id) DO NOTHING;
+
+INSERT INTO read_model_versions (name, version) VALUES ('context_tree', 1)
+ON CONFLICT (name) DO NOTHING;
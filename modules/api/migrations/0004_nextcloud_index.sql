@@ -0,0 +1,27 @@
+-- Indeks folderów i plików e-Doręczeń z Nextcloud, wypełniany w tle przez
+-- services/nextcloud.py (PROPFIND + ETagi folderów).
+CREATE TABLE IF NOT EXISTS nextcloud_folders (
+    owner TEXT NOT NULL,                -- konto WebDAV
+    folder TEXT NOT NULL,               -- '' = katalog główny, INBOX, SENT, ...
+    etag TEXT,
+    file_count INTEGER NOT NULL DEFAULT 0,
+    synced_at TIMESTAMP,
+    PRIMARY KEY (owner, folder)
+);
+
+CREATE TABLE IF NOT EXISTS nextcloud_files (
+    owner TEXT NOT NULL,
+    path TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    etag TEXT,
+    last_modified TIMESTAMPTZ,
+    size BIGINT,
+    content_type TEXT,
+    is_dir BOOLEAN NOT NULL DEFAULT FALSE,
+    synced_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (owner, path)
+);
+
+CREATE INDEX IF NOT EXISTS idx_nextcloud_files_folder
+    ON nextcloud_files(owner, folder, last_modified DESC);
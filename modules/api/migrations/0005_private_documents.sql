@@ -0,0 +1,116 @@
+-- Prywatna część indeksu (treści e-Doręczeń użytkownika, services/ingestion.py):
+-- user_id NULL = baza wiedzy, inaczej dokument/fragment widoczny tylko dla
+-- właściciela. Funkcje wyszukiwania przeszukują wyłącznie część publiczną.
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS user_id TEXT;
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS user_id TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_documents_user_id ON documents(user_id) WHERE user_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_chunks_user_id ON chunks(user_id) WHERE user_id IS NOT NULL;
+
+-- Postęp indeksowania treści e-Doręczeń: plik jest (ponownie) pobierany
+-- i indeksowany tylko gdy jego ETag w nextcloud_files różni się od
+-- ETagu zapisanego tutaj.
+CREATE TABLE IF NOT EXISTS nextcloud_ingest_state (
+    owner TEXT NOT NULL,
+    path TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    etag TEXT,
+    document_id INTEGER REFERENCES documents(id) ON DELETE SET NULL,
+    chunks INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    ingested_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (owner, path)
+);
+
+-- Funkcja do wyszukiwania podobnych chunków
+CREATE OR REPLACE FUNCTION search_similar_chunks(
+    query_embedding vector(4096),
+    category_filter TEXT DEFAULT NULL,
+    limit_count INTEGER DEFAULT 5
+)
+RETURNS TABLE (
+    chunk_id INTEGER,
+    document_id INTEGER,
+    content TEXT,
+    title TEXT,
+    source TEXT,
+    category TEXT,
+    similarity FLOAT
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        c.id as chunk_id,
+        c.document_id,
+        c.content,
+        d.title,
+        d.source,
+        d.category,
+        1 - (c.embedding <=> query_embedding) as similarity
+    FROM chunks c
+    JOIN documents d ON c.document_id = d.id
+    WHERE (category_filter IS NULL OR d.category = category_filter)
+      AND c.user_id IS NULL
+    ORDER BY c.embedding <=> query_embedding
+    LIMIT limit_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Funkcja do hybrydowego wyszukiwania (vector + full-text)
+CREATE OR REPLACE FUNCTION hybrid_search(
+    query_text TEXT,
+    query_embedding vector(4096),
+    category_filter TEXT DEFAULT NULL,
+    limit_count INTEGER DEFAULT 5,
+    vector_weight FLOAT DEFAULT 0.7
+)
+RETURNS TABLE (
+    chunk_id INTEGER,
+    content TEXT,
+    title TEXT,
+    source TEXT,
+    score FLOAT
+) AS $$
+BEGIN
+    RETURN QUERY
+    WITH vector_results AS (
+        SELECT 
+            c.id,
+            c.content,
+            d.title,
+            d.source,
+            1 - (c.embedding <=> query_embedding) as vector_score
+        FROM chunks c
+        JOIN documents d ON c.document_id = d.id
+        WHERE (category_filter IS NULL OR d.category = category_filter)
+          AND c.user_id IS NULL
+        ORDER BY c.embedding <=> query_embedding
+        LIMIT limit_count * 2
+    ),
+    text_results AS (
+        SELECT 
+            c.id,
+            c.content,
+            d.title,
+            d.source,
+            ts_rank(to_tsvector('simple', c.content), plainto_tsquery('simple', query_text)) as text_score
+        FROM chunks c
+        JOIN documents d ON c.document_id = d.id
+        WHERE (category_filter IS NULL OR d.category = category_filter)
+          AND c.user_id IS NULL
+          AND to_tsvector('simple', c.content) @@ plainto_tsquery('simple', query_text)
+        LIMIT limit_count * 2
+    )
+    SELECT DISTINCT ON (COALESCE(v.id, t.id))
+        COALESCE(v.id, t.id) as chunk_id,
+        COALESCE(v.content, t.content) as content,
+        COALESCE(v.title, t.title) as title,
+        COALESCE(v.source, t.source) as source,
+        (COALESCE(v.vector_score, 0) * vector_weight + 
+         COALESCE(t.text_score, 0) * (1 - vector_weight)) as score
+    FROM vector_results v
+    FULL OUTER JOIN text_results t ON v.id = t.id
+    ORDER BY COALESCE(v.id, t.id), score DESC
+    LIMIT limit_count;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,14 @@
+-- Drugi poziom cache odpowiedzi rejestrów CEIDG, KRS, VIES (services/cache.py;
+-- pierwszy to LRU w procesie). found = false to wynik negatywny (krótszy
+-- TTL); data = surowa odpowiedź rejestru.
+CREATE TABLE IF NOT EXISTS registry_cache (
+    registry TEXT NOT NULL,
+    identifier TEXT NOT NULL,
+    found BOOLEAN NOT NULL,
+    data JSONB,
+    fetched_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    expires_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (registry, identifier)
+);
+
+CREATE INDEX IF NOT EXISTS idx_registry_cache_expires ON registry_cache(registry, expires_at);
@@ -0,0 +1,30 @@
+-- Lokalna kopia aktów z ISAP (services/isap_sync.py): legal_acts trzyma stan
+-- synchronizacji (ETag, Last-Modified, hash treści), legal_act_versions -
+-- kolejne wersje tekstu.
+CREATE TABLE IF NOT EXISTS legal_acts (
+    key TEXT PRIMARY KEY,               -- klucz z ISAPClient.KEY_DOCUMENTS
+    isap_id TEXT NOT NULL,              -- np. WDU20040540535
+    eli TEXT NOT NULL,                  -- akt pierwotny, np. DU/2004/535
+    text_eli TEXT,                      -- źródło tekstu (najnowszy tekst jednolity)
+    title TEXT NOT NULL,
+    category TEXT NOT NULL,
+    document_id INTEGER REFERENCES documents(id) ON DELETE SET NULL,
+    current_version INTEGER NOT NULL DEFAULT 0,
+    etag TEXT,
+    last_modified TEXT,
+    content_sha256 TEXT,
+    checked_at TIMESTAMPTZ,
+    changed_at TIMESTAMPTZ
+);
+
+CREATE TABLE IF NOT EXISTS legal_act_versions (
+    id SERIAL PRIMARY KEY,
+    act_key TEXT NOT NULL REFERENCES legal_acts(key) ON DELETE CASCADE,
+    version INTEGER NOT NULL,
+    text_eli TEXT NOT NULL,
+    format TEXT NOT NULL,               -- html / pdf
+    content_sha256 TEXT NOT NULL,
+    content TEXT NOT NULL,
+    fetched_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    UNIQUE (act_key, version)
+);
@@ -0,0 +1,4 @@
+-- Fragmenty aktów prawnych (services/legal_chunker.py): jednostki tego
+-- samego artykułu (indeks cytowań, sąsiednie ustępy w kontekście).
+CREATE INDEX IF NOT EXISTS idx_chunks_article ON chunks(document_id, (metadata->>'article'))
+    WHERE metadata ? 'article';
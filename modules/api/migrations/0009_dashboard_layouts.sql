@@ -0,0 +1,9 @@
+-- Układ dashboardu (routers/layout.py) - wcześniej tworzony przy każdym
+-- żądaniu GET/POST /layout i w /health. IF NOT EXISTS: tabela mogła już
+-- powstać w ten sposób.
+CREATE TABLE IF NOT EXISTS dashboard_layouts (
+    id SERIAL PRIMARY KEY,
+    profile VARCHAR(50) UNIQUE NOT NULL,
+    layout_json TEXT NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
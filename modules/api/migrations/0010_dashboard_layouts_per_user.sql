@@ -0,0 +1,10 @@
+-- Układ dashboardu per użytkownik: profile = `sub` z tokenu SSO (albo
+-- 'default' dla anonimowych), układ jako JSONB, wersja do ETag.
+ALTER TABLE dashboard_layouts ALTER COLUMN profile TYPE TEXT;
+
+ALTER TABLE dashboard_layouts ADD COLUMN layout JSONB;
+UPDATE dashboard_layouts SET layout = layout_json::jsonb;
+ALTER TABLE dashboard_layouts ALTER COLUMN layout SET NOT NULL;
+ALTER TABLE dashboard_layouts DROP COLUMN layout_json;
+
+ALTER TABLE dashboard_layouts ADD COLUMN version INTEGER NOT NULL DEFAULT 1;
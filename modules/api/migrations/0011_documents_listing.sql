@@ -0,0 +1,30 @@
+-- Listowanie dokumentów (GET /documents): streszczenie liczone przy zapisie
+-- zamiast przesyłania całej treści, aktualny updated_at i indeksy pod
+-- paginację keyset po (updated_at, id) oraz (category, id).
+
+ALTER TABLE documents ADD COLUMN summary TEXT;
+
+UPDATE documents
+SET summary = left(btrim(regexp_replace(content, '\s+', ' ', 'g')), 300),
+    updated_at = COALESCE(updated_at, created_at, NOW());
+
+ALTER TABLE documents ALTER COLUMN updated_at SET NOT NULL;
+
+CREATE OR REPLACE FUNCTION documents_before_write() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' OR NEW.content IS DISTINCT FROM OLD.content THEN
+        NEW.summary := left(btrim(regexp_replace(NEW.content, '\s+', ' ', 'g')), 300);
+    END IF;
+    IF TG_OP = 'UPDATE' THEN
+        NEW.updated_at := NOW();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER documents_before_write
+    BEFORE INSERT OR UPDATE ON documents
+    FOR EACH ROW EXECUTE FUNCTION documents_before_write();
+
+CREATE INDEX idx_documents_public_updated ON documents (updated_at, id) WHERE user_id IS NULL;
+CREATE INDEX idx_documents_public_category ON documents (category, id) WHERE user_id IS NULL;
@@ -0,0 +1,40 @@
+-- Import zbiorczy dokumentów (POST /documents/import): hash treści do
+-- pomijania duplikatów i stan importów (postęp indeksowania w tle).
+
+ALTER TABLE documents ADD COLUMN content_sha256 TEXT;
+UPDATE documents SET content_sha256 = encode(sha256(convert_to(content, 'UTF8')), 'hex');
+
+CREATE INDEX idx_documents_public_content_sha256 ON documents (content_sha256) WHERE user_id IS NULL;
+
+CREATE OR REPLACE FUNCTION documents_before_write() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' OR NEW.content IS DISTINCT FROM OLD.content THEN
+        NEW.summary := left(btrim(regexp_replace(NEW.content, '\s+', ' ', 'g')), 300);
+        NEW.content_sha256 := encode(sha256(convert_to(NEW.content, 'UTF8')), 'hex');
+    END IF;
+    IF TG_OP = 'UPDATE' THEN
+        NEW.updated_at := NOW();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TABLE document_imports (
+    id TEXT PRIMARY KEY,
+    format TEXT NOT NULL,                   -- ndjson / zip
+    filename TEXT,
+    status TEXT NOT NULL,                   -- receiving, indexing, done, failed
+    received INTEGER NOT NULL DEFAULT 0,    -- poprawne rekordy / pliki
+    inserted INTEGER NOT NULL DEFAULT 0,
+    duplicates INTEGER NOT NULL DEFAULT 0,
+    skipped INTEGER NOT NULL DEFAULT 0,     -- błędne linie, puste pliki
+    indexed INTEGER NOT NULL DEFAULT 0,
+    chunks INTEGER NOT NULL DEFAULT 0,
+    document_ids INTEGER[] NOT NULL DEFAULT '{}',
+    errors JSONB NOT NULL DEFAULT '[]',     -- pierwsze błędy (linia / plik + opis)
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMPTZ
+);
+
+CREATE INDEX idx_document_imports_created ON document_imports (created_at DESC);
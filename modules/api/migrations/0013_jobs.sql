@@ -0,0 +1,29 @@
+-- Kolejka zadań w tle (services/jobs.py, worker.py): pobieranie przez
+-- SELECT ... FOR UPDATE SKIP LOCKED, bez zewnętrznego brokera.
+CREATE TABLE jobs (
+    id BIGSERIAL PRIMARY KEY,
+    kind TEXT NOT NULL,                         -- nazwa handlera, np. isap.sync
+    payload JSONB NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL DEFAULT 'queued',      -- queued, running, succeeded, failed, cancelled
+    priority INTEGER NOT NULL DEFAULT 0,        -- wyższy = wcześniej
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    run_after TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    progress_current INTEGER NOT NULL DEFAULT 0,
+    progress_total INTEGER,
+    message TEXT,
+    result JSONB,
+    error TEXT,
+    cancel_requested BOOLEAN NOT NULL DEFAULT FALSE,
+    locked_by TEXT,
+    heartbeat_at TIMESTAMPTZ,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ
+);
+
+CREATE INDEX idx_jobs_queue ON jobs (priority DESC, run_after, id) WHERE status = 'queued';
+CREATE INDEX idx_jobs_running ON jobs (heartbeat_at) WHERE status = 'running';
+CREATE INDEX idx_jobs_created ON jobs (created_at DESC);
+
+ALTER TABLE document_imports ADD COLUMN job_id BIGINT REFERENCES jobs(id) ON DELETE SET NULL;
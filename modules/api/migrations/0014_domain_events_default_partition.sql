@@ -0,0 +1,39 @@
+-- Partycja DEFAULT domain_events: event z miesiąca bez partycji (granica
+-- miesiąca, inna strefa czasowa API i bazy) trafia tutaj zamiast kończyć się
+-- błędem "no partition of relation found".
+CREATE TABLE IF NOT EXISTS domain_events_default PARTITION OF domain_events DEFAULT;
+
+-- Partycja miesięczna dla podanej daty. Przy istniejącej partycji DEFAULT
+-- nie da się dodać zakresu, który ma w niej wiersze - są przenoszone do
+-- nowej partycji przed ATTACH. Szybka ścieżka (partycja istnieje) bez
+-- blokad; zakładanie serializowane blokadą doradczą transakcji.
+CREATE OR REPLACE FUNCTION ensure_domain_events_partition(for_date DATE)
+RETURNS TEXT AS $$
+DECLARE
+    month_start DATE := date_trunc('month', for_date)::date;
+    month_end DATE := (date_trunc('month', for_date) + INTERVAL '1 month')::date;
+    partition_name TEXT := 'domain_events_' || to_char(month_start, 'YYYY_MM');
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN partition_name;
+    END IF;
+    PERFORM pg_advisory_xact_lock(hashtext('domain_events_partition'));
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN partition_name;
+    END IF;
+    EXECUTE format('CREATE TABLE %I (LIKE domain_events INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', partition_name);
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM domain_events_default WHERE created_at >= %L AND created_at < %L RETURNING *)
+         INSERT INTO %I SELECT * FROM moved',
+        month_start, month_end, partition_name
+    );
+    EXECUTE format(
+        'ALTER TABLE domain_events ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, month_start, month_end
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ensure_domain_events_partition(CURRENT_DATE);
+SELECT ensure_domain_events_partition((CURRENT_DATE + INTERVAL '1 month')::date);
@@ -0,0 +1,11 @@
+-- Ponawianie nieudanego indeksowania plików Nextcloud (services/nextcloud.py):
+-- licznik prób i termin kolejnej; do tego czasu plik nie wraca do partii,
+-- chyba że zmieni się jego ETag (failed_etag).
+ALTER TABLE nextcloud_ingest_state ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE nextcloud_ingest_state ADD COLUMN IF NOT EXISTS failed_etag TEXT;
+ALTER TABLE nextcloud_ingest_state ADD COLUMN IF NOT EXISTS retry_after TIMESTAMPTZ;
+
+-- Dotychczasowe błędy zapisywały ETag pliku jako zaindeksowany - wracają do kolejki
+UPDATE nextcloud_ingest_state
+SET failed_etag = etag, etag = NULL, attempts = 1, retry_after = NOW()
+WHERE error IS NOT NULL AND failed_etag IS NULL AND attempts = 0;
@@ -1,13 +1,14 @@
 """
 Chat Router - Endpointy czatu z Bielikiem
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 from typing import Optional, List
 import logging
 import uuid
 
-from services.rag import rag_service
+from services.auth import get_optional_user_id
+from services.rag import get_rag_service
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -40,6 +41,7 @@ class Source(BaseModel):
     source: Optional[str] = None
     category: str
     similarity: float
+    citation: Optional[str] = None  # np. "art. 22 § 1" dla fragmentów aktów prawnych
 
 
 class ChatResponse(BaseModel):
@@ -47,15 +49,18 @@ class ChatResponse(BaseModel):
     response: str
     sources: List[Source]
     module: str
+    routed_module: Optional[str] = None  # moduł wybrany automatycznie dla "default"
     conversation_id: str
 
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, user_id: Optional[str] = Depends(get_optional_user_id)):
     """
     Główny endpoint czatu z Bielikiem.
     
     Wysyła pytanie do modelu LLM z kontekstem z bazy wiedzy (RAG).
+    Z nagłówkiem `Authorization: Bearer <token>` kontekst obejmuje też
+    zaindeksowane dokumenty użytkownika (e-Doręczenia).
     
     **Moduły:**
     - `ksef` - Krajowy System e-Faktur
@@ -73,9 +78,10 @@ async def chat(request: ChatRequest):
         logger.info(f"Chat request: {request.module} - {request.message[:50]}...")
         
         # Wywołaj RAG
-        result = rag_service.chat(
+        result = get_rag_service().chat(
             message=request.message,
-            module=request.module
+            module=request.module,
+            user_id=user_id
         )
         
         # Przygotuj odpowiedź
@@ -83,6 +89,7 @@ async def chat(request: ChatRequest):
             response=result["response"],
             sources=[Source(**s) for s in result["sources"]],
             module=result["module"],
+            routed_module=result.get("routed_module"),
             conversation_id=request.conversation_id or str(uuid.uuid4())
         )
         
@@ -129,11 +136,15 @@ async def get_modules():
 
 
 @router.post("/chat/simple")
-async def simple_chat(message: str, module: str = "default"):
+async def simple_chat(
+    message: str,
+    module: str = "default",
+    user_id: Optional[str] = Depends(get_optional_user_id)
+):
     """
     Uproszczony endpoint czatu (query params).
     
     Przykład: POST /api/v1/chat/simple?message=Co to KSeF?&module=ksef
     """
     request = ChatRequest(message=message, module=module)
-    return await chat(request)
+    return await chat(request, user_id=user_id)
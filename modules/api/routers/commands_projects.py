@@ -1,4 +1,8 @@
-"""Commands Router - CQRS write side for projects"""
+"""Commands Router - CQRS write side for projects
+
+Zapis projektu/pliku, event w domain_events i projekcja context_tree idą
+w jednej transakcji (append_events) - read model nie rozjedzie się z tabelami.
+"""
 from typing import Optional
 import logging
 import os
@@ -8,7 +12,7 @@ from pydantic import BaseModel
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
-from services.events import append_event
+from services.events import append_events
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -43,34 +47,39 @@ class ProjectRemoveFileCommand(BaseModel):
     file_id: int
 
 
+def _project_event(project_id: int, event_type: str, payload: dict) -> dict:
+    return {
+        "aggregate_type": "project",
+        "aggregate_id": str(project_id),
+        "event_type": event_type,
+        "payload": payload,
+    }
+
+
 @router.post("/commands/projects/create")
 async def create_project(cmd: ProjectCreateCommand):
     try:
         conn = psycopg2.connect(DATABASE_URL)
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
-                """
-                INSERT INTO projects (name, description, contact)
-                VALUES (%s, %s, %s)
-                RETURNING id, name, description, contact
-                """,
-                (cmd.name, cmd.description, cmd.contact),
-            )
-            row = cur.fetchone()
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    """
+                    INSERT INTO projects (name, description, contact)
+                    VALUES (%s, %s, %s)
+                    RETURNING id, name, description, contact
+                    """,
+                    (cmd.name, cmd.description, cmd.contact),
+                )
+                row = cur.fetchone()
+                append_events(cur, [_project_event(row["id"], "ProjectCreated", {
+                    "id": row["id"],
+                    "name": row["name"],
+                    "description": row["description"],
+                    "contact": row["contact"],
+                })])
             conn.commit()
-        conn.close()
-
-        append_event(
-            aggregate_type="project",
-            aggregate_id=str(row["id"]),
-            event_type="ProjectCreated",
-            payload={
-                "id": row["id"],
-                "name": row["name"],
-                "description": row["description"],
-                "contact": row["contact"],
-            },
-        )
+        finally:
+            conn.close()
 
         return row
     except Exception as e:
@@ -82,37 +91,33 @@ async def create_project(cmd: ProjectCreateCommand):
 async def update_project(cmd: ProjectUpdateCommand):
     try:
         conn = psycopg2.connect(DATABASE_URL)
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
-                """
-                UPDATE projects
-                SET name = %s,
-                    description = %s,
-                    contact = %s,
-                    updated_at = NOW()
-                WHERE id = %s
-                RETURNING id, name, description, contact
-                """,
-                (cmd.name, cmd.description, cmd.contact, cmd.id),
-            )
-            row = cur.fetchone()
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    """
+                    UPDATE projects
+                    SET name = %s,
+                        description = %s,
+                        contact = %s,
+                        updated_at = NOW()
+                    WHERE id = %s
+                    RETURNING id, name, description, contact
+                    """,
+                    (cmd.name, cmd.description, cmd.contact, cmd.id),
+                )
+                row = cur.fetchone()
+                if not row:
+                    raise HTTPException(status_code=404, detail="Projekt nie znaleziony")
+
+                append_events(cur, [_project_event(row["id"], "ProjectUpdated", {
+                    "id": row["id"],
+                    "name": row["name"],
+                    "description": row["description"],
+                    "contact": row["contact"],
+                })])
             conn.commit()
-        conn.close()
-
-        if not row:
-            raise HTTPException(status_code=404, detail="Projekt nie znaleziony")
-
-        append_event(
-            aggregate_type="project",
-            aggregate_id=str(row["id"]),
-            event_type="ProjectUpdated",
-            payload={
-                "id": row["id"],
-                "name": row["name"],
-                "description": row["description"],
-                "contact": row["contact"],
-            },
-        )
+        finally:
+            conn.close()
 
         return row
     except HTTPException:
@@ -126,21 +131,16 @@ async def update_project(cmd: ProjectUpdateCommand):
 async def delete_project(cmd: ProjectDeleteCommand):
     try:
         conn = psycopg2.connect(DATABASE_URL)
-        with conn.cursor() as cur:
-            cur.execute("DELETE FROM projects WHERE id = %s", (cmd.id,))
-            deleted = cur.rowcount
-            conn.commit()
-        conn.close()
-
-        if deleted == 0:
-            raise HTTPException(status_code=404, detail="Projekt nie znaleziony")
+        try:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM projects WHERE id = %s", (cmd.id,))
+                if cur.rowcount == 0:
+                    raise HTTPException(status_code=404, detail="Projekt nie znaleziony")
 
-        append_event(
-            aggregate_type="project",
-            aggregate_id=str(cmd.id),
-            event_type="ProjectDeleted",
-            payload={"id": cmd.id},
-        )
+                append_events(cur, [_project_event(cmd.id, "ProjectDeleted", {"id": cmd.id})])
+            conn.commit()
+        finally:
+            conn.close()
 
         return {"message": "Projekt usunięty", "id": cmd.id}
     except HTTPException:
@@ -154,30 +154,26 @@ async def delete_project(cmd: ProjectDeleteCommand):
 async def add_project_file(cmd: ProjectAddFileCommand):
     try:
         conn = psycopg2.connect(DATABASE_URL)
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
-                """
-                INSERT INTO project_files (project_id, filename, path)
-                VALUES (%s, %s, %s)
-                RETURNING id, project_id, filename, path
-                """,
-                (cmd.project_id, cmd.filename, cmd.path),
-            )
-            row = cur.fetchone()
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    """
+                    INSERT INTO project_files (project_id, filename, path)
+                    VALUES (%s, %s, %s)
+                    RETURNING id, project_id, filename, path
+                    """,
+                    (cmd.project_id, cmd.filename, cmd.path),
+                )
+                row = cur.fetchone()
+                append_events(cur, [_project_event(cmd.project_id, "ProjectFileAdded", {
+                    "fileId": row["id"],
+                    "projectId": row["project_id"],
+                    "filename": row["filename"],
+                    "path": row["path"],
+                })])
             conn.commit()
-        conn.close()
-
-        append_event(
-            aggregate_type="project",
-            aggregate_id=str(cmd.project_id),
-            event_type="ProjectFileAdded",
-            payload={
-                "fileId": row["id"],
-                "projectId": row["project_id"],
-                "filename": row["filename"],
-                "path": row["path"],
-            },
-        )
+        finally:
+            conn.close()
 
         return row
     except Exception as e:
@@ -189,36 +185,26 @@ async def add_project_file(cmd: ProjectAddFileCommand):
 async def remove_project_file(cmd: ProjectRemoveFileCommand):
     try:
         conn = psycopg2.connect(DATABASE_URL)
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            # Pobierz project_id i filename przed usunięciem
-            cur.execute(
-                "SELECT project_id, filename, path FROM project_files WHERE id = %s",
-                (cmd.file_id,),
-            )
-            row = cur.fetchone()
-            if not row:
-                conn.close()
-                raise HTTPException(status_code=404, detail="Plik projektu nie znaleziony")
-
-            project_id = row["project_id"]
-            filename = row["filename"]
-            path = row["path"]
-
-            cur.execute("DELETE FROM project_files WHERE id = %s", (cmd.file_id,))
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                # Usunięty wiersz (project_id, filename) trafia do payloadu eventu
+                cur.execute(
+                    "DELETE FROM project_files WHERE id = %s RETURNING project_id, filename, path",
+                    (cmd.file_id,),
+                )
+                row = cur.fetchone()
+                if not row:
+                    raise HTTPException(status_code=404, detail="Plik projektu nie znaleziony")
+
+                append_events(cur, [_project_event(row["project_id"], "ProjectFileRemoved", {
+                    "fileId": cmd.file_id,
+                    "projectId": row["project_id"],
+                    "filename": row["filename"],
+                    "path": row["path"],
+                })])
             conn.commit()
-        conn.close()
-
-        append_event(
-            aggregate_type="project",
-            aggregate_id=str(project_id),
-            event_type="ProjectFileRemoved",
-            payload={
-                "fileId": cmd.file_id,
-                "projectId": project_id,
-                "filename": filename,
-                "path": path,
-            },
-        )
+        finally:
+            conn.close()
 
         return {"message": "Plik usunięty", "id": cmd.file_id}
     except HTTPException:
@@ -1,15 +1,17 @@
 """
 Documents Router - Zarządzanie bazą wiedzy
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 from pydantic import BaseModel
-from typing import Optional, List
+from datetime import datetime
+from typing import Literal, Optional, List
 import logging
 import psycopg2
 from psycopg2.extras import RealDictCursor
 import os
 
-from services.events import append_event
+from services.events import append_event, content_payload
+from services.pagination import InvalidCursor, decode_cursor, encode_cursor, estimate_count, parse_fields
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -26,6 +28,27 @@ class Document(BaseModel):
     content: str
 
 
+class DocumentListItem(BaseModel):
+    """Element listy dokumentów - tylko pola wybrane przez `fields`."""
+    id: int
+    title: Optional[str] = None
+    source: Optional[str] = None
+    category: Optional[str] = None
+    url: Optional[str] = None
+    summary: Optional[str] = None
+    content: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+# Kolumny dostępne w projekcji listy (`fields`)
+LIST_FIELDS = ("id", "title", "source", "category", "url", "summary", "content", "created_at", "updated_at")
+# Domyślnie jak dotąd - z pełną treścią
+DEFAULT_LIST_FIELDS = ("id", "title", "source", "category", "content")
+# summary=true: widok listy bez treści, ze streszczeniem liczonym przy zapisie
+SUMMARY_LIST_FIELDS = ("id", "title", "source", "category", "summary", "updated_at")
+
+
 class DocumentUpdate(BaseModel):
     """Model aktualizacji dokumentu."""
     title: str
@@ -49,38 +72,95 @@ class DocumentStats(BaseModel):
     categories: List[dict]
 
 
-@router.get("/documents", response_model=List[Document])
+@router.get("/documents", response_model=List[DocumentListItem], response_model_exclude_unset=True)
 async def list_documents(
+    response: Response,
     category: Optional[str] = None,
-    limit: int = 50
+    limit: int = Query(50, ge=1, le=500),
+    sort: Literal["id", "updated_at"] = "id",
+    order: Literal["asc", "desc"] = "asc",
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    summary: bool = False,
 ):
     """
-    Lista dokumentów w bazie wiedzy.
+    Lista dokumentów w bazie wiedzy (paginacja keyset).
     
     Możesz filtrować po kategorii: ksef, b2b, zus, vat
+    
+    - `sort` / `order` - klucz i kierunek sortowania (id albo updated_at),
+    - `cursor` - wartość nagłówka `X-Next-Cursor` z poprzedniej strony,
+    - `fields` - projekcja, np. `fields=title,category` (id zawsze, bez treści),
+    - `summary=true` - widok listy: streszczenie zamiast treści.
+    
+    Pierwsza strona zwraca `X-Total-Count-Estimate` (szacunek planera).
     """
     try:
-        conn = psycopg2.connect(DATABASE_URL)
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            if category:
-                cur.execute(
-                    "SELECT id, title, source, category, content FROM documents WHERE category = %s LIMIT %s",
-                    (category, limit)
-                )
+        default = SUMMARY_LIST_FIELDS if summary else DEFAULT_LIST_FIELDS
+        columns = parse_fields(fields, LIST_FIELDS, default)
+        if "id" not in columns:
+            columns.insert(0, "id")  # id zawsze - potrzebne do pobrania szczegółów
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    where = ["user_id IS NULL"]
+    params: list = []
+    if category:
+        where.append("category = %s")
+        params.append(category)
+    filter_sql = " AND ".join(where)
+    filter_params = list(params)
+
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+            if position.get("sort") != sort or position.get("order") != order:
+                raise InvalidCursor("Cursor belongs to a different sort order")
+            op = ">" if order == "asc" else "<"
+            if sort == "id":
+                where.append(f"id {op} %s")
+                params.append(int(position["id"]))
             else:
+                where.append(f"(updated_at, id) {op} (%s::timestamp, %s)")
+                params.extend([position["updated_at"], int(position["id"])])
+        except (InvalidCursor, KeyError, TypeError, ValueError) as e:
+            raise HTTPException(status_code=400, detail=f"Nieprawidłowy kursor: {e}")
+
+    direction = order.upper()
+    order_by = f"id {direction}" if sort == "id" else f"updated_at {direction}, id {direction}"
+    selected = [c for c in LIST_FIELDS if c in columns or c in ("id", sort)]
+
+    try:
+        conn = psycopg2.connect(DATABASE_URL)
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute(
-                    "SELECT id, title, source, category, content FROM documents LIMIT %s",
-                    (limit,)
+                    f"SELECT {', '.join(selected)} FROM documents WHERE {' AND '.join(where)} "
+                    f"ORDER BY {order_by} LIMIT %s",
+                    (*params, limit + 1),
                 )
-            results = cur.fetchall()
-        conn.close()
-        
-        return [Document(**r) for r in results]
-        
+                results = cur.fetchall()
+                total = None
+                if not cursor:
+                    total = estimate_count(cur, f"SELECT 1 FROM documents WHERE {filter_sql}", filter_params)
+        finally:
+            conn.close()
     except Exception as e:
         logger.error(f"Error listing documents: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+    if len(results) > limit:
+        results = results[:limit]
+        last = results[-1]
+        position = {"sort": sort, "order": order, "id": last["id"]}
+        if sort == "updated_at":
+            position["updated_at"] = last["updated_at"].isoformat()
+        response.headers["X-Next-Cursor"] = encode_cursor(**position)
+    if total is not None:
+        response.headers["X-Total-Count-Estimate"] = str(total)
+
+    return [DocumentListItem(**{c: r[c] for c in columns}) for r in results]
+
 
 @router.put("/documents/{document_id}", response_model=Document)
 async def update_document(document_id: int, doc: DocumentUpdate):
@@ -90,15 +170,20 @@ async def update_document(document_id: int, doc: DocumentUpdate):
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
             cur.execute(
                 """
-                UPDATE documents
+                WITH previous AS (
+                    SELECT id, content FROM documents WHERE id = %s AND user_id IS NULL FOR UPDATE
+                )
+                UPDATE documents d
                 SET title = %s,
                     source = %s,
                     category = %s,
                     content = %s
-                WHERE id = %s
-                RETURNING id, title, source, category, content
+                FROM previous
+                WHERE d.id = previous.id
+                RETURNING d.id, d.title, d.source, d.category, d.content,
+                          previous.content AS previous_content
                 """,
-                (doc.title, doc.source, doc.category, doc.content, document_id),
+                (document_id, doc.title, doc.source, doc.category, doc.content),
             )
             result = cur.fetchone()
             conn.commit()
@@ -116,11 +201,11 @@ async def update_document(document_id: int, doc: DocumentUpdate):
                 "title": result["title"],
                 "source": result["source"],
                 "category": result["category"],
-                "content": result["content"],
+                **content_payload(result["content"], previous=result["previous_content"]),
             },
         )
 
-        return Document(**result)
+        return Document(**{k: v for k, v in result.items() if k != "previous_content"})
 
     except HTTPException:
         raise
@@ -136,17 +221,18 @@ async def get_stats():
         conn = psycopg2.connect(DATABASE_URL)
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
             # Liczba dokumentów
-            cur.execute("SELECT COUNT(*) as count FROM documents")
+            cur.execute("SELECT COUNT(*) as count FROM documents WHERE user_id IS NULL")
             total_docs = cur.fetchone()['count']
             
             # Liczba chunków
-            cur.execute("SELECT COUNT(*) as count FROM chunks")
+            cur.execute("SELECT COUNT(*) as count FROM chunks WHERE user_id IS NULL")
             total_chunks = cur.fetchone()['count']
             
             # Kategorie
             cur.execute("""
                 SELECT category, COUNT(*) as count 
                 FROM documents 
+                WHERE user_id IS NULL
                 GROUP BY category 
                 ORDER BY count DESC
             """)
@@ -172,7 +258,7 @@ async def get_document(document_id: int):
         conn = psycopg2.connect(DATABASE_URL)
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
             cur.execute(
-                "SELECT id, title, source, category, content FROM documents WHERE id = %s",
+                "SELECT id, title, source, category, content FROM documents WHERE id = %s AND user_id IS NULL",
                 (document_id,)
             )
             result = cur.fetchone()
@@ -221,7 +307,7 @@ async def create_document(doc: DocumentCreate):
                 "title": result["title"],
                 "source": result["source"],
                 "category": result["category"],
-                "content": result["content"],
+                **content_payload(result["content"]),
             },
         )
 
@@ -238,7 +324,7 @@ async def delete_document(document_id: int):
     try:
         conn = psycopg2.connect(DATABASE_URL)
         with conn.cursor() as cur:
-            cur.execute("DELETE FROM documents WHERE id = %s", (document_id,))
+            cur.execute("DELETE FROM documents WHERE id = %s AND user_id IS NULL", (document_id,))
             deleted = cur.rowcount
             conn.commit()
         conn.close()
@@ -287,6 +373,7 @@ async def search_documents(
                     ts_rank(to_tsvector('simple', d.content), plainto_tsquery('simple', %s)) as rank
                 FROM documents d
                 WHERE to_tsvector('simple', d.content) @@ plainto_tsquery('simple', %s)
+                  AND d.user_id IS NULL
                   AND (%s IS NULL OR d.category = %s)
                 ORDER BY rank DESC
                 LIMIT %s
@@ -304,3 +391,78 @@ async def search_documents(
     except Exception as e:
         logger.error(f"Error searching: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/chunks/{chunk_id}/related")
+async def get_related_chunks(chunk_id: int, limit: int = 20):
+    """
+    Fragment bazy wiedzy wraz z powiązanymi: sąsiednie fragmenty dokumentu
+    oraz pozostałe jednostki tego samego artykułu (dla aktów prawnych).
+    `limit` ogranicza tylko jednostki artykułu - najbliższe fragmentowi.
+    """
+    try:
+        conn = psycopg2.connect(DATABASE_URL)
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(
+                """
+                WITH target AS (
+                    SELECT id, document_id, chunk_index, metadata->>'article' AS article
+                    FROM chunks
+                    WHERE id = %s AND user_id IS NULL
+                ),
+                related AS (
+                    -- Fragment i sąsiedzi zawsze; limit dotyczy tylko reszty artykułu
+                    SELECT c.id, c.document_id, c.chunk_index, c.content, c.metadata,
+                           CASE
+                               WHEN c.id = t.id THEN 'self'
+                               WHEN c.chunk_index = t.chunk_index - 1 THEN 'previous'
+                               ELSE 'next'
+                           END AS relation
+                    FROM target t
+                    JOIN chunks c ON c.document_id = t.document_id
+                    WHERE c.chunk_index BETWEEN t.chunk_index - 1 AND t.chunk_index + 1
+                    UNION ALL
+                    (
+                        SELECT c.id, c.document_id, c.chunk_index, c.content, c.metadata,
+                               'same_article' AS relation
+                        FROM target t
+                        JOIN chunks c ON c.document_id = t.document_id
+                        WHERE t.article IS NOT NULL
+                          AND c.metadata->>'article' = t.article
+                          AND c.chunk_index NOT BETWEEN t.chunk_index - 1 AND t.chunk_index + 1
+                        ORDER BY abs(c.chunk_index - t.chunk_index)
+                        LIMIT %s
+                    )
+                )
+                SELECT
+                    r.id,
+                    r.chunk_index,
+                    r.content,
+                    r.metadata,
+                    d.id AS document_id,
+                    d.title,
+                    d.source,
+                    r.relation
+                FROM related r
+                JOIN documents d ON d.id = r.document_id
+                ORDER BY r.chunk_index
+                """,
+                (chunk_id, limit),
+            )
+            rows = cur.fetchall()
+        conn.close()
+
+        chunk = next((r for r in rows if r["relation"] == "self"), None)
+        if chunk is None:
+            raise HTTPException(status_code=404, detail="Fragment nie znaleziony")
+
+        return {
+            "chunk": dict(chunk),
+            "related": [dict(r) for r in rows if r["relation"] != "self"],
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting related chunks: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
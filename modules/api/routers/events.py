@@ -1,8 +1,8 @@
 """Events Router - read history from event store"""
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 import logging
 
@@ -23,9 +23,14 @@ class DomainEvent(BaseModel):
 
 
 @router.get("/events/documents/{document_id}", response_model=List[DomainEvent])
-async def get_document_events(document_id: int, limit: int = 50):
+async def get_document_events(
+    document_id: int,
+    limit: int = 50,
+    since: Optional[datetime] = Query(default=None, description="Tylko eventy od tej daty (zawęża skanowane partycje)"),
+    until: Optional[datetime] = Query(default=None, description="Tylko eventy przed tą datą"),
+):
     try:
-        events = get_events("document", str(document_id), limit=limit)
+        events = get_events("document", str(document_id), limit=limit, since=since, until=until)
         return events
     except Exception as e:
         logger.error(f"Error getting events for document {document_id}: {e}")
@@ -33,9 +38,14 @@ async def get_document_events(document_id: int, limit: int = 50):
 
 
 @router.get("/events/projects/{project_id}", response_model=List[DomainEvent])
-async def get_project_events(project_id: int, limit: int = 50):
+async def get_project_events(
+    project_id: int,
+    limit: int = 50,
+    since: Optional[datetime] = Query(default=None, description="Tylko eventy od tej daty (zawęża skanowane partycje)"),
+    until: Optional[datetime] = Query(default=None, description="Tylko eventy przed tą datą"),
+):
     try:
-        events = get_events("project", str(project_id), limit=limit)
+        events = get_events("project", str(project_id), limit=limit, since=since, until=until)
         return events
     except Exception as e:
         logger.error(f"Error getting events for project {project_id}: {e}")
@@ -0,0 +1,135 @@
+"""
+Imports Router - zbiorczy import dokumentów (NDJSON / JSONL / ZIP)
+
+Upload czytany jest strumieniowo z ciała żądania (bez multipart):
+
+    curl -X POST "http://localhost:8000/api/v1/documents/import?category=vat" \\
+         -H "Content-Type: application/x-ndjson" --data-binary @dokumenty.jsonl
+
+    curl -X POST "http://localhost:8000/api/v1/documents/import?category=b2b" \\
+         -H "Content-Type: application/zip" --data-binary @pliki.zip
+
+Odpowiedź 202 zawiera liczniki importu; indeksowanie wykonuje worker
+(zadanie `job_id`), postęp: GET /documents/imports/{id}.
+"""
+import logging
+import tempfile
+from typing import Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+
+from services.document_import import (
+    IMPORT_DEFAULT_CATEGORY,
+    DocumentImporter,
+    ImportFormatError,
+    get_import,
+    list_imports,
+)
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+NDJSON_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl", "application/x-jsonlines",
+                "application/json-lines", "application/json"}
+ZIP_TYPES = {"application/zip", "application/x-zip-compressed"}
+
+# Upload ZIP do tego rozmiaru trzymany w pamięci, większy - w pliku tymczasowym
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+# Zapis uploadu paczkami tej wielkości, w puli wątków (po przelaniu na dysk
+# write blokuje - nie może się dziać w pętli zdarzeń)
+SPOOL_WRITE_BYTES = 1024 * 1024
+
+
+def _detect_format(request: Request, filename: Optional[str]) -> Optional[str]:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in ZIP_TYPES or (filename or "").lower().endswith(".zip"):
+        return "zip"
+    if content_type in NDJSON_TYPES or (filename or "").lower().endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return None
+
+
+async def _spool_upload(request: Request, upload) -> None:
+    """Przepisuje ciało żądania do `upload`; zapisy idą poza pętlą zdarzeń."""
+    buffer = bytearray()
+    async for chunk in request.stream():
+        buffer += chunk
+        if len(buffer) >= SPOOL_WRITE_BYTES:
+            await run_in_threadpool(upload.write, bytes(buffer))
+            buffer.clear()
+    if buffer:
+        await run_in_threadpool(upload.write, bytes(buffer))
+    await run_in_threadpool(upload.seek, 0)
+
+
+@router.post("/documents/import", status_code=202)
+async def import_documents(
+    request: Request,
+    format: Optional[Literal["ndjson", "jsonl", "zip"]] = None,
+    category: str = IMPORT_DEFAULT_CATEGORY,
+    filename: Optional[str] = None,
+):
+    """
+    Import wielu dokumentów do bazy wiedzy jednym żądaniem.
+
+    - NDJSON/JSONL: linia = `{"title", "content", "category"?, "source"?, "url"?, "metadata"?}`,
+    - ZIP: pliki txt/md/html/pdf/eml; tytuł = nazwa pliku, kategoria z parametru.
+
+    Dokumenty o treści już obecnej w bazie (sha256) są pomijane. Błędne linie
+    i pliki nie przerywają importu - trafiają do `errors`.
+    """
+    fmt = {"jsonl": "ndjson"}.get(format, format) or _detect_format(request, filename)
+    if fmt is None:
+        raise HTTPException(415, "Obsługiwane formaty: NDJSON/JSONL (application/x-ndjson) lub ZIP (application/zip)")
+
+    importer = DocumentImporter(fmt, filename=filename, category=category)
+    try:
+        await run_in_threadpool(importer.start)
+        if fmt == "zip":
+            upload = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+            try:
+                await _spool_upload(request, upload)
+                await run_in_threadpool(importer.load_zip, upload)
+            finally:
+                await run_in_threadpool(upload.close)
+        else:
+            await importer.load_ndjson(request.stream())
+        summary = await run_in_threadpool(importer.finish)
+    except ImportFormatError as e:
+        await run_in_threadpool(importer.abort, str(e))
+        raise HTTPException(400, f"{e} (import {importer.id})")
+    except Exception as e:
+        logger.error(f"Error importing documents: {e}")
+        try:
+            await run_in_threadpool(importer.abort, str(e))
+        except Exception as abort_error:
+            logger.error(f"Could not mark import {importer.id} as failed: {abort_error}")
+        raise HTTPException(500, "Import dokumentów nie powiódł się")
+    finally:
+        await run_in_threadpool(importer.close)
+
+    return {**summary, "status_url": f"/api/v1/documents/imports/{importer.id}"}
+
+
+@router.get("/documents/imports")
+async def get_imports(limit: int = Query(20, ge=1, le=100)):
+    """Ostatnie importy z licznikami."""
+    try:
+        return {"imports": await run_in_threadpool(list_imports, limit)}
+    except Exception as e:
+        logger.error(f"Error listing imports: {e}")
+        raise HTTPException(500, "Nie udało się pobrać listy importów")
+
+
+@router.get("/documents/imports/{import_id}")
+async def get_import_status(import_id: str):
+    """Postęp importu: received/inserted/duplicates/skipped oraz indexed z inserted."""
+    try:
+        result = await run_in_threadpool(get_import, import_id)
+    except Exception as e:
+        logger.error(f"Error reading import {import_id}: {e}")
+        raise HTTPException(500, "Nie udało się pobrać stanu importu")
+    if not result:
+        raise HTTPException(404, "Import nie znaleziony")
+    return result
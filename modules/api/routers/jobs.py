@@ -0,0 +1,89 @@
+"""
+Jobs Router - zadania w tle (services/jobs.py)
+
+Zadania wykonuje osobny proces workera (`python worker.py`), nie API.
+"""
+import logging
+from typing import Any, Dict, Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
+
+from services import jobs
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+JobStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
+
+class JobCreate(BaseModel):
+    """Zlecenie zadania."""
+    kind: str
+    payload: Dict[str, Any] = Field(default_factory=dict)
+    priority: int = jobs.PRIORITY_NORMAL
+    max_attempts: int = Field(3, ge=1, le=20)
+
+
+@router.post("/jobs", status_code=202)
+async def create_job(request: JobCreate):
+    """
+    Zleca zadanie, np. `{"kind": "ingestion.reindex", "payload": {"only_missing": false}}`.
+
+    Rodzaje: ingestion.index_import, ingestion.reindex, isap.sync, verify.bulk.
+    """
+    if request.kind not in jobs.HANDLERS:
+        raise HTTPException(400, f"Nieznany rodzaj zadania: {request.kind}")
+    try:
+        job_id = await run_in_threadpool(
+            jobs.enqueue, request.kind, request.payload, request.priority, request.max_attempts
+        )
+    except Exception as e:
+        logger.error(f"Error enqueuing job {request.kind}: {e}")
+        raise HTTPException(500, "Nie udało się zlecić zadania")
+    return {"id": job_id, "status": "queued", "status_url": f"/api/v1/jobs/{job_id}"}
+
+
+@router.get("/jobs")
+async def list_jobs(
+    status: Optional[JobStatus] = None,
+    kind: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+):
+    """Ostatnie zadania (filtr po statusie i rodzaju)."""
+    try:
+        return {"jobs": await run_in_threadpool(jobs.list_jobs, status, kind, limit)}
+    except Exception as e:
+        logger.error(f"Error listing jobs: {e}")
+        raise HTTPException(500, "Nie udało się pobrać listy zadań")
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: int):
+    """Stan zadania: status, próby, postęp (`progress.current/total/percent`), wynik lub błąd."""
+    try:
+        job = await run_in_threadpool(jobs.get_job, job_id)
+    except Exception as e:
+        logger.error(f"Error reading job {job_id}: {e}")
+        raise HTTPException(500, "Nie udało się pobrać zadania")
+    if not job:
+        raise HTTPException(404, "Zadanie nie znalezione")
+    return job
+
+
+@router.post("/jobs/{job_id}/cancel", status_code=202)
+async def cancel_job(job_id: int):
+    """Anuluje zadanie: z kolejki od razu, wykonywane - przy najbliższym raporcie postępu."""
+    try:
+        status = await run_in_threadpool(jobs.cancel, job_id)
+        if status is None:
+            job = await run_in_threadpool(jobs.get_job, job_id)
+    except Exception as e:
+        logger.error(f"Error cancelling job {job_id}: {e}")
+        raise HTTPException(500, "Nie udało się anulować zadania")
+    if status is None:
+        if not job:
+            raise HTTPException(404, "Zadanie nie znalezione")
+        raise HTTPException(409, f"Zadanie już zakończone ({job['status']})")
+    return {"id": job_id, "status": status, "cancel_requested": True}
@@ -0,0 +1,14 @@
+"""
+Metrics Router - eksport metryk Prometheus
+"""
+from fastapi import APIRouter, Response
+
+from services.metrics import CONTENT_TYPE_LATEST, render_latest
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    """Metryki w formacie tekstowym Prometheus (scrape)."""
+    return Response(content=render_latest(), media_type=CONTENT_TYPE_LATEST)
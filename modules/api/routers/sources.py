@@ -3,20 +3,42 @@ Data Sources Router - API dla źródeł danych prawnych
 =====================================================
 Endpointy do zarządzania źródłami danych i weryfikacji podmiotów.
 """
-from typing import Optional, List
-from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import APIRouter, File, HTTPException, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+import asyncio
+import codecs
+import csv
+import json
 import logging
+import os
+import re
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Weryfikacja masowa
+BULK_MAX_ITEMS = int(os.getenv("BULK_VERIFY_MAX_ITEMS", "10000"))
+BULK_CONCURRENCY = int(os.getenv("BULK_VERIFY_CONCURRENCY", "8"))
+
 # Import serwisu (lazy import aby uniknąć circular imports)
 def get_service():
     from services.data_sources import data_sources_service
     return data_sources_service
 
 
+def _validate_or_422(kind: str, identifier: str) -> str:
+    """Walidacja offline przed zapytaniem do rejestru; zwraca znormalizowany identyfikator."""
+    from services.data_sources import validate_identifier
+    validation = validate_identifier(kind, identifier)
+    if not validation.valid:
+        raise HTTPException(422, detail=validation.to_dict())
+    return validation.identifier
+
+
 # ============================================
 # MODELE
 # ============================================
@@ -39,12 +61,29 @@ class LegalDocumentResponse(BaseModel):
     url: str
 
 
+class LegalSyncRequest(BaseModel):
+    """Żądanie odświeżenia lokalnej kopii aktów prawnych."""
+    keys: Optional[List[str]] = None  # domyślnie wszystkie KEY_DOCUMENTS
+    force: bool = False               # pobierz i zaindeksuj ponownie mimo braku zmian
+
+
 class VerificationRequest(BaseModel):
     """Żądanie weryfikacji podmiotu."""
     identifier: str
     type: str  # nip, krs, vat_eu
 
 
+class BulkVerificationItem(BaseModel):
+    """Pozycja weryfikacji masowej; bez `type` typ jest rozpoznawany z formatu."""
+    identifier: str
+    type: Optional[str] = None  # nip, krs, vat_eu
+
+
+class BulkVerificationRequest(BaseModel):
+    """Żądanie weryfikacji masowej."""
+    items: List[BulkVerificationItem] = Field(..., min_length=1)
+
+
 class VerificationResponse(BaseModel):
     """Odpowiedź weryfikacji podmiotu."""
     valid: bool
@@ -189,6 +228,41 @@ async def list_key_legal_documents():
         raise HTTPException(500, "Nie udało się pobrać listy dokumentów")
 
 
+@router.get("/legal-documents/mirror")
+async def get_legal_mirror():
+    """Stan lokalnej kopii aktów prawnych (wersja, tekst jednolity, ostatnia zmiana)."""
+    try:
+        from services.isap_sync import get_mirror_status
+        return {"acts": await run_in_threadpool(get_mirror_status)}
+    except Exception as e:
+        logger.error(f"Error reading legal mirror: {e}")
+        raise HTTPException(500, "Nie udało się odczytać stanu kopii aktów")
+
+
+@router.post("/legal-documents/sync", status_code=202)
+async def sync_legal_documents(request: LegalSyncRequest):
+    """Odświeża lokalną kopię kluczowych aktów w tle (zadanie `isap.sync` w workerze).
+    
+    Akty są pobierane z API ELI tylko przy zmianie tekstu jednolitego;
+    zmienione trafiają do bazy wiedzy i są ponownie indeksowane.
+    Postęp: GET /api/v1/jobs/{job_id}.
+    """
+    from services.data_sources import ISAPClient
+    from services.jobs import enqueue
+
+    keys = request.keys or list(ISAPClient.KEY_DOCUMENTS)
+    unknown = [k for k in keys if k not in ISAPClient.KEY_DOCUMENTS]
+    if unknown:
+        raise HTTPException(400, f"Nieznane akty: {', '.join(unknown)}")
+
+    try:
+        job_id = await run_in_threadpool(enqueue, "isap.sync", {"keys": keys, "force": request.force})
+    except Exception as e:
+        logger.error(f"Error enqueuing legal sync: {e}")
+        raise HTTPException(500, "Nie udało się zlecić synchronizacji aktów")
+    return {"status": "queued", "job_id": job_id, "keys": keys, "force": request.force}
+
+
 @router.post("/verify", response_model=VerificationResponse)
 async def verify_entity(request: VerificationRequest):
     """Weryfikuje podmiot w zewnętrznych źródłach.
@@ -197,61 +271,64 @@ async def verify_entity(request: VerificationRequest):
     - nip: Weryfikacja w CEIDG (wymaga CEIDG_API_KEY)
     - krs: Weryfikacja w KRS
     - vat_eu: Weryfikacja VAT UE w VIES (format: PL1234567890)
+    
+    Identyfikatory z błędnym formatem lub sumą kontrolną są odrzucane (422)
+    bez zapytania do rejestru.
     """
     try:
         service = get_service()
         
         if request.type == "nip":
-            data = service.verify_company_nip(request.identifier)
+            identifier = _validate_or_422("nip", request.identifier)
+            data = await run_in_threadpool(service.verify_company_nip, identifier)
             if data:
                 return VerificationResponse(
                     valid=True,
-                    identifier=request.identifier,
+                    identifier=identifier,
                     type=request.type,
                     data=data
                 )
             return VerificationResponse(
                 valid=False,
-                identifier=request.identifier,
+                identifier=identifier,
                 type=request.type,
                 error="NIP nie znaleziony lub brak klucza API"
             )
         
         elif request.type == "krs":
-            data = service.verify_company_krs(request.identifier)
+            identifier = _validate_or_422("krs", request.identifier)
+            data = await run_in_threadpool(service.verify_company_krs, identifier)
             if data:
                 return VerificationResponse(
                     valid=True,
-                    identifier=request.identifier,
+                    identifier=identifier,
                     type=request.type,
                     data=data
                 )
             return VerificationResponse(
                 valid=False,
-                identifier=request.identifier,
+                identifier=identifier,
                 type=request.type,
                 error="KRS nie znaleziony"
             )
         
         elif request.type == "vat_eu":
             # Format: PL1234567890
-            if len(request.identifier) < 3:
-                raise HTTPException(400, "Nieprawidłowy format VAT UE")
-            
-            country_code = request.identifier[:2]
-            vat_number = request.identifier[2:]
+            identifier = _validate_or_422("vat_eu", request.identifier)
+            country_code = identifier[:2]
+            vat_number = identifier[2:]
             
-            data = service.verify_vat_eu(country_code, vat_number)
+            data = await run_in_threadpool(service.verify_vat_eu, country_code, vat_number)
             if data:
                 return VerificationResponse(
                     valid=data.get("valid", False),
-                    identifier=request.identifier,
+                    identifier=identifier,
                     type=request.type,
                     data=data
                 )
             return VerificationResponse(
                 valid=False,
-                identifier=request.identifier,
+                identifier=identifier,
                 type=request.type,
                 error="Błąd weryfikacji VAT UE"
             )
@@ -273,14 +350,13 @@ async def verify_vat_quick(vat_number: str):
     Format: PL1234567890
     """
     try:
-        if len(vat_number) < 3:
-            raise HTTPException(400, "Nieprawidłowy format VAT")
+        vat_number = _validate_or_422("vat_eu", vat_number)
         
         service = get_service()
-        country_code = vat_number[:2].upper()
+        country_code = vat_number[:2]
         number = vat_number[2:]
         
-        data = service.verify_vat_eu(country_code, number)
+        data = await run_in_threadpool(service.verify_vat_eu, country_code, number)
         
         if data:
             return {
@@ -303,3 +379,157 @@ async def verify_vat_quick(vat_number: str):
     except Exception as e:
         logger.error(f"Error verifying VAT {vat_number}: {e}")
         raise HTTPException(500, "Błąd weryfikacji VAT")
+
+
+@router.get("/verify/cache")
+async def get_verification_cache_stats():
+    """Liczniki cache rejestrów (trafienia, odświeżenia w tle, błędy)."""
+    return {"registries": get_service().cache_stats()}
+
+
+# ============================================
+# WERYFIKACJA MASOWA
+# ============================================
+
+def _detect_type(identifier: str) -> str:
+    """nip (10 cyfr) albo vat_eu (prefiks kraju); KRS trzeba wskazać jawnie."""
+    if re.match(r"^[A-Za-z]{2}", identifier):
+        return "vat_eu"
+    return "nip"
+
+
+def _dedupe(items: Iterable[Tuple[str, Optional[str]]]) -> Dict[Tuple[str, str], int]:
+    """(typ, identyfikator) -> liczba wystąpień, w kolejności pierwszego wystąpienia."""
+    from services.data_sources import normalize_identifier
+    unique: Dict[Tuple[str, str], int] = {}
+    for count, (identifier, kind) in enumerate(items, start=1):
+        if count > BULK_MAX_ITEMS:
+            raise HTTPException(413, f"Maksymalnie {BULK_MAX_ITEMS} pozycji na żądanie")
+        identifier = (identifier or "").strip()
+        if not identifier:
+            continue
+        kind = (kind or "").strip().lower() or _detect_type(identifier)
+        key = (kind, normalize_identifier(kind, identifier))
+        unique[key] = unique.get(key, 0) + 1
+    return unique
+
+
+async def _stream_results(unique: Dict[Tuple[str, str], int]):
+    """Wyniki jako NDJSON w kolejności ukończenia + linia podsumowania."""
+    service = get_service()
+    loop = asyncio.get_running_loop()
+    summary = {"total": sum(unique.values()), "unique": len(unique), "valid": 0, "invalid": 0, "error": 0}
+
+    executor = ThreadPoolExecutor(max_workers=BULK_CONCURRENCY, thread_name_prefix="bulk-verify")
+
+    async def verify(kind: str, identifier: str, occurrences: int) -> Dict[str, Any]:
+        result = await loop.run_in_executor(executor, service.verify_identifier, kind, identifier)
+        result["occurrences"] = occurrences
+        return result
+
+    tasks = [
+        asyncio.ensure_future(verify(kind, identifier, occurrences))
+        for (kind, identifier), occurrences in unique.items()
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            summary[result["status"]] += 1
+            yield json.dumps(result, ensure_ascii=False, default=str) + "\n"
+        yield json.dumps({"summary": summary}) + "\n"
+    finally:
+        # Klient się rozłączył albo koniec - nieuruchomione zadania nie idą do rejestrów
+        for task in tasks:
+            task.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _parse_upload(upload: UploadFile) -> Iterator[Tuple[str, Optional[str]]]:
+    """Czyta plik CSV (identifier[,type]) albo NDJSON ({"identifier", "type"}) wiersz po wierszu."""
+    text = codecs.getreader("utf-8-sig")(upload.file, errors="replace")
+    name = (upload.filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")) or (upload.content_type or "").endswith("ndjson"):
+        for line in text:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                raise HTTPException(400, f"Nieprawidłowa linia NDJSON: {line[:80]}")
+            if isinstance(row, str):
+                yield row, None
+            else:
+                yield str(row.get("identifier", "")), row.get("type")
+        return
+
+    for row in csv.reader(text):
+        if not row or not row[0].strip():
+            continue
+        if row[0].strip().lower() in ("identifier", "nip", "id"):
+            continue  # nagłówek
+        yield row[0], row[1] if len(row) > 1 else None
+
+
+@router.post("/verify/validate")
+async def validate_bulk(request: BulkVerificationRequest):
+    """Walidacja offline (format + suma kontrolna) bez zapytań do rejestrów.
+    
+    Obsługuje też REGON (`type: regon`). Dla importów plików - tysiące pozycji
+    sprawdzane w milisekundach.
+    """
+    from services.data_sources import validate_identifiers
+    if len(request.items) > BULK_MAX_ITEMS:
+        raise HTTPException(413, f"Maksymalnie {BULK_MAX_ITEMS} pozycji na żądanie")
+    results = validate_identifiers(
+        (item.identifier, (item.type or _detect_type(item.identifier)).lower())
+        for item in request.items
+    )
+    invalid = sum(1 for r in results if not r.valid)
+    return {
+        "results": [r.to_dict() for r in results],
+        "valid": len(results) - invalid,
+        "invalid": invalid,
+    }
+
+
+@router.post("/verify/bulk")
+async def verify_bulk(request: BulkVerificationRequest):
+    """Weryfikacja masowa NIP / KRS / VAT UE.
+    
+    Duplikaty są sprawdzane raz (`occurrences` = liczba wystąpień na wejściu).
+    Zapytania idą równolegle, z limitem zapytań i circuit breakerem per rejestr;
+    wyniki są strumieniowane jako NDJSON w kolejności ukończenia
+    (`status`: valid / invalid / error), ostatnia linia to `{"summary": ...}`.
+    """
+    unique = _dedupe((item.identifier, item.type) for item in request.items)
+    return StreamingResponse(_stream_results(unique), media_type="application/x-ndjson")
+
+
+@router.post("/verify/bulk/jobs", status_code=202)
+async def verify_bulk_job(request: BulkVerificationRequest):
+    """Weryfikacja masowa jako zadanie w tle (worker) - dla list, na które klient nie czeka.
+    
+    Wynik (`summary` + `results`) i postęp: GET /api/v1/jobs/{job_id}.
+    """
+    from services.jobs import PRIORITY_HIGH, enqueue
+
+    unique = _dedupe((item.identifier, item.type) for item in request.items)
+    if not unique:
+        raise HTTPException(400, "Brak identyfikatorów")
+    items = [[kind, identifier, occurrences] for (kind, identifier), occurrences in unique.items()]
+    try:
+        job_id = await run_in_threadpool(enqueue, "verify.bulk", {"items": items}, PRIORITY_HIGH)
+    except Exception as e:
+        logger.error(f"Error enqueuing bulk verification: {e}")
+        raise HTTPException(500, "Nie udało się zlecić weryfikacji")
+    return {"status": "queued", "job_id": job_id, "unique": len(items)}
+
+
+@router.post("/verify/bulk/upload")
+async def verify_bulk_upload(file: UploadFile = File(...)):
+    """Weryfikacja masowa z pliku CSV (`identifier,type`) lub NDJSON."""
+    unique = await run_in_threadpool(lambda: _dedupe(_parse_upload(file)))
+    if not unique:
+        raise HTTPException(400, "Plik nie zawiera identyfikatorów")
+    return StreamingResponse(_stream_results(unique), media_type="application/x-ndjson")
@@ -0,0 +1,55 @@
+"""
+Auth Service - identyfikacja użytkownika z lokalnego tokenu JWT
+================================================================
+Token wystawia main.py::sso_login (claim `sub` = ID użytkownika z IDCard.pl).
+Endpointy, które działają także anonimowo, używają `get_optional_user_id`;
+zapisy - `get_optional_user_id_strict` (nieważny token to 401, a nie zapis
+jako anonim do wspólnego profilu).
+"""
+import logging
+import os
+from typing import Optional
+
+import jwt
+from fastapi import Header, HTTPException
+
+logger = logging.getLogger(__name__)
+
+JWT_SECRET = os.getenv("JWT_SECRET", "detax-secret-key-change-in-production")
+
+
+def decode_user_id(token: str) -> Optional[str]:
+    """Zwraca `sub` z poprawnego tokenu Detax albo None."""
+    try:
+        payload = jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
+    except jwt.InvalidTokenError as e:
+        logger.debug(f"Rejected bearer token: {e}")
+        return None
+    return payload.get("sub")
+
+
+async def get_optional_user_id(authorization: Optional[str] = Header(default=None)) -> Optional[str]:
+    """Zależność FastAPI: ID użytkownika z nagłówka `Authorization: Bearer ...` (opcjonalnie)."""
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return decode_user_id(token.strip())
+
+
+async def get_optional_user_id_strict(authorization: Optional[str] = Header(default=None)) -> Optional[str]:
+    """Jak `get_optional_user_id`, ale nagłówek `Authorization` z nieważnym tokenem daje 401.
+
+    None tylko bez nagłówka - wygasła sesja nie może nadpisać danych anonimowych.
+    """
+    if not authorization:
+        return None
+    user_id = await get_optional_user_id(authorization)
+    if user_id is None:
+        raise HTTPException(
+            status_code=401,
+            detail="Nieprawidłowy lub wygasły token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user_id
@@ -0,0 +1,164 @@
+"""
+Context Tree - zmaterializowana hierarchia Kontakty -> Projekty -> Pliki
+========================================================================
+Read model aktualizowany przyrostowo z eventów projektów (ProjectCreated,
+ProjectUpdated, ProjectDeleted, ProjectFileAdded, ProjectFileRemoved)
+w tej samej transakcji co zapis eventu. Każda zmiana podbija wersję
+w read_model_versions, z której routers/context.py buduje ETag.
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+READ_MODEL_NAME = "context_tree"
+DEFAULT_CONTACT = "Inne"
+
+
+def _contact_name(contact: Optional[str]) -> str:
+    return contact or DEFAULT_CONTACT
+
+
+def _bump_version(cur) -> None:
+    cur.execute(
+        """
+        INSERT INTO read_model_versions (name, version, updated_at)
+        VALUES (%s, 1, NOW())
+        ON CONFLICT (name) DO UPDATE
+        SET version = read_model_versions.version + 1,
+            updated_at = NOW()
+        """,
+        (READ_MODEL_NAME,),
+    )
+
+
+def apply_event(cur, aggregate_type: str, event_type: str, payload: Dict[str, Any]) -> None:
+    """Projekcja pojedynczego eventu na tabelę context_tree (wywoływana z append_event)."""
+    if aggregate_type != "project":
+        return
+
+    if event_type in ("ProjectCreated", "ProjectUpdated"):
+        cur.execute(
+            """
+            INSERT INTO context_tree (project_id, contact, name, description)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (project_id) DO UPDATE
+            SET contact = EXCLUDED.contact,
+                name = EXCLUDED.name,
+                description = EXCLUDED.description,
+                updated_at = NOW()
+            """,
+            (payload["id"], _contact_name(payload.get("contact")), payload.get("name"), payload.get("description")),
+        )
+    elif event_type == "ProjectDeleted":
+        cur.execute("DELETE FROM context_tree WHERE project_id = %s", (payload["id"],))
+    elif event_type == "ProjectFileAdded":
+        cur.execute(
+            """
+            UPDATE context_tree
+            SET files = files || jsonb_build_array(
+                    jsonb_build_object('id', %s::int, 'filename', %s::text, 'path', %s::text)
+                ),
+                updated_at = NOW()
+            WHERE project_id = %s
+            """,
+            (payload["fileId"], payload.get("filename"), payload.get("path"), payload["projectId"]),
+        )
+    elif event_type == "ProjectFileRemoved":
+        cur.execute(
+            """
+            UPDATE context_tree
+            SET files = COALESCE(
+                    (SELECT jsonb_agg(f) FROM jsonb_array_elements(files) f
+                     WHERE (f->>'id')::int <> %s),
+                    '[]'::jsonb
+                ),
+                updated_at = NOW()
+            WHERE project_id = %s
+            """,
+            (payload["fileId"], payload["projectId"]),
+        )
+    else:
+        return
+
+    _bump_version(cur)
+
+
+def rebuild(conn) -> int:
+    """Odbudowuje cały read model z tabel projects/project_files. Zwraca liczbę projektów."""
+    with conn.cursor() as cur:
+        cur.execute("DELETE FROM context_tree")
+        cur.execute(
+            """
+            INSERT INTO context_tree (project_id, contact, name, description, files)
+            SELECT
+                p.id,
+                COALESCE(p.contact, %s),
+                p.name,
+                p.description,
+                COALESCE(
+                    (SELECT jsonb_agg(jsonb_build_object('id', f.id, 'filename', f.filename, 'path', f.path) ORDER BY f.id)
+                     FROM project_files f WHERE f.project_id = p.id),
+                    '[]'::jsonb
+                )
+            FROM projects p
+            """,
+            (DEFAULT_CONTACT,),
+        )
+        count = cur.rowcount
+        _bump_version(cur)
+    conn.commit()
+    logger.info(f"Context tree rebuilt: {count} projects")
+    return count
+
+
+def get_version(cur) -> int:
+    cur.execute("SELECT version FROM read_model_versions WHERE name = %s", (READ_MODEL_NAME,))
+    row = cur.fetchone()
+    if not row:
+        return 0
+    return row["version"] if isinstance(row, dict) else row[0]
+
+
+def list_contacts(cur, after: Optional[str], limit: int) -> List[Dict[str, Any]]:
+    """Strona kontaktów (keyset po nazwie) z licznikami projektów i plików."""
+    cur.execute(
+        """
+        SELECT contact AS name,
+               COUNT(*) AS project_count,
+               COALESCE(SUM(jsonb_array_length(files)), 0) AS file_count
+        FROM context_tree
+        WHERE (%s::text IS NULL OR contact > %s::text)
+        GROUP BY contact
+        ORDER BY contact
+        LIMIT %s
+        """,
+        (after, after, limit),
+    )
+    return [dict(r) for r in cur.fetchall()]
+
+
+def get_projects(cur, contacts: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Projekty (z plikami) dla podanych kontaktów, pogrupowane po kontakcie."""
+    if not contacts:
+        return {}
+    cur.execute(
+        """
+        SELECT project_id AS id, contact, name, description, files
+        FROM context_tree
+        WHERE contact = ANY(%s)
+        ORDER BY contact, project_id DESC
+        """,
+        (contacts,),
+    )
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for row in cur.fetchall():
+        grouped.setdefault(row["contact"], []).append(
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "description": row["description"],
+                "files": row["files"] or [],
+            }
+        )
+    return grouped
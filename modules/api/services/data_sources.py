@@ -18,15 +18,55 @@ Data Sources Service - Integracje z źródłami danych prawnych
 - VIES (VAT Information Exchange System)
 """
 import os
+import re
 import logging
+import threading
 import requests
-from typing import Optional, List, Dict, Any
-from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+from dataclasses import dataclass, asdict
 from datetime import datetime, date
 from enum import Enum
 
+from services.cache import RegistryCache
+from services.runtime import per_worker
+from services.throttling import CircuitBreaker, CircuitOpen, TokenBucket
+
 logger = logging.getLogger(__name__)
 
+# Limity zapytań do rejestrów (zapytań/s) - wspólne dla /verify i /verify/bulk,
+# podawane dla całej instancji API i dzielone między jej procesy
+REGISTRY_RATE_LIMITS = {
+    "ceidg": per_worker(float(os.getenv("CEIDG_RATE_LIMIT", "5")), minimum=0.1),
+    "krs": per_worker(float(os.getenv("KRS_RATE_LIMIT", "5")), minimum=0.1),
+    "vies": per_worker(float(os.getenv("VIES_RATE_LIMIT", "2")), minimum=0.1),
+}
+# Maksymalny czas oczekiwania (s) na wolny slot limitu
+REGISTRY_QUEUE_TIMEOUT = float(os.getenv("REGISTRY_QUEUE_TIMEOUT", "60"))
+
+
+class RegistryUnavailable(Exception):
+    """Rejestr nie odpowiedział poprawnie (timeout, 5xx, brak klucza API).
+
+    W odróżnieniu od wyniku None ("podmiot nie istnieje") nie jest cache'owany.
+    """
+
+
+# Statusy oznaczające odpowiedź merytoryczną "nie znaleziono / błędny numer"
+NOT_FOUND_STATUSES = (204, 400, 404)
+
+
+def _registry_json(resp: requests.Response, registry: str) -> Optional[Any]:
+    """JSON odpowiedzi, None dla "nie znaleziono", RegistryUnavailable dla pozostałych błędów."""
+    if resp.status_code == 200:
+        try:
+            return resp.json()
+        except ValueError as e:
+            # np. strona HTML "przerwa techniczna" z kodem 200
+            raise RegistryUnavailable(f"{registry} returned invalid JSON: {e}") from e
+    if resp.status_code in NOT_FOUND_STATUSES:
+        return None
+    raise RegistryUnavailable(f"{registry} returned HTTP {resp.status_code}")
+
 
 class SourceType(Enum):
     """Typ źródła danych."""
@@ -156,6 +196,167 @@ SOURCES: Dict[str, DataSource] = {
 }
 
 
+# ============================================
+# WALIDACJA IDENTYFIKATORÓW (offline)
+# ============================================
+# Sprawdzane przed każdym zapytaniem do rejestru - literówki nie kosztują
+# zapytania do CEIDG/VIES i timeoutu.
+
+NIP_WEIGHTS = (6, 5, 7, 2, 3, 4, 5, 6, 7)
+REGON9_WEIGHTS = (8, 9, 2, 3, 4, 5, 6, 7)
+REGON14_WEIGHTS = (2, 4, 8, 5, 0, 9, 7, 3, 6, 1, 2, 4, 8)
+
+_DIGITS = re.compile(r"^\d+$")
+_SEPARATORS = re.compile(r"[\s.\-]")
+
+# Format numeru VAT UE po prefiksie kraju (VIES); PL dodatkowo suma kontrolna NIP
+VAT_EU_PATTERNS: Dict[str, "re.Pattern[str]"] = {
+    country: re.compile(f"^(?:{pattern})$")
+    for country, pattern in {
+        "AT": r"U\d{8}",
+        "BE": r"[01]\d{9}",
+        "BG": r"\d{9,10}",
+        "CY": r"\d{8}[A-Z]",
+        "CZ": r"\d{8,10}",
+        "DE": r"\d{9}",
+        "DK": r"\d{8}",
+        "EE": r"\d{9}",
+        "EL": r"\d{9}",
+        "ES": r"[A-Z0-9]\d{7}[A-Z0-9]",
+        "FI": r"\d{8}",
+        "FR": r"[A-HJ-NP-Z0-9]{2}\d{9}",
+        "HR": r"\d{11}",
+        "HU": r"\d{8}",
+        "IE": r"\d{7}[A-W][A-I]?|\d[A-Z+*]\d{5}[A-W]",
+        "IT": r"\d{11}",
+        "LT": r"\d{9}|\d{12}",
+        "LU": r"\d{8}",
+        "LV": r"\d{11}",
+        "MT": r"\d{8}",
+        "NL": r"\d{9}B\d{2}",
+        "PL": r"\d{10}",
+        "PT": r"\d{9}",
+        "RO": r"[1-9]\d{1,9}",
+        "SE": r"\d{10}01",
+        "SI": r"\d{8}",
+        "SK": r"\d{10}",
+        "XI": r"\d{9}|\d{12}|GD\d{3}|HA\d{3}",
+    }.items()
+}
+
+
+@dataclass
+class ValidationResult:
+    """Wynik walidacji offline; `error` to kod: empty, format, checksum, country, type."""
+    identifier: str
+    type: str
+    valid: bool
+    error: Optional[str] = None
+    message: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def normalize_identifier(kind: str, identifier: str) -> str:
+    """Usuwa separatory; VAT UE wielkimi literami, NIP bez prefiksu PL, KRS do 10 cyfr."""
+    value = _SEPARATORS.sub("", identifier or "").upper()
+    if kind == "nip" and value.startswith("PL"):
+        value = value[2:]
+    if kind == "krs" and _DIGITS.match(value):
+        value = value.zfill(10)
+    return value
+
+
+def _weighted_mod11(digits: str, weights: Tuple[int, ...]) -> int:
+    return sum(int(d) * w for d, w in zip(digits, weights)) % 11
+
+
+def _invalid(value: str, kind: str, error: str, message: str) -> ValidationResult:
+    return ValidationResult(identifier=value, type=kind, valid=False, error=error, message=message)
+
+
+def validate_nip(identifier: str) -> ValidationResult:
+    value = normalize_identifier("nip", identifier)
+    if not value:
+        return _invalid(value, "nip", "empty", "Pusty NIP")
+    if len(value) != 10 or not _DIGITS.match(value):
+        return _invalid(value, "nip", "format", "NIP musi mieć 10 cyfr")
+    control = _weighted_mod11(value, NIP_WEIGHTS)
+    if control == 10 or control != int(value[9]):
+        return _invalid(value, "nip", "checksum", "Nieprawidłowa cyfra kontrolna NIP")
+    return ValidationResult(identifier=value, type="nip", valid=True)
+
+
+def validate_regon(identifier: str) -> ValidationResult:
+    value = normalize_identifier("regon", identifier)
+    if not value:
+        return _invalid(value, "regon", "empty", "Pusty REGON")
+    if len(value) not in (9, 14) or not _DIGITS.match(value):
+        return _invalid(value, "regon", "format", "REGON musi mieć 9 lub 14 cyfr")
+    weights = REGON9_WEIGHTS if len(value) == 9 else REGON14_WEIGHTS
+    if _weighted_mod11(value, weights) % 10 != int(value[-1]):
+        return _invalid(value, "regon", "checksum", "Nieprawidłowa cyfra kontrolna REGON")
+    return ValidationResult(identifier=value, type="regon", valid=True)
+
+
+def validate_krs(identifier: str) -> ValidationResult:
+    value = normalize_identifier("krs", identifier)
+    if not value:
+        return _invalid(value, "krs", "empty", "Pusty numer KRS")
+    if len(value) != 10 or not _DIGITS.match(value) or value == "0000000000":
+        return _invalid(value, "krs", "format", "Numer KRS to do 10 cyfr (np. 0000012345)")
+    return ValidationResult(identifier=value, type="krs", valid=True)
+
+
+def validate_vat_eu(identifier: str) -> ValidationResult:
+    value = normalize_identifier("vat_eu", identifier)
+    if not value:
+        return _invalid(value, "vat_eu", "empty", "Pusty numer VAT UE")
+    country, number = value[:2], value[2:]
+    pattern = VAT_EU_PATTERNS.get(country)
+    if pattern is None:
+        return _invalid(value, "vat_eu", "country", f"Nieznany prefiks kraju VAT UE: {country}")
+    if not pattern.match(number):
+        return _invalid(value, "vat_eu", "format", f"Nieprawidłowy format numeru VAT dla {country}")
+    if country == "PL" and not validate_nip(number).valid:
+        return _invalid(value, "vat_eu", "checksum", "Nieprawidłowa cyfra kontrolna NIP")
+    return ValidationResult(identifier=value, type="vat_eu", valid=True)
+
+
+VALIDATORS = {
+    "nip": validate_nip,
+    "regon": validate_regon,
+    "krs": validate_krs,
+    "vat_eu": validate_vat_eu,
+}
+
+
+def validate_identifier(kind: str, identifier: str) -> ValidationResult:
+    """Walidacja offline jednego identyfikatora dowolnego obsługiwanego typu."""
+    validator = VALIDATORS.get(kind)
+    if validator is None:
+        return _invalid(identifier, kind, "type", f"Nieobsługiwany typ identyfikatora: {kind}")
+    return validator(identifier)
+
+
+def validate_identifiers(items: Iterable[Tuple[str, str]]) -> List[ValidationResult]:
+    """Walidacja wsadowa par (identyfikator, typ), np. dla importu plików.
+
+    Powtarzające się wartości są liczone raz (import faktur zawiera tych samych
+    kontrahentów wielokrotnie).
+    """
+    seen: Dict[Tuple[str, str], ValidationResult] = {}
+    results = []
+    for identifier, kind in items:
+        key = (kind, identifier)
+        result = seen.get(key)
+        if result is None:
+            result = seen[key] = validate_identifier(kind, identifier)
+        results.append(result)
+    return results
+
+
 # ============================================
 # KLIENCI API
 # ============================================
@@ -238,12 +439,10 @@ class CEIDGClient:
         self.api_key = os.getenv("CEIDG_API_KEY")
         self.base_url = "https://dane.biznes.gov.pl/api/ceidg/v2"
     
-    def verify_nip(self, nip: str) -> Optional[Dict[str, Any]]:
-        """Weryfikuje NIP w CEIDG."""
+    def fetch_nip(self, nip: str) -> Optional[Dict[str, Any]]:
+        """Zapytanie do CEIDG; rzuca RegistryUnavailable przy błędzie rejestru."""
         if not self.api_key:
-            logger.warning("CEIDG_API_KEY not configured")
-            return None
-        
+            raise RegistryUnavailable("CEIDG_API_KEY not configured")
         try:
             resp = requests.get(
                 f"{self.base_url}/firmy",
@@ -251,8 +450,14 @@ class CEIDGClient:
                 headers={"Authorization": f"Bearer {self.api_key}"},
                 timeout=30
             )
-            if resp.status_code == 200:
-                return resp.json()
+        except requests.RequestException as e:
+            raise RegistryUnavailable(f"CEIDG request failed: {e}") from e
+        return _registry_json(resp, "CEIDG")
+    
+    def verify_nip(self, nip: str) -> Optional[Dict[str, Any]]:
+        """Weryfikuje NIP w CEIDG."""
+        try:
+            return self.fetch_nip(nip)
         except Exception as e:
             logger.error(f"Error verifying NIP {nip}: {e}")
         return None
@@ -263,8 +468,8 @@ class VIESClient:
     
     BASE_URL = "https://ec.europa.eu/taxation_customs/vies/rest-api/check-vat-number"
     
-    def verify_vat(self, country_code: str, vat_number: str) -> Optional[Dict[str, Any]]:
-        """Weryfikuje numer VAT w systemie VIES."""
+    def fetch_vat(self, country_code: str, vat_number: str) -> Optional[Dict[str, Any]]:
+        """Zapytanie do VIES; rzuca RegistryUnavailable przy błędzie rejestru."""
         try:
             resp = requests.post(
                 self.BASE_URL,
@@ -275,8 +480,18 @@ class VIESClient:
                 headers={"Content-Type": "application/json"},
                 timeout=30
             )
-            if resp.status_code == 200:
-                return resp.json()
+        except requests.RequestException as e:
+            raise RegistryUnavailable(f"VIES request failed: {e}") from e
+        data = _registry_json(resp, "VIES")
+        # VIES zgłasza niedostępność rejestru krajowego w treści odpowiedzi
+        if data and data.get("userError") not in (None, "VALID", "INVALID", "INVALID_INPUT"):
+            raise RegistryUnavailable(f"VIES error: {data.get('userError')}")
+        return data
+    
+    def verify_vat(self, country_code: str, vat_number: str) -> Optional[Dict[str, Any]]:
+        """Weryfikuje numer VAT w systemie VIES."""
+        try:
+            return self.fetch_vat(country_code, vat_number)
         except Exception as e:
             logger.error(f"Error verifying VAT {country_code}{vat_number}: {e}")
         return None
@@ -301,16 +516,22 @@ class KRSClient:
             logger.error(f"Error searching KRS for '{query}': {e}")
         return None
     
-    def get_company_by_krs(self, krs_number: str) -> Optional[Dict[str, Any]]:
-        """Pobiera dane spółki po numerze KRS."""
+    def fetch_company(self, krs_number: str) -> Optional[Dict[str, Any]]:
+        """Zapytanie do KRS; rzuca RegistryUnavailable przy błędzie rejestru."""
         try:
             resp = requests.get(
                 f"https://api-krs.ms.gov.pl/api/krs/OdpisPelny/{krs_number}",
                 params={"rejestr": "P", "format": "json"},
                 timeout=30
             )
-            if resp.status_code == 200:
-                return resp.json()
+        except requests.RequestException as e:
+            raise RegistryUnavailable(f"KRS request failed: {e}") from e
+        return _registry_json(resp, "KRS")
+    
+    def get_company_by_krs(self, krs_number: str) -> Optional[Dict[str, Any]]:
+        """Pobiera dane spółki po numerze KRS."""
+        try:
+            return self.fetch_company(krs_number)
         except Exception as e:
             logger.error(f"Error fetching KRS {krs_number}: {e}")
         return None
@@ -328,6 +549,35 @@ class DataSourcesService:
         self.ceidg = CEIDGClient()
         self.vies = VIESClient()
         self.krs = KRSClient()
+        # Cache odpowiedzi rejestrów (te same NIP-y kontrahentów wracają stale)
+        self.ceidg_cache = RegistryCache("ceidg")
+        self.krs_cache = RegistryCache("krs")
+        self.vies_cache = RegistryCache("vies", is_found=lambda data: bool(data and data.get("valid")))
+        self.limiters = {name: TokenBucket(rate) for name, rate in REGISTRY_RATE_LIMITS.items()}
+        self.breakers = {name: CircuitBreaker(name) for name in REGISTRY_RATE_LIMITS}
+    
+    def _call_registry(self, registry: str, fetch, *args) -> Optional[Dict[str, Any]]:
+        """Wywołanie rejestru pod circuit breakerem i limitem zapytań.
+
+        Breaker jest sprawdzany przed limitem - odrzucone wywołania nie zużywają
+        tokenów. Każdy wyjątek z `fetch` (także błąd parsowania) liczy się jako
+        błąd rejestru, więc próba half-open zawsze się rozstrzyga.
+        """
+        breaker = self.breakers[registry]
+        try:
+            breaker.before_call()
+        except CircuitOpen as e:
+            raise RegistryUnavailable(str(e)) from e
+        if not self.limiters[registry].acquire(timeout=REGISTRY_QUEUE_TIMEOUT):
+            breaker.release()
+            raise RegistryUnavailable(f"{registry} rate limit queue timeout")
+        try:
+            result = fetch(*args)
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        return result
     
     def list_sources(self, source_type: Optional[SourceType] = None) -> List[DataSource]:
         """Zwraca listę dostępnych źródeł."""
@@ -344,17 +594,82 @@ class DataSourcesService:
         """Zwraca listę kluczowych dokumentów prawnych."""
         return self.isap.list_key_documents()
     
-    def verify_company_nip(self, nip: str) -> Optional[Dict[str, Any]]:
-        """Weryfikuje firmę po NIP w CEIDG."""
-        return self.ceidg.verify_nip(nip)
+    def verify_company_nip(self, nip: str, raise_errors: bool = False) -> Optional[Dict[str, Any]]:
+        """Weryfikuje firmę po NIP w CEIDG (z cache)."""
+        nip = normalize_identifier("nip", nip)
+        return self.ceidg_cache.get(
+            nip, lambda: self._call_registry("ceidg", self.ceidg.fetch_nip, nip), raise_errors
+        )
     
-    def verify_company_krs(self, krs: str) -> Optional[Dict[str, Any]]:
-        """Pobiera dane spółki z KRS."""
-        return self.krs.get_company_by_krs(krs)
+    def cached_company_nip(self, nip: str) -> Optional[Dict[str, Any]]:
+        """Wpis CEIDG z cache bez czekania na rejestr; brakujący jest pobierany w tle."""
+        nip = normalize_identifier("nip", nip)
+        return self.ceidg_cache.peek(nip, lambda: self._call_registry("ceidg", self.ceidg.fetch_nip, nip))
     
-    def verify_vat_eu(self, country_code: str, vat_number: str) -> Optional[Dict[str, Any]]:
-        """Weryfikuje numer VAT UE w VIES."""
-        return self.vies.verify_vat(country_code, vat_number)
+    def verify_company_krs(self, krs: str, raise_errors: bool = False) -> Optional[Dict[str, Any]]:
+        """Pobiera dane spółki z KRS (z cache)."""
+        krs = normalize_identifier("krs", krs)
+        return self.krs_cache.get(
+            krs, lambda: self._call_registry("krs", self.krs.fetch_company, krs), raise_errors
+        )
+    
+    def verify_vat_eu(self, country_code: str, vat_number: str, raise_errors: bool = False) -> Optional[Dict[str, Any]]:
+        """Weryfikuje numer VAT UE w VIES (z cache)."""
+        country_code = country_code.upper()
+        vat_number = vat_number.replace(" ", "")
+        return self.vies_cache.get(
+            f"{country_code}{vat_number}",
+            lambda: self._call_registry("vies", self.vies.fetch_vat, country_code, vat_number),
+            raise_errors
+        )
+    
+    def verify_identifier(self, kind: str, identifier: str) -> Dict[str, Any]:
+        """Weryfikacja jednego identyfikatora do masowego przetwarzania.
+        
+        Zwraca słownik wyniku zamiast rzucać - błąd rejestru to `error`, nie wyjątek.
+        """
+        validation = validate_identifier(kind, identifier)
+        if not validation.valid:
+            return {
+                "identifier": validation.identifier,
+                "type": kind,
+                "valid": False,
+                "status": "invalid",
+                "error": validation.message,
+                "error_code": validation.error,
+            }
+        identifier = validation.identifier
+        result: Dict[str, Any] = {"identifier": identifier, "type": kind, "valid": False, "status": "error"}
+        try:
+            if kind == "nip":
+                data = self.verify_company_nip(identifier, raise_errors=True)
+                valid = data is not None
+            elif kind == "krs":
+                data = self.verify_company_krs(identifier, raise_errors=True)
+                valid = data is not None
+            elif kind == "vat_eu":
+                data = self.verify_vat_eu(identifier[:2], identifier[2:], raise_errors=True)
+                valid = bool(data and data.get("valid"))
+            else:
+                result["status"] = "invalid"
+                result["error"] = f"Typ {kind} nie ma rejestru do weryfikacji online"
+                return result
+        except RegistryUnavailable as e:
+            result["error"] = f"Rejestr niedostępny: {e}"
+            return result
+        result["valid"] = valid
+        result["status"] = "valid" if valid else "invalid"
+        result["data"] = data
+        if not valid:
+            result["error"] = "Nie znaleziono w rejestrze"
+        return result
+    
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Liczniki trafień cache rejestrów i stan circuit breakerów."""
+        return {
+            cache.registry: {**cache.stats, "circuit": self.breakers[cache.registry].to_dict()}
+            for cache in (self.ceidg_cache, self.krs_cache, self.vies_cache)
+        }
     
     def get_document_sources_for_category(self, category: str) -> List[Dict[str, Any]]:
         """Zwraca źródła dokumentów dla kategorii."""
@@ -374,4 +689,27 @@ class DataSourcesService:
 # SINGLETON INSTANCE
 # ============================================
 
-data_sources_service = DataSourcesService()
+# Klienci rejestrów, cache i limity tworzone przy pierwszym użyciu
+_service: Optional[DataSourcesService] = None
+_service_lock = threading.Lock()
+
+
+def get_data_sources_service() -> DataSourcesService:
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = DataSourcesService()
+    return _service
+
+
+def registry_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Statystyki cache rejestrów; pusto, dopóki serwis nie został użyty."""
+    return _service.cache_stats() if _service is not None else {}
+
+
+def __getattr__(name: str):
+    # `from services.data_sources import data_sources_service` nadal działa (PEP 562)
+    if name == "data_sources_service":
+        return get_data_sources_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
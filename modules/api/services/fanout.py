@@ -0,0 +1,98 @@
+"""
+Fan-out Service - równoległe pobieranie niezależnych źródeł kontekstu
+======================================================================
+Uruchamia wiele źródeł naraz (funkcje synchroniczne w wątkach, korutyny
+bezpośrednio) z jednym limitem czasu na całe wywołanie. Źródła, które nie
+zdążą, są pomijane - wynik jest częściowy, ale odpowiedź przychodzi w czasie
+najwolniejszego źródła (najpóźniej po `timeout`), a nie sumy wszystkich.
+"""
+import asyncio
+import inspect
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Domyślny limit czasu (s) na zebranie kontekstu
+CONTEXT_DEADLINE = float(os.getenv("CONTEXT_DEADLINE", "5"))
+
+
+@dataclass
+class FanoutResult:
+    """Wyniki fan-outu: wartości, czasy per źródło, błędy i źródła po terminie."""
+    results: Dict[str, Any] = field(default_factory=dict)
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    timed_out: List[str] = field(default_factory=list)
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.errors or self.timed_out)
+
+    def merge(self, other: "FanoutResult") -> "FanoutResult":
+        return FanoutResult(
+            results={**self.results, **other.results},
+            timings_ms={**self.timings_ms, **other.timings_ms},
+            errors={**self.errors, **other.errors},
+            timed_out=self.timed_out + other.timed_out,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "timings_ms": self.timings_ms,
+            "timed_out": self.timed_out,
+            "errors": self.errors,
+            "partial": self.partial,
+        }
+
+
+async def gather_with_deadline(sources: Dict[str, Callable[[], Any]], timeout: float = CONTEXT_DEADLINE) -> FanoutResult:
+    """Uruchamia wszystkie źródła równolegle i czeka najwyżej `timeout` sekund.
+
+    Funkcje synchroniczne (requests, psycopg2) trafiają do puli wątków; wątki
+    źródeł po terminie kończą się same (własne timeouty HTTP), a ich wyniki są
+    ignorowane.
+    """
+    result = FanoutResult()
+    if not sources:
+        return result
+
+    async def run(name: str, fn: Callable[[], Any]):
+        started = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(fn):
+                value = await fn()
+            else:
+                value = await asyncio.to_thread(fn)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            result.timings_ms[name] = round((time.perf_counter() - started) * 1000, 1)
+            raise
+        result.timings_ms[name] = round((time.perf_counter() - started) * 1000, 1)
+        return value
+
+    tasks = {asyncio.create_task(run(name, fn)): name for name, fn in sources.items()}
+    done, pending = await asyncio.wait(tasks.keys(), timeout=max(timeout, 0))
+
+    for task in done:
+        name = tasks[task]
+        exc = task.exception()
+        if exc is not None:
+            logger.warning(f"Context source '{name}' failed: {exc}")
+            result.errors[name] = str(exc)
+        else:
+            result.results[name] = task.result()
+
+    for task in pending:
+        name = tasks[task]
+        task.cancel()
+        result.timed_out.append(name)
+        result.timings_ms[name] = round(timeout * 1000, 1)
+    if pending:
+        logger.warning(f"Context sources timed out after {timeout}s: {sorted(result.timed_out)}")
+
+    return result
@@ -0,0 +1,149 @@
+"""
+Layout Store - układy dashboardu per użytkownik
+===============================================
+Układ przypisany jest do profilu: `sub` z tokenu SSO albo 'default' dla
+żądań anonimowych. Przechowywany w dashboard_layouts (JSONB + wersja).
+
+Cache write-through w pamięci procesu:
+- odczyt trafiający w cache nie łączy się z bazą (także brak zapisanego
+  układu - wtedy zwracany jest układ domyślny),
+- zapis idzie do bazy i od razu podmienia wpis w cache,
+- wpis żyje LAYOUT_CACHE_TTL sekund - przy kilku workerach zapis w jednym
+  procesie jest widoczny w pozostałych najpóźniej po tym czasie.
+
+ETag wynika z profilu i wersji układu, więc 304 nie wymaga serializacji.
+"""
+import copy
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from psycopg2.extras import Json, RealDictCursor
+
+from services.db import db_pool
+from services.http_cache import make_etag
+from services.runtime import per_worker_int
+
+logger = logging.getLogger(__name__)
+
+LAYOUT_CACHE_TTL = float(os.getenv("LAYOUT_CACHE_TTL", "300"))
+LAYOUT_CACHE_SIZE = per_worker_int(int(os.getenv("LAYOUT_CACHE_SIZE", "10000")), minimum=100)
+
+DEFAULT_PROFILE = "default"
+
+DEFAULT_LAYOUT = {
+    "modules": [
+        {"id": "topics", "column": "left", "order": 0},
+        {"id": "contacts", "column": "left", "order": 1},
+        {"id": "channels", "column": "left", "order": 2},
+        {"id": "chat", "column": "left", "order": 3},
+        {"id": "quick", "column": "left", "order": 4},
+        {"id": "projects", "column": "right", "order": 0},
+        {"id": "files", "column": "right", "order": 1},
+    ]
+}
+
+
+@dataclass
+class StoredLayout:
+    profile: str
+    layout: Dict[str, Any]
+    version: int  # 0 = brak zapisanego układu (domyślny)
+    loaded_at: float = 0.0
+
+    @property
+    def etag(self) -> str:
+        return make_etag("layout", self.profile, self.version)
+
+
+class LayoutStore:
+    """LRU układów z TTL przed tabelą dashboard_layouts."""
+
+    def __init__(self, ttl: float = LAYOUT_CACHE_TTL, max_entries: int = LAYOUT_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, StoredLayout]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "writes": 0}
+
+    # ─── Cache ───
+
+    def cached(self, profile: str) -> Optional[StoredLayout]:
+        """Wpis z pamięci (bez I/O) albo None, gdy brak lub wygasł."""
+        with self._lock:
+            entry = self._entries.get(profile)
+            if entry is None or time.monotonic() - entry.loaded_at > self.ttl:
+                return None
+            self._entries.move_to_end(profile)
+            self.stats["hits"] += 1
+            return entry
+
+    def _put(self, entry: StoredLayout) -> StoredLayout:
+        entry.loaded_at = time.monotonic()
+        with self._lock:
+            self._entries[entry.profile] = entry
+            self._entries.move_to_end(entry.profile)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, profile: Optional[str] = None):
+        with self._lock:
+            if profile is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(profile, None)
+
+    # ─── Baza ───
+
+    def _load(self, profile: str) -> Tuple[Dict[str, Any], int]:
+        with db_pool.connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("SELECT layout, version FROM dashboard_layouts WHERE profile = %s", (profile,))
+            row = cur.fetchone()
+        if not row:
+            return copy.deepcopy(DEFAULT_LAYOUT), 0
+        return row["layout"], row["version"]
+
+    def _store(self, profile: str, layout: Dict[str, Any]) -> int:
+        with db_pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO dashboard_layouts (profile, layout)
+                    VALUES (%s, %s)
+                    ON CONFLICT (profile) DO UPDATE
+                    SET layout = EXCLUDED.layout,
+                        version = dashboard_layouts.version + 1,
+                        updated_at = NOW()
+                    RETURNING version
+                    """,
+                    (profile, Json(layout)),
+                )
+                version = cur.fetchone()[0]
+            conn.commit()
+        return version
+
+    # ─── API ───
+
+    def get(self, profile: str) -> StoredLayout:
+        entry = self.cached(profile)
+        if entry is not None:
+            return entry
+        with self._lock:
+            self.stats["misses"] += 1
+        layout, version = self._load(profile)
+        return self._put(StoredLayout(profile, layout, version))
+
+    def save(self, profile: str, layout: Dict[str, Any]) -> StoredLayout:
+        """Zapis do bazy, a następnie do cache (write-through)."""
+        version = self._store(profile, layout)
+        with self._lock:
+            self.stats["writes"] += 1
+        return self._put(StoredLayout(profile, layout, version))
+
+
+layout_store = LayoutStore()
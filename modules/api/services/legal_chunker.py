@@ -0,0 +1,188 @@
+"""
+Legal Chunker - podział aktów prawnych według struktury
+========================================================
+Zamiast okien po N znaków dzieli tekst ustawy na jednostki redakcyjne:
+artykuł -> paragraf (§) / ustęp -> punkt. Każdy fragment ma w metadanych
+pełną ścieżkę (act, article, paragraph, point), więc wyszukiwanie zwraca
+konkretny przepis, a model może cytować "art. 22 § 1".
+
+Artykuł mieszczący się w limicie tokenów jest jednym fragmentem; dłuższe są
+dzielone na paragrafy/ustępy, a te na grupy punktów.
+"""
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.ingestion import chunk_text, estimate_tokens
+
+LEGAL_CHUNK_MAX_TOKENS = int(os.getenv("LEGAL_CHUNK_MAX_TOKENS", "400"))
+
+SUPERSCRIPTS = "⁰¹²³⁴⁵⁶⁷⁸⁹"
+_SUP = f"[{SUPERSCRIPTS}]*"
+
+# "Art. 22.", "Art. 106na.", "Art. 22¹." - na początku linii
+ARTICLE_RE = re.compile(rf"^[ \t]*Art\.[ \t]*(\d+[a-z]*{_SUP})\.?(?=\s)", re.MULTILINE)
+# "§ 1.", "§ 1¹."
+PARAGRAPH_RE = re.compile(rf"^[ \t]*§[ \t]*(\d+[a-z]*{_SUP})\.", re.MULTILINE)
+# ustęp w ustawach: "1.", "2a."
+SECTION_RE = re.compile(rf"^[ \t]*(\d+[a-z]*{_SUP})\.[ \t]", re.MULTILINE)
+# punkt: "1)", "12a)"
+POINT_RE = re.compile(rf"^[ \t]*(\d+[a-z]*{_SUP})\)[ \t]", re.MULTILINE)
+
+
+@dataclass
+class LegalChunk:
+    content: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+def citation_path(article: Optional[str], paragraph: Optional[str] = None, point: Optional[str] = None,
+                  paragraph_kind: str = "paragraph") -> str:
+    """Ścieżka do cytowania, np. 'art. 22 § 1¹' albo 'art. 106na ust. 1 pkt 2'."""
+    parts = [f"art. {article}"] if article else []
+    if paragraph:
+        parts.append(f"§ {paragraph}" if paragraph_kind == "paragraph" else f"ust. {paragraph}")
+    if point:
+        parts.append(f"pkt {point}")
+    return " ".join(parts)
+
+
+def looks_like_legal_text(text: str) -> bool:
+    """Czy tekst ma strukturę aktu prawnego (artykuły albo paragrafy)?"""
+    return bool(ARTICLE_RE.search(text or "")) or len(PARAGRAPH_RE.findall(text or "")) >= 2
+
+
+def _split(text: str, pattern: "re.Pattern[str]") -> Tuple[str, List[Tuple[str, str]]]:
+    """Dzieli tekst na (wstęp, [(numer, treść jednostki), ...]) według nagłówków."""
+    matches = list(pattern.finditer(text))
+    if not matches:
+        return text, []
+    lead = text[:matches[0].start()]
+    units = []
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        units.append((match.group(1), text[match.start():end].strip()))
+    return lead, units
+
+
+def _bounded(text: str, max_tokens: int) -> List[str]:
+    """Jednostka przekraczająca limit jest cięta rozmiarowo (ostateczność)."""
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+    return chunk_text(text, size=max_tokens * 4, overlap=min(200, max_tokens))
+
+
+class LegalChunker:
+    """Podział tekstu aktu na fragmenty z hierarchicznymi metadanymi."""
+
+    def __init__(self, max_tokens: int = LEGAL_CHUNK_MAX_TOKENS):
+        self.max_tokens = max_tokens
+
+    def chunk(self, text: str, act: Optional[str] = None) -> List[LegalChunk]:
+        chunks: List[LegalChunk] = []
+        lead, articles = _split(text or "", ARTICLE_RE)
+
+        if not articles:
+            # Dokument z samymi paragrafami (np. wyciąg jednego artykułu)
+            lead, paragraphs = _split(text or "", PARAGRAPH_RE)
+            if lead.strip():
+                chunks.extend(self._plain(lead, act))
+            for number, body in paragraphs:
+                chunks.extend(self._unit(body, act, None, number, "paragraph"))
+            return chunks
+
+        if lead.strip():
+            chunks.extend(self._plain(lead, act))
+        for article, body in articles:
+            chunks.extend(self._article(body, act, article))
+        return chunks
+
+    def _plain(self, text: str, act: Optional[str]) -> List[LegalChunk]:
+        return [LegalChunk(part, self._meta(act, None, unit="preamble")) for part in _bounded(text.strip(), self.max_tokens)]
+
+    def _meta(self, act, article, paragraph=None, point=None, kind="paragraph", unit="article") -> Dict[str, Any]:
+        return {
+            "act": act,
+            "article": article,
+            "paragraph": paragraph,
+            "paragraph_kind": kind if paragraph else None,
+            "point": point,
+            "unit": unit,
+            "path": citation_path(article, paragraph, point, kind),
+        }
+
+    def _article(self, body: str, act: Optional[str], article: str) -> List[LegalChunk]:
+        if estimate_tokens(body) <= self.max_tokens:
+            return [LegalChunk(body, self._meta(act, article))]
+
+        # "Art. 22. § 1. Przez..." - pierwsza jednostka zwykle w linii nagłówka
+        body = re.sub(
+            rf"^(\s*Art\.\s*{re.escape(article)}\.?)[ \t]+(?=§|\d+[a-z]*{_SUP}\.[ \t])",
+            r"\1\n",
+            body,
+            count=1,
+        )
+
+        lead, units = _split(body, PARAGRAPH_RE)
+        kind = "paragraph"
+        if not units:
+            lead, units = _split(body, SECTION_RE)
+            kind = "section"
+        if not units:
+            return [LegalChunk(part, self._meta(act, article)) for part in _bounded(body, self.max_tokens)]
+
+        chunks = []
+        header = f"Art. {article}."
+        if lead.strip() and lead.strip() != header:
+            chunks.extend(LegalChunk(part, self._meta(act, article)) for part in _bounded(lead.strip(), self.max_tokens))
+        for number, unit_body in units:
+            chunks.extend(self._unit(unit_body, act, article, number, kind))
+        return chunks
+
+    def _unit(self, body: str, act, article, paragraph, kind) -> List[LegalChunk]:
+        prefix = f"Art. {article} " if article else ""
+        if prefix and kind == "section":
+            prefix += "ust. "
+        if estimate_tokens(prefix + body) <= self.max_tokens:
+            return [LegalChunk(prefix + body, self._meta(act, article, paragraph, kind=kind, unit=kind))]
+
+        lead, points = _split(body, POINT_RE)
+        if not points:
+            # Kolejne części niosą pełną ścieżkę, żeby dało się je zacytować
+            label = f"[{citation_path(article, paragraph, None, kind) or f'§ {paragraph}'}] "
+            parts = _bounded(body, self.max_tokens - estimate_tokens(label) - 1)
+            return [
+                LegalChunk((prefix if i == 0 else label) + part,
+                           self._meta(act, article, paragraph, kind=kind, unit=kind))
+                for i, part in enumerate(parts)
+            ]
+
+        # Grupy kolejnych punktów w limicie, każda z wprowadzeniem do wyliczenia
+        intro = lead.strip()
+        chunks = []
+        group: List[Tuple[str, str]] = []
+
+        def flush():
+            if not group:
+                return
+            numbers = group[0][0] if len(group) == 1 else f"{group[0][0]}-{group[-1][0]}"
+            content = "\n".join([intro] + [p for _, p in group])
+            for part in _bounded(prefix + content, self.max_tokens - 1):
+                chunks.append(LegalChunk(part, self._meta(act, article, paragraph, numbers, kind, unit="point")))
+            group.clear()
+
+        budget = self.max_tokens - estimate_tokens(prefix + intro)
+        used = 0
+        for number, point_body in points:
+            tokens = estimate_tokens(point_body)
+            if group and used + tokens > budget:
+                flush()
+                used = 0
+            group.append((number, point_body))
+            used += tokens
+        flush()
+        return chunks
+
+
+legal_chunker = LegalChunker()
@@ -0,0 +1,172 @@
+"""
+Metrics - metryki Prometheus
+============================
+- czas żądań HTTP per szablon trasy (middleware ASGI),
+- czas etapów czatu: embedding, wyszukiwanie wektorowe/pełnotekstowe,
+  generacja (`stage()`), liczba fallbacków na wyszukiwanie tekstowe,
+- statystyki generacji Ollama (tokeny/s, prompt eval, ładowanie modelu)
+  z pól odpowiedzi /api/generate,
+- stan puli połączeń DB i współczynniki trafień cache rejestrów i układów
+  dashboardu (zbierane w momencie scrape'u).
+
+Przy wielu procesach (gunicorn, PROMETHEUS_MULTIPROC_DIR) histogramy
+i liczniki są sumowane z plików wszystkich workerów; metryki puli i cache
+dotyczą procesu, który obsłużył scrape.
+
+Eksport: GET /metrics.
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from services.tracing import Span, span
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "bielik_http_request_duration_seconds",
+    "Czas obsługi żądania HTTP",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+STAGE_DURATION = Histogram(
+    "bielik_stage_duration_seconds",
+    "Czas etapu przetwarzania czatu",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+SEARCH_FALLBACKS = Counter(
+    "bielik_search_fallbacks_total",
+    "Przejścia na wyszukiwanie pełnotekstowe",
+    ["reason"],
+)
+OLLAMA_TOKENS = Counter(
+    "bielik_ollama_tokens_total",
+    "Tokeny przetworzone przez Ollama",
+    ["kind"],
+)
+OLLAMA_TOKENS_PER_SECOND = Histogram(
+    "bielik_ollama_generation_tokens_per_second",
+    "Szybkość generacji (eval_count / eval_duration)",
+    buckets=(1, 2, 5, 10, 15, 20, 30, 50, 75, 100, 200),
+)
+OLLAMA_PROMPT_EVAL_DURATION = Histogram(
+    "bielik_ollama_prompt_eval_duration_seconds",
+    "Czas przetwarzania promptu (prompt_eval_duration)",
+    buckets=LATENCY_BUCKETS,
+)
+OLLAMA_LOAD_DURATION = Histogram(
+    "bielik_ollama_load_duration_seconds",
+    "Czas ładowania modelu (load_duration)",
+    buckets=LATENCY_BUCKETS,
+)
+
+
+@contextmanager
+def stage(name: str, **attributes: Any) -> Iterator[Span]:
+    """Mierzy czas bloku jako etap `name` (także gdy blok rzuci wyjątek); etap jest też spanem."""
+    started = time.perf_counter()
+    try:
+        with span(name, **attributes) as current:
+            yield current
+    finally:
+        STAGE_DURATION.labels(stage=name).observe(time.perf_counter() - started)
+
+
+def observe_generation(result: Dict[str, Any]):
+    """Statystyki z odpowiedzi /api/generate (czasy w nanosekundach)."""
+    prompt_tokens = result.get("prompt_eval_count") or 0
+    eval_tokens = result.get("eval_count") or 0
+    eval_ns = result.get("eval_duration") or 0
+    OLLAMA_TOKENS.labels(kind="prompt").inc(prompt_tokens)
+    OLLAMA_TOKENS.labels(kind="generated").inc(eval_tokens)
+    if eval_tokens and eval_ns:
+        OLLAMA_TOKENS_PER_SECOND.observe(eval_tokens / (eval_ns / 1e9))
+    if result.get("prompt_eval_duration"):
+        OLLAMA_PROMPT_EVAL_DURATION.observe(result["prompt_eval_duration"] / 1e9)
+    if result.get("load_duration"):
+        OLLAMA_LOAD_DURATION.observe(result["load_duration"] / 1e9)
+
+
+class RuntimeCollector:
+    """Pula DB i cache - odczyt w momencie scrape'u, bez liczników w kodzie."""
+
+    def collect(self):
+        from services.db import db_pool
+        from services.data_sources import registry_cache_stats
+        from services.layouts import layout_store
+
+        pool = db_pool.stats()
+        connections = GaugeMetricFamily("bielik_db_pool_connections", "Połączenia w puli DB", labels=["state"])
+        connections.add_metric(["in_use"], pool["in_use"])
+        connections.add_metric(["idle"], pool["idle"])
+        connections.add_metric(["max"], pool["max"])
+        yield connections
+        events = CounterMetricFamily("bielik_db_pool_events", "Zdarzenia puli DB", labels=["event"])
+        for event in ("acquired", "timeouts", "discarded"):
+            events.add_metric([event], pool[event])
+        yield events
+        yield CounterMetricFamily(
+            "bielik_db_pool_wait_seconds", "Łączny czas oczekiwania na połączenie", value=pool["wait_seconds"]
+        )
+
+        requests = CounterMetricFamily("bielik_cache_requests", "Odczyty cache (rejestry, układy dashboardu)", labels=["cache", "result"])
+        ratio = GaugeMetricFamily("bielik_cache_hit_ratio", "Udział trafień cache", labels=["cache"])
+        caches = {**registry_cache_stats(), "layouts": layout_store.stats}
+        for name, stats in caches.items():
+            for result in ("hits", "stale_hits", "misses", "coalesced", "errors"):
+                requests.add_metric([name, result], stats.get(result, 0))
+            total = stats.get("hits", 0) + stats.get("stale_hits", 0) + stats.get("misses", 0)
+            ratio.add_metric([name], (stats.get("hits", 0) + stats.get("stale_hits", 0)) / total if total else 0.0)
+        yield requests
+        yield ratio
+
+
+REGISTRY.register(RuntimeCollector())
+
+
+class MetricsMiddleware:
+    """Middleware ASGI: histogram czasu żądań z etykietą szablonu trasy.
+
+    Szablon (np. /api/v1/documents/{doc_id}) zamiast ścieżki ogranicza
+    liczbę serii; nieznane trasy trafiają do "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status["code"]),
+            ).observe(time.perf_counter() - started)
+
+
+def render_latest() -> bytes:
+    if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(RuntimeCollector())
+    return generate_latest(registry)
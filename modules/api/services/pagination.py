@@ -0,0 +1,53 @@
+"""
+Pagination - paginacja keyset i przybliżone liczności
+=====================================================
+- kursor: nieprzezroczysty token (base64url z JSON) z wartościami klucza
+  sortowania ostatniego wiersza strony; następna strona to
+  `WHERE (klucz, id) > (kursor)` po indeksie, bez OFFSET,
+- liczność: szacunek planera (EXPLAIN, "Plan Rows") zamiast COUNT(*) -
+  koszt stały niezależnie od rozmiaru tabeli.
+"""
+import base64
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+
+class InvalidCursor(ValueError):
+    """Kursor uszkodzony albo z innego sortowania."""
+
+
+def encode_cursor(**values: Any) -> str:
+    raw = json.dumps(values, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Dict[str, Any]:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {e}") from e
+    if not isinstance(values, dict):
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str], default: Sequence[str]) -> List[str]:
+    """Lista kolumn z parametru `fields=a,b,c` (kolejność jak w `allowed`)."""
+    if not fields:
+        return list(default)
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return [f for f in allowed if f in requested]
+
+
+def estimate_count(cur, query: str, params: Iterable[Any] = ()) -> int:
+    """Szacowana liczba wierszy zapytania według statystyk planera."""
+    cur.execute(f"EXPLAIN (FORMAT JSON) {query}", tuple(params))
+    row = cur.fetchone()
+    plan = row["QUERY PLAN"] if isinstance(row, dict) else row[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,27 @@
+"""
+Runtime - budżety zasobów przy wielu procesach API
+==================================================
+Produkcyjnie API działa jako WEB_CONCURRENCY procesów (gunicorn.conf.py).
+Limity wspólne dla całej instancji - połączenia do Postgresa, zapytania/s
+do rejestrów, pamięć na cache L1 - są podawane łącznie i dzielone przez
+liczbę procesów, żeby N workerów razem nie przekroczyło budżetu jednego.
+
+Dla WEB_CONCURRENCY=1 (uvicorn w dev) wartości są takie jak wcześniej.
+"""
+import os
+
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY") or "1"))
+
+
+def per_worker(total: float, minimum: float = 1, workers: int = WEB_CONCURRENCY) -> float:
+    """Część budżetu `total` przypadająca na jeden proces (nie mniej niż `minimum`).
+
+    Wartość <= 0 ("bez limitu") przechodzi bez zmian.
+    """
+    if total <= 0:
+        return total
+    return max(minimum, total / max(1, workers))
+
+
+def per_worker_int(total: int, minimum: int = 1, workers: int = WEB_CONCURRENCY) -> int:
+    return max(minimum, int(total) // max(1, workers))
@@ -0,0 +1,127 @@
+"""
+Shared State - stan procesu ładowany z bazy wiedzy
+==================================================
+Indeks cytowań i centroidy routera modułów są ładowane raz w masterze
+gunicorna przed fork (preload_app) i dziedziczone przez workery
+(copy-on-write). Stan nie wygasa po czasie: każda zmiana wspólnej bazy
+wiedzy (index_document dla dokumentu bez user_id - sync ISAP, reindeksacja,
+import) podbija wersję "knowledge_base" w read_model_versions w tej samej
+transakcji co chunki.
+
+Proces sprawdza tę wersję najwyżej co SHARED_STATE_CHECK_INTERVAL sekund,
+w wątku w tle, i przeładowuje stan tylko po jej zmianie. Ścieżka żądania
+nie czeka na bazę - do końca odświeżania korzysta z poprzedniego stanu.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Any, Optional
+
+import psycopg2
+
+logger = logging.getLogger(__name__)
+
+KNOWLEDGE_BASE_VERSION = "knowledge_base"
+SHARED_STATE_CHECK_INTERVAL = float(os.getenv("SHARED_STATE_CHECK_INTERVAL", "30"))
+
+
+def bump_knowledge_base_version(cur) -> None:
+    """Sygnał dla wszystkich procesów API: zmieniły się chunki wspólnej bazy wiedzy."""
+    cur.execute(
+        """
+        INSERT INTO read_model_versions (name, version, updated_at)
+        VALUES (%s, 1, NOW())
+        ON CONFLICT (name) DO UPDATE
+        SET version = read_model_versions.version + 1,
+            updated_at = NOW()
+        """,
+        (KNOWLEDGE_BASE_VERSION,),
+    )
+
+
+def knowledge_base_version(cur) -> int:
+    cur.execute("SELECT version FROM read_model_versions WHERE name = %s", (KNOWLEDGE_BASE_VERSION,))
+    row = cur.fetchone()
+    if not row:
+        return 0
+    return row["version"] if isinstance(row, dict) else row[0]
+
+
+class SharedState:
+    """Baza dla stanu z bazy wiedzy: ładowanie w warm(), odświeżanie w tle po zmianie wersji."""
+
+    name = "shared state"
+
+    def __init__(self, db_url: str, check_interval: float = SHARED_STATE_CHECK_INTERVAL):
+        self.db_url = db_url
+        self.check_interval = check_interval
+        self._version: Optional[int] = None  # wersja bazy wiedzy wczytanego stanu
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()  # jedno ładowanie naraz
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    def size(self) -> int:
+        raise NotImplementedError
+
+    def _load(self, conn) -> Any:
+        raise NotImplementedError
+
+    def _apply(self, data: Any) -> None:
+        raise NotImplementedError
+
+    def _mark_fresh(self):
+        self._checked_at = time.monotonic()
+
+    def invalidate(self):
+        """Wymusza ponowne ładowanie (warm() albo najbliższe żądanie w tle)."""
+        self._version = None
+        self._checked_at = None
+
+    def warm(self) -> int:
+        """Ładuje stan od razu, jeśli proces go jeszcze nie ma (preload, rozgrzewka workera)."""
+        with self._lock:
+            if self._version is None:
+                self._refresh()
+        return self.size()
+
+    def _refresh(self):
+        """Przeładowuje stan, jeśli wersja bazy wiedzy różni się od wczytanej."""
+        self._checked_at = time.monotonic()
+        try:
+            conn = psycopg2.connect(self.db_url)
+            try:
+                # Wersja czytana przed danymi - zmiana w trakcie ładowania wywoła kolejne
+                with conn.cursor() as cur:
+                    version = knowledge_base_version(cur)
+                if version == self._version:
+                    return
+                data = self._load(conn)
+            finally:
+                conn.close()
+            self._apply(data)
+            self._version = version
+            logger.info(f"{self.name} loaded (knowledge base version {version}, size {self.size()})")
+        except Exception as e:
+            logger.warning(f"{self.name} unavailable, keeping previous state: {e}")
+
+    def _refresh_if_due(self):
+        """Ścieżka żądania: sprawdzenie wersji w wątku w tle, bez czekania na wynik."""
+        checked_at = self._checked_at
+        if checked_at is not None and time.monotonic() - checked_at < self.check_interval:
+            return
+        if not self._lock.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                self._refresh()
+            finally:
+                self._lock.release()
+
+        try:
+            self._refresh_thread = threading.Thread(target=run, name=f"{self.name}-refresh", daemon=True)
+            self._refresh_thread.start()
+        except Exception:
+            self._lock.release()
+            raise
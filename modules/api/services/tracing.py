@@ -0,0 +1,289 @@
+"""
+Tracing - śledzenie żądań w stylu OpenTelemetry
+===============================================
+Lekki tracer bez zależności od SDK OpenTelemetry:
+- span bieżący w contextvars (działa w async i w wątkach threadpoola),
+- propagacja W3C `traceparent` (nagłówek żądania -> odpowiedź),
+- eksport w tle do pliku JSONL (TRACE_EXPORT_FILE) i/lub do kolektora
+  OTLP/HTTP w formacie JSON (TRACE_OTLP_ENDPOINT, np.
+  http://otel-collector:4318/v1/traces),
+- filtr logowania dodający `trace_id` do każdego rekordu.
+
+Bez skonfigurowanego eksportera spany nadal istnieją (trace_id w logach
+i nagłówkach), ale nie są nigdzie wysyłane.
+"""
+import json
+import logging
+import os
+import queue
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+TRACE_EXPORT_FILE = os.getenv("TRACE_EXPORT_FILE", "")
+TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT", "")
+TRACE_SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "bielik-api")
+TRACE_QUEUE_SIZE = int(os.getenv("TRACE_QUEUE_SIZE", "10000"))
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    kind: str = "internal"  # internal | server | client
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        return (self.end_ns - self.start_ns) / 1e6 if self.end_ns else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+            "service": TRACE_SERVICE_NAME,
+        }
+
+    def to_otlp(self) -> Dict[str, Any]:
+        otlp = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": {"internal": 1, "server": 2, "client": 3}[self.kind],
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": 2 if self.status == "error" else 1},
+        }
+        if self.parent_id:
+            otlp["parentSpanId"] = self.parent_id
+        return otlp
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_trace_id() -> Optional[str]:
+    span = _current_span.get()
+    return span.trace_id if span else None
+
+
+def set_attribute(key: str, value: Any):
+    """Atrybut bieżącego spanu (no-op poza śledzonym kontekstem)."""
+    span = _current_span.get()
+    if span is not None:
+        span.set_attribute(key, value)
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str]]:
+    """(trace_id, parent_span_id) z nagłówka W3C traceparent."""
+    match = _TRACEPARENT.match((header or "").strip().lower())
+    if not match or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+        return None
+    return match.group(1), match.group(2)
+
+
+def format_traceparent(span: Span) -> str:
+    return f"00-{span.trace_id}-{span.span_id}-01"
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", parent: Optional[Tuple[str, str]] = None,
+         **attributes: Any) -> Iterator[Span]:
+    """Span potomny bieżącego (albo nowy trace); wyjątek oznacza span jako błąd."""
+    current = _current_span.get()
+    if parent is not None:
+        trace_id, parent_id = parent
+    elif current is not None:
+        trace_id, parent_id = current.trace_id, current.span_id
+    else:
+        trace_id, parent_id = secrets.token_hex(16), None
+
+    new = Span(name=name, trace_id=trace_id, span_id=secrets.token_hex(8), parent_id=parent_id,
+               kind=kind, attributes=dict(attributes))
+    token = _current_span.set(new)
+    try:
+        yield new
+    except BaseException as e:
+        new.status = "error"
+        new.attributes["error.type"] = type(e).__name__
+        new.attributes["error.message"] = str(e)[:500]
+        raise
+    finally:
+        new.end_ns = time.time_ns()
+        _current_span.reset(token)
+        exporter.export(new)
+
+
+# ═══════════════════════════════════════════════════════════════
+# EKSPORT
+# ═══════════════════════════════════════════════════════════════
+
+class SpanExporter:
+    """Kolejka spanów opróżniana partiami przez wątek w tle (plik JSONL / OTLP)."""
+
+    def __init__(self, path: str = TRACE_EXPORT_FILE, otlp_endpoint: str = TRACE_OTLP_ENDPOINT,
+                 max_queue: int = TRACE_QUEUE_SIZE, batch_size: int = 256):
+        self.path = path
+        self.otlp_endpoint = otlp_endpoint
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[Span]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path or self.otlp_endpoint)
+
+    def export(self, span: Span):
+        if not self.enabled:
+            return
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                    self._thread.start()
+
+    def reset_after_fork(self):
+        """W procesie potomnym wątek eksportu rodzica nie istnieje - świeża kolejka i blokada."""
+        self._queue = queue.Queue(maxsize=self._queue.maxsize)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _drain(self, timeout: float) -> List[Span]:
+        batch: List[Span] = []
+        try:
+            batch.append(self._queue.get(timeout=timeout))
+            while len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._drain(timeout=1.0)
+            if batch:
+                self.flush(batch)
+
+    def flush(self, batch: List[Span]):
+        if self.path:
+            try:
+                with open(self.path, "a", encoding="utf-8") as fh:
+                    for item in batch:
+                        fh.write(json.dumps(item.to_dict(), ensure_ascii=False, default=str) + "\n")
+            except Exception as e:
+                logger.warning(f"Trace file export failed: {e}")
+        if self.otlp_endpoint:
+            payload = {
+                "resourceSpans": [{
+                    "resource": {"attributes": [_otlp_attribute("service.name", TRACE_SERVICE_NAME)]},
+                    "scopeSpans": [{"scope": {"name": "bielik.tracing"}, "spans": [s.to_otlp() for s in batch]}],
+                }]
+            }
+            try:
+                requests.post(self.otlp_endpoint, json=payload, timeout=5)
+            except Exception as e:
+                logger.warning(f"OTLP export failed: {e}")
+
+
+exporter = SpanExporter()
+# Workery gunicorna (preload_app) powstają przez fork procesu master
+os.register_at_fork(after_in_child=exporter.reset_after_fork)
+
+
+# ═══════════════════════════════════════════════════════════════
+# INTEGRACJA: LOGI I HTTP
+# ═══════════════════════════════════════════════════════════════
+
+class TraceContextFilter(logging.Filter):
+    """Dodaje `trace_id` (albo '-') do rekordów logów."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.trace_id = current_trace_id() or "-"
+        return True
+
+
+class TracingMiddleware:
+    """Middleware ASGI: span serwera dla żądania, `traceparent` i `X-Trace-Id` w odpowiedzi."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        parent = parse_traceparent(headers.get(b"traceparent", b"").decode("latin-1"))
+
+        with span(f"{scope['method']} {scope['path']}", kind="server", parent=parent,
+                  **{"http.method": scope["method"], "http.target": scope["path"]}) as root:
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    root.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        root.status = "error"
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [
+                        (b"traceparent", format_traceparent(root).encode()),
+                        (b"x-trace-id", root.trace_id.encode()),
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    root.name = f"{scope['method']} {route.path}"
+                    root.set_attribute("http.route", route.path)
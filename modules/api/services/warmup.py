@@ -0,0 +1,248 @@
+"""
+Warmup - jawne rozgrzewanie procesu API
+=======================================
+Import aplikacji nie łączy się z niczym (serwisy RAG i rejestrów powstają
+przy pierwszym użyciu), więc cała praca startowa jest tutaj:
+
+- `preload()` - w procesie master gunicorna, przed fork: migracje, indeks
+  cytowań przepisów i centroidy klasyfikatora modułów. Workery dostają te
+  struktury jako strony współdzielone copy-on-write. Master nie może
+  trzymać połączeń ani wątków, które odziedziczą dzieci - pula DB jest
+  zamykana na końcu, a workery pomijają migracje w lifespan,
+- `warm()` - w każdym workerze (lifespan, w tle): połączenia puli DB,
+  stan j.w. (jeśli nie przyszedł z preloadu) i załadowanie modeli do
+  Ollama, żeby pierwsze pytanie nie płaciło za wczytanie modelu,
+- `model_warmer` - modele ładowane z `keep_alive` (OLLAMA_KEEP_ALIVE);
+  monitor zdrowia porównuje je z /api/ps, ponawia ładowanie modelu
+  zwolnionego przez Ollama i co WARMUP_REFRESH_INTERVAL odświeża
+  keep_alive. Readiness czeka na stan "warm".
+
+Ręcznie (np. po restarcie Ollama): `python -m services.warmup`.
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import requests
+
+from services.rag import OLLAMA_KEEP_ALIVE, OLLAMA_MODEL, OLLAMA_URL
+
+logger = logging.getLogger(__name__)
+
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
+# Ładowanie modelu na CPU trwa do kilkudziesięciu sekund
+WARMUP_MODEL_TIMEOUT = float(os.getenv("WARMUP_MODEL_TIMEOUT", "300"))
+# Co ile ponowić keep_alive rozgrzanego modelu (krócej niż OLLAMA_KEEP_ALIVE)
+WARMUP_REFRESH_INTERVAL = float(os.getenv("WARMUP_REFRESH_INTERVAL", "300"))
+# Odstęp między próbami załadowania modelu, który się nie załadował
+WARMUP_RETRY_INTERVAL = float(os.getenv("WARMUP_RETRY_INTERVAL", "30"))
+
+
+# ═══════════════════════════════════════════════════════════════
+# MODELE OLLAMA
+# ═══════════════════════════════════════════════════════════════
+
+def model_key(name: str) -> str:
+    """Nazwa modelu jak w /api/ps (bez tagu Ollama przyjmuje :latest)."""
+    return name if ":" in name.rsplit("/", 1)[-1] else f"{name}:latest"
+
+
+class ModelWarmer:
+    """Modele w pamięci Ollama: ładowanie z keep_alive i śledzenie rezydencji.
+
+    Stan modelu: cold -> warming -> warm. `observe()` z listą z /api/ps cofa
+    model do cold, gdy Ollama go zwolniła (restart, wygaśnięcie keep_alive,
+    wyparcie przez inny model); `due()` mówi, kiedy ponowić ładowanie.
+    """
+
+    def __init__(self, url: str = OLLAMA_URL, generate_models: Iterable[str] = (OLLAMA_MODEL,),
+                 embedding_models: Iterable[str] = (OLLAMA_MODEL,), keep_alive: str = OLLAMA_KEEP_ALIVE,
+                 refresh_interval: float = WARMUP_REFRESH_INTERVAL, retry_interval: float = WARMUP_RETRY_INTERVAL,
+                 timeout: float = WARMUP_MODEL_TIMEOUT):
+        self.url = url
+        self.keep_alive = keep_alive
+        self.refresh_interval = refresh_interval
+        self.retry_interval = retry_interval
+        self.timeout = timeout
+        # model -> endpointy, którymi jest używany (generacja i/lub embeddingi)
+        self.endpoints: Dict[str, List[str]] = {}
+        for model in generate_models:
+            self.endpoints.setdefault(model, []).append("generate")
+        for model in embedding_models:
+            self.endpoints.setdefault(model, []).append("embeddings")
+        self.models: Dict[str, Dict[str, Any]] = {
+            model: {"state": "cold", "warmed_at": None, "attempted_at": None, "load_ms": None,
+                    "expires_at": None, "error": None}
+            for model in self.endpoints
+        }
+        self._lock = threading.Lock()
+
+    def _load(self, model: str, endpoint: str) -> float:
+        """Jedno minimalne wywołanie modelu; zwraca czas ładowania (ms) wg Ollama."""
+        payload = {"model": model, "keep_alive": self.keep_alive}
+        if endpoint == "generate":
+            # Pusty prompt tylko ładuje model - bez generacji tokenów
+            payload.update(prompt="", stream=False)
+        else:
+            payload.update(prompt="rozgrzewka")
+        response = requests.post(f"{self.url}/api/{endpoint}", json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return (response.json().get("load_duration") or 0) / 1e6
+
+    def warm(self) -> Dict[str, Any]:
+        """Ładuje wszystkie modele; gdy rozgrzewanie już trwa w innym wątku - tylko stan."""
+        if not self._lock.acquire(blocking=False):
+            return self.status()
+        try:
+            for model, endpoints in self.endpoints.items():
+                entry = self.models[model]
+                if entry["state"] != "warm":
+                    entry["state"] = "warming"
+                entry["attempted_at"] = time.time()
+                try:
+                    load_ms = sum(self._load(model, endpoint) for endpoint in endpoints)
+                except Exception as e:
+                    logger.warning(f"Model {model} warmup failed: {e}")
+                    entry.update(state="cold", error=str(e))
+                    continue
+                if entry["state"] != "warm":
+                    logger.info(f"Model {model} warm (load {load_ms:.0f} ms, keep_alive={self.keep_alive})")
+                entry.update(state="warm", warmed_at=time.time(), load_ms=round(load_ms, 1), error=None)
+        finally:
+            self._lock.release()
+        return self.status()
+
+    def observe(self, running: Optional[List[Dict[str, Any]]], checked_at: float):
+        """Wynik /api/ps z chwili `checked_at`; None - Ollama nie podała listy."""
+        if running is None:
+            return
+        resident = {model_key(m.get("name") or ""): m for m in running}
+        for model, entry in self.models.items():
+            info = resident.get(model_key(model))
+            if info is not None:
+                entry["expires_at"] = info.get("expires_at")
+            elif entry["state"] == "warm" and (entry["warmed_at"] or 0) < checked_at:
+                logger.warning(f"Model {model} no longer resident in Ollama, will reload")
+                entry.update(state="cold", expires_at=None, attempted_at=None)
+
+    def due(self, now: Optional[float] = None) -> bool:
+        """Czy trzeba załadować model albo odświeżyć keep_alive."""
+        now = time.time() if now is None else now
+        for entry in self.models.values():
+            if entry["state"] == "warming":
+                continue
+            if entry["state"] == "cold":
+                if entry["attempted_at"] is None or now - entry["attempted_at"] >= self.retry_interval:
+                    return True
+            elif now - (entry["warmed_at"] or 0) >= self.refresh_interval:
+                return True
+        return False
+
+    @property
+    def state(self) -> str:
+        states = {entry["state"] for entry in self.models.values()}
+        for state in ("cold", "warming"):
+            if state in states:
+                return state
+        return "warm"
+
+    def status(self) -> Dict[str, Any]:
+        return {"state": self.state, "keep_alive": self.keep_alive,
+                "models": {model: dict(entry) for model, entry in self.models.items()}}
+
+
+model_warmer = ModelWarmer()
+
+
+def warm_models() -> Dict[str, Any]:
+    status = model_warmer.warm()
+    if status["state"] != "warm":
+        errors = {m: e["error"] or e["state"] for m, e in status["models"].items() if e["state"] != "warm"}
+        raise RuntimeError(f"Models not warm: {errors}")
+    return {model: entry["load_ms"] for model, entry in status["models"].items()}
+
+
+# ═══════════════════════════════════════════════════════════════
+# ROZGRZEWANIE PROCESU
+# ═══════════════════════════════════════════════════════════════
+
+def _timed(report: Dict[str, Any], name: str, step: Callable[[], Any]):
+    started = time.perf_counter()
+    try:
+        result = step()
+    except Exception as e:
+        logger.warning(f"Warmup step {name} failed: {e}")
+        report[name] = {"ok": False, "error": str(e)}
+        return
+    report[name] = {"ok": True, "result": result, "ms": round((time.perf_counter() - started) * 1000, 1)}
+
+
+def warm_database() -> int:
+    """Otwiera połączenie z puli (i DB_POOL_MIN połączeń bazowych)."""
+    from services.db import db_pool
+
+    with db_pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+    return db_pool.stats()["idle"]
+
+
+def warm() -> Dict[str, Any]:
+    """Rozgrzewa proces workera; błędy kroków są raportowane, nie rzucane."""
+    from services.citations import citation_index
+    from services.query_router import query_router
+
+    report: Dict[str, Any] = {}
+    _timed(report, "database", warm_database)
+    _timed(report, "citation_index", citation_index.warm)
+    _timed(report, "query_router", query_router.warm)
+    _timed(report, "models", warm_models)
+    logger.info(f"Warmup: {report}")
+    return report
+
+
+def preload(migrate: bool = True) -> Dict[str, Any]:
+    """Ładuje współdzielony stan w procesie master.
+
+    Błąd migracji przerywa start (wyjątek); błędy ładowania indeksów nie -
+    workery wczytają je same.
+    """
+    from services import migrations
+    from services.citations import citation_index
+    from services.db import db_pool
+    from services.query_router import query_router
+
+    report: Dict[str, Any] = {}
+    if migrate and migrations.MIGRATE_ON_STARTUP:
+        report["migrations"] = migrations.migrate()
+        # Jedna próba na całą instancję - workery nie powtarzają jej w lifespan
+        migrations.MIGRATE_ON_STARTUP = False
+
+    for name, target in (("citation_index", citation_index), ("query_router", query_router)):
+        started = time.perf_counter()
+        try:
+            size = target.warm()
+        except Exception as e:
+            logger.warning(f"Preload of {name} failed, workers will load it lazily: {e}")
+            target.invalidate()
+            report[name] = None
+            continue
+        if not size:
+            # Pusty wynik (np. baza niedostępna) - niech workery spróbują same
+            target.invalidate()
+        report[name] = {"size": size, "ms": round((time.perf_counter() - started) * 1000, 1)}
+
+    db_pool.close()
+    logger.info(f"Preloaded shared state: {report}")
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    result = warm()
+    print(json.dumps(result, ensure_ascii=False, indent=2, default=str))
+    sys.exit(0 if all(step["ok"] for step in result.values()) else 1)
@@ -0,0 +1,85 @@
+"""
+Bielik MVP - Worker zadań w tle
+Wykonuje zadania z tabeli jobs (services/jobs.py) poza procesami API, żeby
+indeksowanie, synchronizacja ISAP i Nextcloud oraz weryfikacja masowa nie
+konkurowały z czatem. Synchronizacja Nextcloud (NEXTCLOUD_SYNC_ENABLED)
+jest zadaniem okresowym co NEXTCLOUD_SYNC_INTERVAL sekund.
+
+Uruchom: python worker.py [--concurrency N] [--kinds isap.sync,nextcloud.sync]
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+
+from services import jobs, migrations, nextcloud
+from services.jobs import Worker
+from services.tracing import TraceContextFilter
+
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "1"))
+
+logger = logging.getLogger("worker")
+
+
+def _configure_logging():
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(processName)s - %(name)s - %(levelname)s - [%(trace_id)s] %(message)s'
+    )
+    for handler in logging.getLogger().handlers:
+        handler.addFilter(TraceContextFilter())
+
+
+def _register_periodic_jobs():
+    if nextcloud.NEXTCLOUD_SYNC_ENABLED:
+        jobs.every("nextcloud.sync", nextcloud.NEXTCLOUD_SYNC_INTERVAL)
+
+
+def run_worker(kinds=None):
+    """Jedna pętla workera; SIGTERM/SIGINT kończy ją po bieżącym zadaniu."""
+    _configure_logging()
+    _register_periodic_jobs()
+    worker = Worker(kinds=kinds)
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: worker.stop())
+    worker.run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bielik - worker zadań w tle")
+    parser.add_argument("--concurrency", type=int, default=JOB_WORKER_CONCURRENCY,
+                        help="liczba procesów workera")
+    parser.add_argument("--kinds", default=os.getenv("JOB_WORKER_KINDS", ""),
+                        help="obsługiwane rodzaje zadań, po przecinku (domyślnie wszystkie)")
+    args = parser.parse_args()
+    kinds = [k.strip() for k in args.kinds.split(",") if k.strip()] or None
+
+    _configure_logging()
+    if migrations.MIGRATE_ON_STARTUP:
+        migrations.migrate()
+
+    if args.concurrency <= 1:
+        run_worker(kinds)
+        return
+
+    processes = [
+        multiprocessing.Process(target=run_worker, args=(kinds,), name=f"worker-{i + 1}")
+        for i in range(args.concurrency)
+    ]
+    for process in processes:
+        process.start()
+
+    def forward(signum, _frame):
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signum)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -193,8 +193,17 @@ export class ContextPanel extends Component {
 
   private async loadHierarchy(): Promise<void> {
     try {
-      const data = await api.get<{ contacts: Contact[] }>('/context/hierarchy');
-      this.contacts = data.contacts;
+      const contacts: Contact[] = [];
+      let cursor: string | null = null;
+      do {
+        const query: string = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+        const data: { contacts: Contact[]; next_cursor?: string | null } = await api.get(
+          `/context/hierarchy${query}`
+        );
+        contacts.push(...data.contacts);
+        cursor = data.next_cursor ?? null;
+      } while (cursor);
+      this.contacts = contacts;
       this.updateUI();
     } catch (e) {
       console.error('Error loading context hierarchy:', e);
@@ -140,9 +140,16 @@ async function sendMessage(message: string): Promise<void> {
   const loadingId = addMessage('', 'assistant', true);
 
   try {
+    // Token SSO - pozwala API dołączyć prywatny kontekst użytkownika (e-Doręczenia)
+    const headers: Record<string, string> = { 'Content-Type': 'application/json' };
+    const token = localStorage.getItem('detax_token');
+    if (token) {
+      headers.Authorization = `Bearer ${token}`;
+    }
+
     const response = await fetch(`${API_URL}/chat`, {
       method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
+      headers,
       body: JSON.stringify({
         message,
         module: currentModule,
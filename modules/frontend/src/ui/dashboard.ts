@@ -17,6 +17,11 @@ interface LayoutModuleConfig {
   order: number;
 }
 
+function authHeaders(): Record<string, string> {
+  const token = localStorage.getItem('detax_token');
+  return token ? { Authorization: `Bearer ${token}` } : {};
+}
+
 export async function initDashboardLayout(): Promise<void> {
   // Tymczasowo pusta implementacja - logika w modules/frontend/js/app.js
   // Docelowo przeniesiemy tu funkcje initDashboardLayout, initDragAndDrop, saveCurrentLayout, itd.
@@ -28,7 +33,8 @@ export async function initDashboardLayout(): Promise<void> {
   });
 
   try {
-    const response = await fetch(`${API_URL}/layout`);
+    // Układ per użytkownik (token SSO); ETag + no-cache - przeglądarka rewaliduje (304)
+    const response = await fetch(`${API_URL}/layout`, { headers: authHeaders() });
     if (response.ok) {
       const data = (await response.json()) as { modules?: LayoutModuleConfig[] };
       if (data && Array.isArray(data.modules)) {
@@ -172,7 +178,7 @@ function saveCurrentLayout(): void {
 
   fetch(`${API_URL}/layout`, {
     method: 'POST',
-    headers: { 'Content-Type': 'application/json' },
+    headers: { 'Content-Type': 'application/json', ...authHeaders() },
     body: JSON.stringify(config),
   }).catch((err) => {
     console.error('Nie udało się zapisać układu dashboardu:', err);
@@ -5,7 +5,8 @@ interface DocumentDto {
   title: string;
   source?: string | null;
   category: string;
-  content: string;
+  content?: string;
+  summary?: string | null;
 }
 
 interface DomainEventDto {
@@ -51,7 +52,8 @@ async function loadDocuments(): Promise<void> {
   const els = getElements();
   if (!els.documentsList) return;
   try {
-    const resp = await fetch(`${API_URL.replace('/api/v1', '')}/api/v1/documents?limit=50`);
+    // Widok listy bez treści (summary); pełny dokument pobierany po wybraniu
+    const resp = await fetch(`${API_URL}/documents?limit=50&summary=true&sort=updated_at&order=desc`);
     if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
     const docs = (await resp.json()) as DocumentDto[];
     renderDocumentsList(docs || []);
@@ -70,6 +72,7 @@ function renderDocumentsList(docs: DocumentDto[]): void {
     li.className = 'document-item';
     li.dataset.id = String(doc.id);
     li.textContent = `${doc.title} (${doc.category})`;
+    if (doc.summary) li.title = doc.summary;
     li.addEventListener('click', () => {
       selectDocument(doc, li);
     });
@@ -87,9 +90,22 @@ function selectDocument(doc: DocumentDto, element: HTMLLIElement | null): void {
   if (els.docCategory) els.docCategory.value = doc.category || '';
   if (els.docContent) els.docContent.value = doc.content || '';
 
+  if (doc.content === undefined) void loadDocumentContent(doc.id);
   void loadDocumentEvents(doc.id);
 }
 
+async function loadDocumentContent(documentId: number): Promise<void> {
+  try {
+    const resp = await fetch(`${API_URL}/documents/${documentId}`);
+    if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
+    const doc = (await resp.json()) as DocumentDto;
+    const els = getElements();
+    if (currentDocumentId === documentId && els.docContent) els.docContent.value = doc.content || '';
+  } catch (err) {
+    console.error('Nie udało się pobrać treści dokumentu:', err);
+  }
+}
+
 function clearDocumentEditor(): void {
   document.querySelectorAll<HTMLLIElement>('.document-item').forEach((li) => li.classList.remove('active'));
   const els = getElements();
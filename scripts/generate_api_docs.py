@@ -8,6 +8,7 @@ Uruchomienie:
 """
 
 import json
+import subprocess
 import sys
 import time
 from pathlib import Path
@@ -15,14 +16,12 @@ from typing import Dict, List
 
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
+API_DIR = REPO_ROOT / "modules" / "api"
 
-# Upewnij się, że katalog główny repo jest na sys.path,
-# aby import "modules.api.main" działał niezależnie od miejsca uruchomienia.
-if str(REPO_ROOT) not in sys.path:
-    sys.path.insert(0, str(REPO_ROOT))
-
-from modules.api.main import app
-
+# Aplikacja importuje moduły jako `routers.*` / `services.*` (jak w kontenerze),
+# więc na sys.path musi być katalog modules/api.
+if str(API_DIR) not in sys.path:
+    sys.path.insert(0, str(API_DIR))
 
 DOCS_DIR = REPO_ROOT / "docs"
 WATCH_DIRS = [REPO_ROOT / "modules" / "api"]
@@ -30,6 +29,9 @@ WATCH_DIRS = [REPO_ROOT / "modules" / "api"]
 
 def generate() -> None:
     """Wygeneruj plik docs/openapi.json na podstawie schematu FastAPI."""
+    # Import dopiero tutaj: `--watch` sam aplikacji nie ładuje
+    from main import app
+
     DOCS_DIR.mkdir(exist_ok=True)
     schema = app.openapi()
     out_path = DOCS_DIR / "openapi.json"
@@ -64,17 +66,22 @@ def watch(interval: float = 2.0) -> None:
 
     print("[docs] Tryb watch: obserwuję zmiany w modules/api/**/*.py")
     previous = _snapshot()
-    generate()
+    _generate_fresh()
 
     while True:
         time.sleep(interval)
         current = _snapshot()
         if current != previous:
             print("[docs] Wykryto zmiany w modules/api, regeneruję dokumentację API...")
-            generate()
+            _generate_fresh()
             previous = current
 
 
+def _generate_fresh() -> None:
+    """Generacja w nowym procesie - zmieniony kod nie jest brany z cache importów."""
+    subprocess.run([sys.executable, str(Path(__file__).resolve())], check=False)
+
+
 def main(argv: List[str]) -> None:
     if "--watch" in argv:
         watch()
@@ -0,0 +1,16 @@
+"""
+Unit Tests Configuration
+========================
+Testy jednostkowe nie wymagają działającego API, bazy ani Ollamy -
+importują moduły z modules/api bezpośrednio (oraz benchmarks/ z katalogu
+głównego repozytorium).
+"""
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+API_DIR = REPO_ROOT / "modules" / "api"
+
+for _path in (REPO_ROOT, API_DIR):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
@@ -0,0 +1,80 @@
+"""
+Testy narzędzi benchmarku: percentyle, porównanie z baseline, korpus
+i fake Ollama (bez bazy danych).
+"""
+import requests
+
+from benchmarks.corpus import ACTS, generate_corpus, sample_queries
+from benchmarks.fake_ollama import FakeOllama, FakeOllamaConfig, format_vector, hash_embedding
+from benchmarks.run import compare, percentile, profile_key, summarize
+
+
+def _cosine(a, b):
+    return sum(x * y for x, y in zip(a, b))
+
+
+def test_percentile_interpolates_like_numpy():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50.5
+    assert percentile(values, 95) == 95.05
+    assert percentile([7.0], 99) == 7.0
+    assert percentile([], 50) == 0.0
+
+
+def test_compare_flags_only_significant_regressions():
+    baseline = {"scenarios": {
+        "search_similar": {**summarize([10.0] * 20, 0, 1.0)},
+        "api_chat": {**summarize([500.0] * 20, 0, 1.0)},
+    }}
+    current = {"scenarios": {
+        # +50% ale tylko o 5 ms ponad min_delta - regresja
+        "search_similar": summarize([15.0] * 20, 0, 1.0),
+        # +1% - szum
+        "api_chat": summarize([505.0] * 20, 0, 1.0),
+        # brak w baseline - pomijany
+        "text_search": summarize([100.0] * 20, 0, 1.0),
+    }}
+    regressions = compare(current, baseline, tolerance=0.15, min_delta_ms=2.0)
+    assert regressions == [
+        "search_similar: p50_ms 10.0 -> 15.0 ms (+50%)",
+        "search_similar: p95_ms 10.0 -> 15.0 ms (+50%)",
+    ]
+    assert compare(current, baseline, tolerance=0.15, min_delta_ms=10.0) == []
+
+
+def test_profile_key_separates_load_parameters():
+    meta = {"chunks": 1000, "concurrency": 8, "embed_latency_ms": 20.0, "generate_latency_ms": 500.0,
+            "tokens_per_second": 50.0}
+    assert profile_key(meta) != profile_key({**meta, "chunks": 100000})
+
+
+def test_corpus_is_deterministic_and_sized():
+    documents = list(generate_corpus(1234, seed=1))
+    assert sum(len(d["chunks"]) for d in documents) == 1234
+    assert {d["category"] for d in documents} == set(ACTS)
+    assert documents == list(generate_corpus(1234, seed=1))
+    chunk = documents[0]["chunks"][0]
+    assert chunk["content"].startswith(f"Art. {chunk['metadata']['article']} ust. ")
+    assert sample_queries(5, seed=3) == sample_queries(5, seed=3)
+
+
+def test_hash_embedding_keeps_topical_similarity():
+    vat = hash_embedding("faktura podatek naliczony odliczenie stawka")
+    vat_query = hash_embedding("Jak rozliczyć podatek naliczony przy fakturze?")
+    zus = hash_embedding("składka emerytalna płatnik składek podstawa wymiaru")
+    assert len(vat) == 4096 and abs(_cosine(vat, vat) - 1) < 1e-9
+    assert _cosine(vat, vat_query) > _cosine(zus, vat_query)
+    assert format_vector([0.0, 0.5, 0.0]) == "[0,0.50000,0]"
+
+
+def test_fake_ollama_serves_embeddings_and_generation():
+    config = FakeOllamaConfig(dim=16, embed_latency_ms=0, generate_latency_ms=0)
+    with FakeOllama(config) as ollama:
+        embedding = requests.post(f"{ollama.url}/api/embeddings",
+                                  json={"model": config.model, "prompt": "faktura VAT"}, timeout=5).json()
+        assert embedding["embedding"] == hash_embedding("faktura VAT", 16)
+        generated = requests.post(f"{ollama.url}/api/generate",
+                                  json={"model": config.model, "prompt": "Pytanie", "stream": False}, timeout=5).json()
+        assert generated["done"] and generated["response"] == config.response
+        tags = requests.get(f"{ollama.url}/api/tags", timeout=5).json()
+        assert tags["models"][0]["name"] == f"{config.model}:latest"
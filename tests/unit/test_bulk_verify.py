@@ -0,0 +1,122 @@
+"""
+Testy weryfikacji masowej: deduplikacja, strumień NDJSON, circuit breaker.
+"""
+import json
+
+import pytest
+import requests
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import sources
+from services.data_sources import DataSourcesService, RegistryUnavailable, _registry_json, data_sources_service
+from services.throttling import CircuitBreaker, CircuitOpen, TokenBucket
+
+app = FastAPI()
+app.include_router(sources.router, prefix="/api/v1")
+client = TestClient(app)
+
+
+def _fake_verify(kind, identifier):
+    if identifier.endswith("0"):
+        return {"identifier": identifier, "type": kind, "valid": False, "status": "error", "error": "Rejestr niedostępny"}
+    return {"identifier": identifier, "type": kind, "valid": True, "status": "valid", "data": {}}
+
+
+def test_bulk_deduplicates_and_streams_ndjson(monkeypatch):
+    calls = []
+
+    def verify(kind, identifier):
+        calls.append((kind, identifier))
+        return _fake_verify(kind, identifier)
+
+    monkeypatch.setattr(data_sources_service, "verify_identifier", verify)
+    response = client.post("/api/v1/verify/bulk", json={"items": [
+        {"identifier": "526-000-12-46"},
+        {"identifier": "5260001246"},
+        {"identifier": "pl5260001240"},
+        {"identifier": "12345", "type": "krs"},
+    ]})
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(calls) == [("krs", "0000012345"), ("nip", "5260001246"), ("vat_eu", "PL5260001240")]
+    assert lines[-1]["summary"] == {"total": 4, "unique": 3, "valid": 2, "invalid": 0, "error": 1}
+    nip = next(line for line in lines[:-1] if line["type"] == "nip")
+    assert nip["occurrences"] == 2
+
+
+def test_bulk_upload_csv(monkeypatch):
+    monkeypatch.setattr(data_sources_service, "verify_identifier", _fake_verify)
+    csv_body = "identifier,type\n5260001246,nip\n0000012345,krs\n"
+    response = client.post(
+        "/api/v1/verify/bulk/upload",
+        files={"file": ("kontrahenci.csv", csv_body, "text/csv")},
+    )
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[-1]["summary"]["unique"] == 2
+
+
+def test_circuit_breaker_opens_and_probes():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=0)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    breaker.before_call()  # half-open: jedno zapytanie próbne
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    try:
+        breaker.before_call()
+        assert False, "drugie zapytanie w half-open powinno być odrzucone"
+    except CircuitOpen:
+        pass
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_parse_errors_settle_half_open_probe_without_spending_tokens():
+    service = DataSourcesService()
+    breaker = service.breakers["ceidg"] = CircuitBreaker("ceidg", failure_threshold=1, reset_timeout=0)
+    bucket = service.limiters["ceidg"] = TokenBucket(rate=1, burst=1)
+
+    def broken(nip):
+        raise KeyError("dataWpisu")
+
+    with pytest.raises(KeyError):
+        service._call_registry("ceidg", broken, "1111111111")
+    assert breaker.state == CircuitBreaker.OPEN
+    bucket.tokens = 1
+    with pytest.raises(KeyError):  # próba half-open też się rozstrzyga
+        service._call_registry("ceidg", broken, "1111111111")
+    assert breaker.state == CircuitBreaker.OPEN and not breaker._probe_in_flight
+
+    breaker.reset_timeout = 60
+    bucket.tokens = 1
+    with pytest.raises(RegistryUnavailable):
+        service._call_registry("ceidg", broken, "1111111111")
+    assert bucket.tokens >= 1  # odrzucone przez breaker - bez zużycia tokenu
+
+
+def test_html_maintenance_page_is_registry_unavailable():
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = b"<html>Przerwa techniczna</html>"
+    with pytest.raises(RegistryUnavailable):
+        _registry_json(resp, "ceidg")
+
+
+def test_token_bucket_times_out_when_empty():
+    bucket = TokenBucket(rate=1, burst=1)
+    assert bucket.acquire(timeout=0)
+    assert not bucket.acquire(timeout=0)
+
+
+def test_registry_failure_is_reported_as_error(monkeypatch):
+    def unavailable(nip):
+        raise RegistryUnavailable("HTTP 503")
+
+    monkeypatch.setattr(data_sources_service.ceidg, "fetch_nip", unavailable)
+    monkeypatch.setattr(data_sources_service.ceidg_cache, "use_db", False)
+    result = data_sources_service.verify_identifier("nip", "1111111111")
+    assert result["status"] == "error"
+    assert "HTTP 503" in result["error"]
@@ -0,0 +1,101 @@
+"""
+Testy chaosu: API wobec awarii Ollama (benchmarks/fake_ollama.py).
+"""
+import json
+
+import requests
+
+from benchmarks.fake_ollama import FakeOllama, FakeOllamaConfig, hash_embedding
+from services import health as health_service
+from services.rag import RAGService
+from services.warmup import ModelWarmer
+
+CONFIG = dict(dim=16, embed_latency_ms=0, generate_latency_ms=0, tokens_per_second=0)
+
+
+def _rag(ollama, model, embed_timeout=5.0, generate_timeout=5.0):
+    rag = RAGService()
+    rag.ollama_url = ollama.url
+    rag.model = model
+    rag.embed_timeout = embed_timeout
+    rag.generate_timeout = generate_timeout
+    return rag
+
+
+def test_fake_ollama_streams_tokens_at_configured_rate():
+    config = FakeOllamaConfig(**{**CONFIG, "tokens_per_second": 1000, "max_tokens": 5})
+    with FakeOllama(config) as ollama:
+        response = requests.post(f"{ollama.url}/api/generate",
+                                 json={"model": config.model, "prompt": "Pytanie"}, stream=True, timeout=5)
+        chunks = [json.loads(line) for line in response.iter_lines() if line]
+        missing = requests.post(f"{ollama.url}/api/embeddings", json={"model": "inny", "prompt": "x"}, timeout=5)
+
+    assert [c["done"] for c in chunks] == [False] * 5 + [True]
+    assert "".join(c["response"] for c in chunks) == "Zgodnie z przepisami przytoczonymi w"
+    assert chunks[-1]["eval_count"] == 5 and chunks[-1]["done_reason"] == "length"
+    assert missing.status_code == 404
+
+
+def test_fault_injection_is_deterministic_and_controllable():
+    def outcomes(seed):
+        with FakeOllama(FakeOllamaConfig(**CONFIG, seed=seed)) as ollama:
+            ollama.set_faults(error_rate=0.5)
+            return [requests.post(f"{ollama.url}/api/embeddings", json={"model": "mwiewior/bielik", "prompt": "a"},
+                                  timeout=5).status_code for _ in range(20)]
+
+    first = outcomes(1)
+    assert first == outcomes(1) and set(first) == {200, 500}
+
+    with FakeOllama(FakeOllamaConfig(**CONFIG)) as ollama:
+        control = requests.post(f"{ollama.url}/_fake/faults", json={"fail_next": 1, "mode": "error"}, timeout=5)
+        assert control.json()["faults"]["fail_next"] == 1
+        assert requests.post(f"{ollama.url}/_fake/faults", json={"mode": "boom"}, timeout=5).status_code == 400
+        urls = [f"{ollama.url}/api/embeddings"] * 2
+        codes = [requests.post(u, json={"model": "mwiewior/bielik", "prompt": "a"}, timeout=5).status_code for u in urls]
+        stats = requests.get(f"{ollama.url}/_fake/stats", timeout=5).json()["stats"]
+    assert codes == [500, 200] and stats["fault.error"] == 1
+
+
+def test_search_falls_back_to_text_search_when_embeddings_fail(monkeypatch):
+    with FakeOllama(FakeOllamaConfig(**CONFIG)) as ollama:
+        rag = _rag(ollama, ollama.state.config.model)
+        assert rag.get_embedding("faktura VAT") == hash_embedding("faktura VAT", 16)
+
+        text_search = []
+        monkeypatch.setattr(rag, "_text_search", lambda *args: text_search.append(args) or [{"id": 1}])
+        for mode in ("error", "disconnect"):
+            ollama.set_faults(fail_next=1, mode=mode)
+            assert rag.search_similar("faktura VAT", category="vat") == [{"id": 1}]
+        ollama.set_faults(fail_next=1, mode="timeout", hang_seconds=2)
+        rag.embed_timeout = 0.2
+        assert rag.search_similar("faktura VAT") == [{"id": 1}]
+    assert len(text_search) == 3
+
+
+def test_generation_failures_return_message_instead_of_raising():
+    with FakeOllama(FakeOllamaConfig(**CONFIG)) as ollama:
+        rag = _rag(ollama, ollama.state.config.model, generate_timeout=0.2)
+        assert rag.generate_response("Pytanie", []) == ollama.state.config.response
+
+        ollama.set_faults(fail_next=1, mode="timeout", hang_seconds=2)
+        assert "trwa zbyt długo" in rag.generate_response("Pytanie", [])
+        for mode in ("error", "disconnect"):
+            ollama.set_faults(fail_next=1, mode=mode)
+            assert rag.generate_response("Pytanie", []).startswith("Przepraszam, wystąpił błąd")
+
+
+def test_model_warmer_recovers_after_outage(monkeypatch):
+    with FakeOllama(FakeOllamaConfig(**CONFIG)) as ollama:
+        model = ollama.state.config.model
+        monkeypatch.setattr(health_service, "OLLAMA_URL", ollama.url)
+        warmer = ModelWarmer(url=ollama.url, generate_models=[model], embedding_models=[model],
+                             retry_interval=0, timeout=5)
+
+        ollama.set_faults(error_rate=1.0)
+        assert warmer.warm()["state"] == "cold"
+        ollama.clear_faults()
+        assert warmer.warm()["state"] == "warm"
+
+        status = health_service.check_ollama()
+        warmer.observe(status["running"], checked_at=0)
+        assert status["bielik_loaded"] and warmer.state == "warm"
@@ -0,0 +1,50 @@
+"""
+Testy parsera cytatów i bezpośredniego wyszukiwania przepisów.
+"""
+from services import rag
+from services.citations import Citation, CitationIndex, normalize_number, parse_citations
+
+
+def test_parse_citations_with_act_aliases():
+    assert parse_citations("Co mówi art. 22 kp?") == [Citation("kodeks_pracy", "22")]
+    assert parse_citations("art. 22 § 1^1 Kodeksu pracy") == [Citation("kodeks_pracy", "22", "1¹")]
+    assert parse_citations("art. 106na ust. 1 ustawy o VAT") == [Citation("ustawa_vat", "106na", "1")]
+    assert parse_citations("Art. 14 ordynacji podatkowej, art. 10 ustawy o PIP") == [
+        Citation("ordynacja_podatkowa", "14"),
+        Citation("ustawa_pip", "10"),
+    ]
+
+
+def test_citation_without_act_is_ignored():
+    assert parse_citations("art. 5 opisuje zasady") == []
+    assert parse_citations("Jakie są składki ZUS w 2025?") == []
+    assert normalize_number("22(1)") == "22¹"
+
+
+def test_index_lookup_falls_back_to_whole_article():
+    index = CitationIndex(check_interval=3600)
+    index.build([
+        {"chunk_id": 1, "act": "kodeks_pracy", "article": "22", "paragraph": "1"},
+        {"chunk_id": 2, "act": "kodeks_pracy", "article": "22", "paragraph": "1¹"},
+        {"chunk_id": 3, "act": None, "article": "106na", "paragraph": None, "source": "Ustawa o VAT", "title": ""},
+    ])
+    assert index.lookup(Citation("kodeks_pracy", "22", "1¹")) == [2]
+    assert index.lookup(Citation("kodeks_pracy", "22", "9")) == [1, 2]
+    assert index.resolve("art. 106na ustawy o VAT oraz art. 22 kp") == [3, 1, 2]
+
+
+def test_chat_skips_embedding_on_citation_hit(monkeypatch):
+    service = rag.RAGService()
+    hit = [{"chunk_id": 2, "content": "Art. 22 § 1¹. ...", "metadata": {"path": "art. 22 § 1¹"},
+            "title": "Kodeks pracy", "source": "Dz.U. 2025 poz. 277", "category": "b2b", "similarity": 1.0}]
+
+    def no_embedding(*args, **kwargs):
+        raise AssertionError("embedding nie powinien być liczony")
+
+    monkeypatch.setattr(service, "citation_context", lambda query: hit)
+    monkeypatch.setattr(service, "get_embedding", no_embedding)
+    monkeypatch.setattr(service, "search_similar", no_embedding)
+    monkeypatch.setattr(service, "generate_response", lambda query, context, module: "odpowiedź")
+
+    result = service.chat("Co mówi art. 22 § 1^1 kp?", module="b2b")
+    assert result["sources"][0]["citation"] == "art. 22 § 1¹"
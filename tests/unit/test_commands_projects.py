@@ -0,0 +1,66 @@
+"""
+Testy komend projektów: zapis, event i projekcja w jednej transakcji.
+"""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import commands_projects
+
+
+class FakeCursor:
+    def __init__(self, log):
+        self.log = log
+        self.rowcount = 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=()):
+        self.log.append(("sql", sql.split()[0]))
+
+    def fetchone(self):
+        return {"id": 7, "name": "Audyt", "description": None, "contact": "ACME"}
+
+
+class FakeConnection:
+    def __init__(self, log):
+        self.log = log
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self.log)
+
+    def commit(self):
+        self.log.append(("commit",))
+
+    def close(self):
+        self.log.append(("close",))
+
+
+def _client(monkeypatch, append_events):
+    log = []
+    monkeypatch.setattr(commands_projects.psycopg2, "connect", lambda *a, **k: FakeConnection(log))
+    monkeypatch.setattr(commands_projects, "append_events", lambda cur, events: append_events(log, cur, events))
+    app = FastAPI()
+    app.include_router(commands_projects.router)
+    return TestClient(app), log
+
+
+def test_event_is_written_before_the_single_commit(monkeypatch):
+    def record(log, cur, events):
+        log.append(("events", [e["event_type"] for e in events]))
+
+    client, log = _client(monkeypatch, record)
+    assert client.post("/commands/projects/create", json={"name": "Audyt"}).status_code == 200
+    assert log == [("sql", "INSERT"), ("events", ["ProjectCreated"]), ("commit",), ("close",)]
+
+
+def test_failed_projection_does_not_commit_the_write(monkeypatch):
+    def fail(log, cur, events):
+        raise RuntimeError("context_tree niedostępne")
+
+    client, log = _client(monkeypatch, fail)
+    assert client.post("/commands/projects/update", json={"id": 7, "name": "Audyt"}).status_code == 500
+    assert ("commit",) not in log and log[-1] == ("close",)
@@ -0,0 +1,216 @@
+"""
+Testy importu zbiorczego: parsowanie strumienia, COPY do stagingu,
+pomijanie duplikatów po hashu treści, wsadowe eventy.
+"""
+import asyncio
+import csv
+import io
+import json
+import tempfile
+import zipfile
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import imports
+from services import document_import
+from services.document_import import DocumentImporter, iter_lines, parse_record
+from services.events import content_hash
+
+
+class FakeDatabase:
+    """Staging i documents w pamięci; rozpoznaje zapytania importu po treści SQL."""
+
+    def __init__(self, existing=()):
+        self.existing = {content_hash(c) for c in existing}
+        self.staging = []
+        self.events = []
+        self.jobs = []
+        self.statements = []
+        self.committed = False
+        self.next_id = 100
+
+    def connect(self, *args, **kwargs):
+        return FakeConnection(self)
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def copy_expert(self, sql, fileobj):
+        for row in csv.reader(io.StringIO(fileobj.read())):
+            self.db.staging.append(dict(zip(document_import.STAGING_COLUMNS, row)))
+
+    def execute(self, sql, params=()):
+        self.db.statements.append(sql)
+        if "INSERT INTO documents" in sql:
+            seen, self.result = set(self.db.existing), []
+            for row in sorted(self.db.staging, key=lambda r: int(r["position"])):
+                if row["content_sha256"] in seen:
+                    continue
+                seen.add(row["content_sha256"])
+                self.db.next_id += 1
+                self.result.append({"id": self.db.next_id, "title": row["title"], "source": row["source"] or None,
+                                    "category": row["category"], "content_sha256": row["content_sha256"],
+                                    "content_length": len(row["content"])})
+
+    def fetchall(self):
+        return self.result
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+        self.autocommit = False
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self.db)
+
+    def commit(self):
+        self.db.committed = True
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _fake_db(monkeypatch, existing=()):
+    db = FakeDatabase(existing)
+    monkeypatch.setattr(document_import.psycopg2, "connect", db.connect)
+    monkeypatch.setattr(document_import, "append_events", lambda cur, events, metadata=None: db.events.extend(events))
+    monkeypatch.setattr(document_import, "enqueue", lambda kind, payload, conn=None: db.jobs.append((kind, payload)) or 7)
+    return db
+
+
+async def _chunks(*parts):
+    for part in parts:
+        yield part
+
+
+async def _collect(stream):
+    return [item async for item in stream]
+
+
+def test_iter_lines_joins_lines_split_across_chunks():
+    lines = asyncio.run(_collect(iter_lines(_chunks(b'{"a":', b' 1}\n{"b"', b': 2}\n', b'{"c": 3}'))))
+    assert lines == [(1, b'{"a": 1}'), (2, b'{"b": 2}'), (3, b'{"c": 3}')]
+
+
+def test_parse_record_validation():
+    assert parse_record({"title": "T", "content": "x"}, "vat")["category"] == "vat"
+    for bad in ([], {"content": "x"}, {"title": "T", "content": " "}, {"title": "T", "content": "x", "metadata": []}):
+        try:
+            parse_record(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {bad}")
+
+
+def test_ndjson_import_skips_duplicates_and_bad_lines(monkeypatch):
+    db = _fake_db(monkeypatch, existing=["już w bazie"])
+    monkeypatch.setattr(document_import, "IMPORT_BATCH_ROWS", 2)
+    lines = [
+        {"title": "A", "content": "treść A", "category": "vat"},
+        {"title": "B", "content": "już w bazie"},
+        "nie-json",
+        {"title": "A2", "content": "treść A"},
+        {"title": "C", "content": "treść C", "metadata": {"k": "v"}},
+    ]
+    body = "\n".join(l if isinstance(l, str) else json.dumps(l, ensure_ascii=False) for l in lines).encode()
+
+    importer = DocumentImporter("ndjson", category="b2b")
+    importer.start()
+    asyncio.run(importer.load_ndjson(_chunks(body[:30], body[30:])))
+    summary = importer.finish()
+
+    assert summary["received"] == 4
+    assert summary["inserted"] == 2
+    assert summary["duplicates"] == 2
+    assert summary["skipped"] == 1
+    assert summary["errors"][0]["position"] == 3
+    assert [e["payload"]["title"] for e in db.events] == ["A", "C"]
+    assert db.events[0]["event_type"] == "DocumentCreated"
+    assert {r["category"] for r in db.staging} == {"vat", "b2b"}
+    assert db.committed
+    assert summary["status"] == "indexing"
+    assert summary["job_id"] == 7
+    assert db.jobs == [("ingestion.index_import", {"import_id": importer.id})]
+
+
+def test_zip_import_extracts_files(monkeypatch):
+    db = _fake_db(monkeypatch)
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("umowy/umowa.txt", "Umowa o dzieło")
+        zf.writestr("strona.html", "<p>Regulamin</p><script>x()</script>")
+        zf.writestr("obraz.png", b"\x89PNG")
+        zf.writestr("__MACOSX/._umowa.txt", b"")
+    archive.seek(0)
+
+    importer = DocumentImporter("zip", category="b2b")
+    importer.start()
+    importer.load_zip(archive)
+    summary = importer.finish()
+
+    assert [(r["title"], r["source"], r["content"]) for r in db.staging] == [
+        ("umowa", "umowy/umowa.txt", "Umowa o dzieło"),
+        ("strona", "strona.html", "Regulamin"),
+    ]
+    assert summary["inserted"] == 2
+    assert summary["skipped"] == 1  # obraz.png - brak tekstu
+
+
+def test_endpoint_detects_format_and_enqueues_indexing(monkeypatch):
+    db = _fake_db(monkeypatch)
+    app = FastAPI()
+    app.include_router(imports.router)
+    client = TestClient(app)
+
+    response = client.post("/documents/import", content=b'{"title": "A", "content": "x"}\n',
+                           headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 202
+    assert response.json()["inserted"] == 1
+    assert response.json()["job_id"] == 7
+    assert db.jobs == [("ingestion.index_import", {"import_id": response.json()["id"]})]
+
+    assert client.post("/documents/import", content=b"abc", headers={"Content-Type": "text/plain"}).status_code == 415
+    bad_zip = client.post("/documents/import", content=b"not a zip", headers={"Content-Type": "application/zip"})
+    assert bad_zip.status_code == 400
+
+
+def test_zip_upload_is_written_outside_the_event_loop(monkeypatch):
+    db = _fake_db(monkeypatch)
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("umowa.txt", "Umowa o dzieło " * 1000)
+    writes = []
+
+    class RecordingSpool(tempfile.SpooledTemporaryFile):
+        def write(self, data):
+            try:
+                asyncio.get_running_loop()
+                writes.append("event-loop")
+            except RuntimeError:
+                writes.append("thread")
+            return super().write(data)
+
+    monkeypatch.setattr(imports.tempfile, "SpooledTemporaryFile", RecordingSpool)
+    monkeypatch.setattr(imports, "SPOOL_MAX_BYTES", 1024)
+    monkeypatch.setattr(imports, "SPOOL_WRITE_BYTES", 512)
+    app = FastAPI()
+    app.include_router(imports.router)
+
+    response = TestClient(app).post("/documents/import", content=archive.getvalue(),
+                                    headers={"Content-Type": "application/zip"})
+    assert response.status_code == 202 and db.staging
+    assert writes and set(writes) == {"thread"}
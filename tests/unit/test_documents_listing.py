@@ -0,0 +1,111 @@
+"""
+Testy listy dokumentów: projekcja pól, kursor keyset, szacunek liczności.
+"""
+from datetime import datetime
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import documents
+from services.pagination import decode_cursor, encode_cursor, parse_fields
+
+ROWS = [
+    {"id": i, "title": f"Ustawa {i}", "source": None, "category": "vat", "summary": f"Art. {i}",
+     "content": "x" * 10_000, "updated_at": datetime(2026, 1, i)}
+    for i in range(1, 4)
+]
+
+
+class FakeCursor:
+    def __init__(self, queries):
+        self.queries = queries
+        self.result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=()):
+        self.queries.append((sql, params))
+        if sql.startswith("EXPLAIN"):
+            self.result = [{"QUERY PLAN": [{"Plan": {"Plan Rows": 1234}}]}]
+        else:
+            columns = sql.split("SELECT ", 1)[1].split(" FROM", 1)[0].split(", ")
+            self.result = [{c: r[c] for c in columns} for r in ROWS][: params[-1]]
+
+    def fetchall(self):
+        return self.result
+
+    def fetchone(self):
+        return self.result[0]
+
+
+class FakeConnection:
+    def __init__(self, queries):
+        self.queries = queries
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self.queries)
+
+    def close(self):
+        pass
+
+
+def _client(monkeypatch):
+    queries = []
+    monkeypatch.setattr(documents.psycopg2, "connect", lambda *a, **k: FakeConnection(queries))
+    app = FastAPI()
+    app.include_router(documents.router)
+    return TestClient(app), queries
+
+
+def test_summary_view_skips_content_and_pages_with_cursor(monkeypatch):
+    client, queries = _client(monkeypatch)
+
+    first = client.get("/documents", params={"limit": 2, "summary": "true", "sort": "updated_at", "order": "desc"})
+    assert first.status_code == 200
+    body = first.json()
+    assert len(body) == 2
+    assert set(body[0]) == {"id", "title", "source", "category", "summary", "updated_at"}
+    assert "content" not in queries[0][0]
+    assert "ORDER BY updated_at DESC, id DESC" in queries[0][0]
+    assert first.headers["X-Total-Count-Estimate"] == "1234"
+    assert not any("COUNT(" in sql for sql, _ in queries)
+
+    position = decode_cursor(first.headers["X-Next-Cursor"])
+    assert position == {"sort": "updated_at", "order": "desc", "id": 2, "updated_at": "2026-01-02T00:00:00"}
+
+    queries.clear()
+    second = client.get("/documents", params={"limit": 2, "summary": "true", "sort": "updated_at", "order": "desc",
+                                              "cursor": first.headers["X-Next-Cursor"]})
+    assert second.status_code == 200
+    sql, params = queries[0]
+    assert "(updated_at, id) < (%s::timestamp, %s)" in sql
+    assert params == ("2026-01-02T00:00:00", 2, 3)
+    assert "X-Total-Count-Estimate" not in second.headers  # szacunek tylko na pierwszej stronie
+
+
+def test_fields_projection_and_validation(monkeypatch):
+    client, _ = _client(monkeypatch)
+
+    response = client.get("/documents", params={"fields": "title,category"})
+    assert [set(item) for item in response.json()] == [{"id", "title", "category"}] * 3
+    assert "X-Next-Cursor" not in response.headers
+
+    assert client.get("/documents", params={"fields": "title,embedding"}).status_code == 400
+    foreign = encode_cursor(sort="id", order="asc", id=2)
+    assert client.get("/documents", params={"sort": "updated_at", "cursor": foreign}).status_code == 400
+    assert client.get("/documents", params={"cursor": "%%%"}).status_code == 400
+
+
+def test_default_listing_keeps_full_rows(monkeypatch):
+    client, _ = _client(monkeypatch)
+    item = client.get("/documents").json()[0]
+    assert set(item) == {"id", "title", "source", "category", "content"}
+
+
+def test_parse_fields_keeps_canonical_order():
+    assert parse_fields("category, title", ("id", "title", "category"), ("id",)) == ["title", "category"]
+    assert parse_fields(None, ("id", "title"), ("id",)) == ["id"]
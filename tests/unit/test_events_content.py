@@ -0,0 +1,121 @@
+"""
+Testy adresowanej hashem treści w payloadach eventów dokumentów.
+"""
+from datetime import date
+
+import pytest
+
+from services import events
+from services.events import _ensure_partition, content_hash, content_payload, restore_previous_content
+
+
+class TestContentPayload:
+    """Payload DocumentCreated / DocumentUpdated bez pełnego tekstu."""
+
+    def test_created_payload_has_no_content(self):
+        payload = content_payload("Art. 1.\nTreść przepisu.\n")
+        assert "content" not in payload
+        assert payload["content_sha256"] == content_hash("Art. 1.\nTreść przepisu.\n")
+        assert payload["content_length"] == len("Art. 1.\nTreść przepisu.\n")
+        assert "content_diff" not in payload
+
+    def test_updated_payload_restores_previous_version(self):
+        previous = "Linia 1\nLinia 2\nLinia 3\n"
+        current = "Linia 1\nLinia 2 (zmieniona)\nLinia 3\nLinia 4\n"
+        payload = content_payload(current, previous=previous)
+
+        assert payload["previous_sha256"] == content_hash(previous)
+        assert restore_previous_content(current, payload["content_diff"]) == previous
+
+    def test_unchanged_content_has_empty_diff(self):
+        payload = content_payload("bez zmian", previous="bez zmian")
+        assert payload["content_diff"] == []
+
+
+class _Cursor:
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.statements = []
+
+    def execute(self, sql, params=None):
+        self.statements.append(sql)
+        if self.fail_on and self.fail_on in sql:
+            raise RuntimeError("permission denied for table domain_events")
+
+    def fetchone(self):
+        return (date.today(),)
+
+
+class TestEnsurePartition:
+    """Miesiąc partycji liczony przez bazę, błąd nie przerywa zapisu eventu."""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_process(self, monkeypatch):
+        monkeypatch.setattr(events, "_ensured_months", set())
+
+    def test_partition_month_comes_from_database_clock(self):
+        cur = _Cursor()
+        _ensure_partition(cur)
+        assert "CURRENT_DATE" in cur.statements[1]
+        assert cur.statements[-1] == "RELEASE SAVEPOINT ensure_partition"
+
+    def test_ensured_month_costs_no_round_trips(self):
+        cur = _Cursor()
+        _ensure_partition(cur)
+        _ensure_partition(cur)
+        _ensure_partition(cur)
+        assert len(cur.statements) == 3
+
+    def test_failure_rolls_back_to_savepoint(self):
+        cur = _Cursor(fail_on="ensure_domain_events_partition")
+        _ensure_partition(cur)
+        _ensure_partition(cur)  # nieudane - ponawiane przy kolejnym evencie
+        assert cur.statements[-1] == "ROLLBACK TO SAVEPOINT ensure_partition"
+        assert cur.statements.count("SAVEPOINT ensure_partition") == 2
+
+
+class _RetentionConnection:
+    def __init__(self):
+        self.statements = []
+
+    def cursor(self, **kwargs):
+        conn = self
+
+        class Cursor:
+            rowcount = 3
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, sql, params=None):
+                conn.statements.append((" ".join(sql.split()), params))
+
+            def fetchall(self):
+                return [{"partition": events.DEFAULT_PARTITION}]
+
+            def fetchone(self):
+                return (True,)
+
+        return Cursor()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_retention_deletes_old_rows_from_default_partition(monkeypatch):
+    conn = _RetentionConnection()
+    monkeypatch.setattr(events.psycopg2, "connect", lambda url: conn)
+
+    handled = events.apply_retention(retention_months=6, archive_dir="")
+    delete = next((sql, params) for sql, params in conn.statements if sql.startswith("DELETE"))
+    assert delete[0] == f"DELETE FROM {events.DEFAULT_PARTITION} WHERE created_at < %s"
+    assert handled == [{"partition": events.DEFAULT_PARTITION, "archive": None, "deleted": 3}]
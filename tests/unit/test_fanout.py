@@ -0,0 +1,75 @@
+"""
+Testy równoległego fan-outu źródeł kontekstu.
+"""
+import asyncio
+import time
+
+from routers import context
+from services.fanout import FanoutResult, gather_with_deadline
+
+
+def _slow(value, delay, spans=None):
+    started = time.perf_counter()
+    time.sleep(delay)
+    if spans is not None:
+        spans.append((started, time.perf_counter()))
+    return value
+
+
+async def _async_value():
+    return "async"
+
+
+def _failing():
+    raise RuntimeError("źródło niedostępne")
+
+
+class TestGatherWithDeadline:
+    """gather_with_deadline: równoległość, wyniki częściowe, czasy per źródło."""
+
+    def test_sources_run_concurrently(self):
+        spans = []
+        result = asyncio.run(gather_with_deadline({
+            "a": lambda: _slow("a", 0.2, spans),
+            "b": lambda: _slow("b", 0.2, spans),
+            "c": _async_value,
+        }, timeout=2))
+
+        assert result.results == {"a": "a", "b": "b", "c": "async"}
+        # Każde źródło startuje, zanim którekolwiek skończy
+        assert max(started for started, _ in spans) < min(finished for _, finished in spans)
+        assert set(result.timings_ms) == {"a", "b", "c"}
+        assert result.partial is False
+
+    def test_timeout_returns_partial_results(self):
+        result = asyncio.run(gather_with_deadline({
+            "fast": lambda: _slow("ok", 0.01),
+            "slow": lambda: _slow("late", 0.5),
+        }, timeout=0.1))
+
+        assert result.results == {"fast": "ok"}
+        assert result.timed_out == ["slow"]
+        assert result.partial is True
+
+    def test_errors_are_reported_per_source(self):
+        result = asyncio.run(gather_with_deadline({"ok": lambda: 1, "bad": _failing}, timeout=1))
+
+        assert result.results == {"ok": 1}
+        assert "bad" in result.errors
+        assert result.to_dict()["partial"] is True
+
+
+def test_nested_folders_fanout_gets_remaining_deadline(monkeypatch):
+    timeouts = []
+
+    async def capture(sources, timeout):
+        timeouts.append(timeout)
+        return FanoutResult()
+
+    monkeypatch.setattr(context, "_read_folder_index", lambda files_per_folder: _slow({}, 0.1))
+    monkeypatch.setattr(context, "gather_with_deadline", capture)
+    deadline = time.perf_counter() + 1
+    asyncio.run(context._get_nextcloud_folders(["INBOX"], 5, deadline))
+
+    # Czas odczytu indeksu jest odejmowany od terminu wywołującego
+    assert timeouts and timeouts[0] <= 0.9
@@ -0,0 +1,135 @@
+"""
+Testy sond zdrowia: wynik z pamięci, liveness vs readiness.
+"""
+import asyncio
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import health
+from services import health as health_service
+from services import warmup
+from services.health import HealthMonitor
+from services.warmup import ModelWarmer
+
+
+def _client(monkeypatch, monitor):
+    monkeypatch.setattr(health, "health_monitor", monitor)
+    app = FastAPI()
+    app.include_router(health.router)
+    return TestClient(app)
+
+
+def test_probes_serve_cached_results_without_io(monkeypatch):
+    monitor = HealthMonitor()
+    monkeypatch.setattr(health_service, "check_database", lambda: {"status": "healthy", "layout": "default"})
+    monkeypatch.setattr(health_service, "check_ollama", lambda: {"status": "healthy", "bielik_loaded": False})
+    asyncio.run(monitor.run_once())
+
+    def boom():
+        raise AssertionError("sonda nie może wykonywać I/O")
+
+    monkeypatch.setattr(health_service, "check_database", boom)
+    monkeypatch.setattr(health_service, "check_ollama", boom)
+    client = _client(monkeypatch, monitor)
+
+    body = client.get("/health").json()
+    assert body["status"] == "degraded" and body["services"]["model"] == "not_loaded"
+    assert body["checked_at"] is not None
+    assert client.get("/health/ready").status_code == 200
+    assert client.get("/health/db").json()["layout"] == "default"
+
+
+def test_readiness_fails_until_dependencies_are_healthy(monkeypatch):
+    monitor = HealthMonitor()
+    client = _client(monkeypatch, monitor)
+    assert client.get("/health/live").json()["status"] == "alive"
+    response = client.get("/health/ready")
+    assert response.status_code == 503 and "no_check_yet" in response.json()["reasons"]
+    assert client.get("/health").json()["status"] == "starting"
+
+    def down():
+        raise ConnectionError("connection refused")
+
+    monkeypatch.setattr(health_service, "check_database", down)
+    monkeypatch.setattr(health_service, "check_ollama", lambda: {"status": "healthy", "bielik_loaded": True})
+    asyncio.run(monitor.run_once())
+    response = client.get("/health/ready")
+    assert response.status_code == 503 and response.json()["reasons"] == ["database_unhealthy"]
+    assert client.get("/health").json()["status"] == "unhealthy"
+
+
+class _FakeOllama:
+    """requests.post do /api/generate i /api/embeddings."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    def __call__(self, url, json=None, timeout=None):
+        self.calls.append((url.rsplit("/", 1)[-1], json))
+        if self.fail:
+            raise ConnectionError("ollama down")
+
+        class Response:
+            def raise_for_status(self):
+                pass
+
+            def json(self):
+                return {"load_duration": 2_500_000_000}
+
+        return Response()
+
+
+def test_model_warmer_loads_with_keep_alive_and_tracks_residency(monkeypatch):
+    fake = _FakeOllama()
+    monkeypatch.setattr(warmup.requests, "post", fake)
+    warmer = ModelWarmer(url="http://ollama", generate_models=["bielik"], embedding_models=["bielik"],
+                         keep_alive="30m", refresh_interval=300)
+    assert warmer.state == "cold" and warmer.due()
+
+    status = warmer.warm()
+
+    assert status["state"] == "warm"
+    assert status["models"]["bielik"]["load_ms"] == 5000.0
+    assert [endpoint for endpoint, _ in fake.calls] == ["generate", "embeddings"]
+    assert all(payload["keep_alive"] == "30m" for _, payload in fake.calls)
+    assert fake.calls[0][1]["prompt"] == ""
+    assert not warmer.due()
+
+    # /api/ps z nazwą z tagiem - model nadal w pamięci
+    warmer.observe([{"name": "bielik:latest", "expires_at": "2026-10-19T12:30:00Z"}], checked_at=time.time())
+    assert warmer.state == "warm"
+    assert warmer.models["bielik"]["expires_at"] == "2026-10-19T12:30:00Z"
+    # Ollama zwolniła model (restart) - cold i ponowne ładowanie
+    warmer.observe([], checked_at=time.time())
+    assert warmer.state == "cold" and warmer.due()
+    # odświeżenie keep_alive po refresh_interval
+    warmer.warm()
+    assert warmer.due(now=time.time() + 301)
+
+
+def test_readiness_waits_for_warm_model(monkeypatch):
+    fake = _FakeOllama(fail=True)
+    monkeypatch.setattr(warmup.requests, "post", fake)
+    warmer = ModelWarmer(url="http://ollama", generate_models=["bielik"], embedding_models=[],
+                         refresh_interval=3600, retry_interval=3600)
+    monitor = HealthMonitor(warmer=warmer)
+    ollama = {"status": "healthy", "bielik_loaded": True, "running": []}
+    monkeypatch.setattr(health_service, "check_database", lambda: {"status": "healthy", "layout": "default"})
+    monkeypatch.setattr(health_service, "check_ollama", lambda: dict(ollama))
+    client = _client(monkeypatch, monitor)
+
+    asyncio.run(monitor.run_once())
+    response = client.get("/health/ready")
+    assert response.status_code == 503 and response.json()["reasons"] == ["model_cold"]
+    assert client.get("/health").json()["status"] == "degraded"
+
+    fake.fail = False
+    warmer.warm()
+    ollama["running"] = [{"name": "bielik:latest", "expires_at": None}]
+    asyncio.run(monitor.run_once())
+    assert client.get("/health/ready").status_code == 200
+    assert client.get("/health").json()["services"]["model_residency"] == "warm"
+    assert client.get("/health/ollama").json()["residency"]["models"]["bielik"]["state"] == "warm"
@@ -0,0 +1,70 @@
+"""
+Testy walidacji offline NIP / REGON / KRS / VAT UE.
+"""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import sources
+from services.data_sources import (
+    data_sources_service,
+    validate_identifiers,
+    validate_krs,
+    validate_nip,
+    validate_regon,
+    validate_vat_eu,
+)
+
+
+def test_nip_checksum_and_normalization():
+    assert validate_nip("526-025-02-74").identifier == "5260250274"
+    assert validate_nip("PL 526 025 02 74").valid
+    assert validate_nip("5260250275").error == "checksum"
+    assert validate_nip("52602502").error == "format"
+    assert validate_nip("").error == "empty"
+
+
+def test_regon_9_and_14_digits():
+    assert validate_regon("123456785").valid
+    assert validate_regon("12345678512347").valid
+    assert validate_regon("123456786").error == "checksum"
+    assert validate_regon("1234567851234").error == "format"
+
+
+def test_krs_format():
+    assert validate_krs("12345").identifier == "0000012345"
+    assert validate_krs("0").error == "format"
+    assert validate_krs("12A45").error == "format"
+
+
+def test_vat_eu_country_rules():
+    assert validate_vat_eu("de123456789").valid
+    assert validate_vat_eu("ATU12345678").valid
+    assert validate_vat_eu("NL123456789B01").valid
+    assert validate_vat_eu("PL5260250275").error == "checksum"
+    assert validate_vat_eu("FR1234").error == "format"
+    assert validate_vat_eu("XX123").error == "country"
+
+
+def test_bulk_validation_reuses_results_for_duplicates():
+    results = validate_identifiers([("5260250274", "nip"), ("5260250274", "nip"), ("123", "krs"), ("1", "pesel")])
+    assert [r.valid for r in results] == [True, True, True, False]
+    assert results[0] is results[1]
+    assert results[3].error == "type"
+
+
+def test_verify_rejects_malformed_identifier_without_network(monkeypatch):
+    def network(*args, **kwargs):
+        raise AssertionError("rejestr nie powinien być odpytany")
+
+    monkeypatch.setattr(data_sources_service, "verify_vat_eu", network)
+    app = FastAPI()
+    app.include_router(sources.router, prefix="/api/v1")
+    client = TestClient(app)
+
+    response = client.get("/api/v1/verify/vat/PL5260250275")
+    assert response.status_code == 422
+    assert response.json()["detail"]["error"] == "checksum"
+
+    response = client.post("/api/v1/verify", json={"identifier": "123", "type": "nip"})
+    assert response.status_code == 422
+    assert response.json()["detail"]["error"] == "format"
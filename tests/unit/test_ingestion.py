@@ -0,0 +1,63 @@
+"""
+Testy ekstrakcji tekstu i chunkingu (services/ingestion.py).
+"""
+import contextlib
+import io
+
+from services.ingestion import chunk_text, extract_text, index_document
+
+EML = b"""From: urzad@us.gov.pl
+To: firma@example.pl
+Subject: Wezwanie do uzupelnienia JPK
+Date: Mon, 05 Jan 2026 10:15:00 +0100
+Content-Type: text/html; charset=utf-8
+
+<html><body><p>Prosimy o korekte JPK_VAT.</p><script>x()</script><p>Termin: 14 dni.</p></body></html>
+"""
+
+
+def test_extract_text_from_email_strips_html():
+    text = extract_text(io.BytesIO(EML), "wezwanie.eml")
+    assert "Subject: Wezwanie do uzupelnienia JPK" in text
+    assert "Prosimy o korekte JPK_VAT." in text
+    assert "Termin: 14 dni." in text
+    assert "x()" not in text
+
+
+def test_extract_text_unknown_type_is_empty():
+    assert extract_text(io.BytesIO(b"\x00\x01"), "archiwum.bin") == ""
+
+
+def test_chunk_text_keeps_paragraphs_and_bounds_size():
+    paragraphs = [f"Akapit {i} " + "x" * 300 for i in range(10)]
+    long_paragraph = "y" * 2500
+    chunks = chunk_text("\n\n".join(paragraphs + [long_paragraph]), size=1000, overlap=100)
+
+    assert all(len(c) <= 1000 for c in chunks)
+    assert chunks[0].startswith("Akapit 0")
+    assert "Akapit 2" in chunks[0] and "Akapit 3" not in chunks[0]
+    # długi akapit pocięty na okna z zakładką
+    assert sum(c.count("y") for c in chunks) > 2500
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.sql = []
+
+    @contextlib.contextmanager
+    def cursor(self):
+        conn = self
+
+        class Cursor:
+            def execute(self, sql, params=None):
+                conn.sql.append(" ".join(sql.split()))
+
+        yield Cursor()
+
+
+def test_index_document_bumps_knowledge_base_version_for_shared_documents():
+    shared, private = RecordingConnection(), RecordingConnection()
+    index_document(shared, 1, "Krótka notatka o składkach.", embed=False)
+    index_document(private, 2, "Krótka notatka o składkach.", user_id="u1", embed=False)
+    assert "read_model_versions" in shared.sql[-1]
+    assert not any("read_model_versions" in sql for sql in private.sql)
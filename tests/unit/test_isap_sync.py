@@ -0,0 +1,83 @@
+"""
+Testy klienta ELI używanego do synchronizacji aktów z ISAP.
+"""
+from services import isap_sync
+from services.isap_sync import ELIClient, eli_source, isap_to_eli
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, content=b"", headers=None, json_data=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.encoding = "utf-8"
+        self._json = json_data
+
+    def json(self):
+        return self._json
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+def test_isap_id_to_eli():
+    assert isap_to_eli("WDU20040540535") == "DU/2004/535"
+    assert isap_to_eli("WDU19740240141") == "DU/1974/141"
+    assert eli_source("DU/2024/361") == "Dz.U. 2024 poz. 361"
+
+
+def test_latest_consolidated_text_is_selected(monkeypatch):
+    meta = {"references": {"Inf. o tekście jednolitym": [
+        {"id": "DU/2023/1570", "date": "2023-08-03"},
+        {"id": "DU/2024/361", "date": "2024-03-19"},
+    ]}}
+    monkeypatch.setattr(isap_sync.requests, "get", lambda url, **kw: FakeResponse(json_data=meta))
+    assert ELIClient(base_url="http://eli").latest_text_eli("DU/2004/535")[0] == "DU/2024/361"
+
+
+def test_conditional_get_skips_unchanged_text(monkeypatch):
+    requests_seen = []
+
+    def fake_get(url, headers=None, timeout=None):
+        requests_seen.append((url, headers))
+        if headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(status_code=304)
+        if url.endswith("text.html"):
+            return FakeResponse(
+                content=b"<html><body><p>Art. 1. Ustawa okre\xc5\x9bla</p></body></html>",
+                headers={"ETag": '"v2"'},
+            )
+        return FakeResponse(status_code=404)
+
+    monkeypatch.setattr(isap_sync.requests, "get", fake_get)
+    client = ELIClient(base_url="http://eli")
+
+    assert client.fetch_text("DU/2024/361", etag='"v1"') is None
+    fetched = client.fetch_text("DU/2024/361")
+    assert fetched["text"] == "Art. 1. Ustawa określa"
+    assert fetched["etag"] == '"v2"'
+    assert fetched["format"] == "html"
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.sql = []
+
+    def execute(self, sql, params=None):
+        self.sql.append(sql)
+
+    def fetchone(self):
+        return self.rows.pop(0)
+
+
+def test_update_returns_previous_content_for_event_diff():
+    spec = {"id": "WDU20040540535", "title": "Ustawa o VAT", "category": "vat"}
+    cur = FakeCursor([{"previous_content": "Art. 1. Stara treść"}])
+    result = isap_sync._store_document(cur, "vat", spec, {"document_id": 7}, "DU/2024/361", "Art. 1. Nowa treść")
+    assert result == (7, "DocumentUpdated", "Art. 1. Stara treść")
+    assert "FOR UPDATE" in cur.sql[0]
+
+    cur = FakeCursor([{"id": 8}])
+    assert isap_sync._store_document(cur, "vat", spec, None, "DU/2024/361", "Art. 1.") == (8, "DocumentCreated", None)
@@ -0,0 +1,165 @@
+"""
+Testy kolejki zadań: wykonanie handlera, ponowienia, anulowanie, API.
+"""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import jobs as jobs_router
+from services import jobs
+from services.jobs import JobCancelled, JobContext, Worker
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=()):
+        self.conn.statements.append((sql, params))
+
+    def fetchone(self):
+        if not self.conn.owned:
+            return None
+        return (self.conn.cancel_requested,)
+
+
+class FakeConnection:
+    def __init__(self, cancel_requested=False):
+        self.statements = []
+        self.cancel_requested = cancel_requested
+        self.owned = True
+        self.rollbacks = 0
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def _worker(monkeypatch):
+    outcomes = []
+    monkeypatch.setattr(jobs, "complete",
+                        lambda conn, job_id, result, worker_id: outcomes.append(("succeeded", result)) or "succeeded")
+    monkeypatch.setattr(jobs, "fail",
+                        lambda conn, job_id, error, worker_id, retry=True: outcomes.append(("failed", error, retry)) or "queued")
+    monkeypatch.setattr(jobs, "mark_cancelled", lambda conn, job_id, worker_id: outcomes.append(("cancelled",)) or True)
+    monkeypatch.setattr(Worker, "_heartbeat", lambda self, job_id, done: done.wait())
+    return Worker(), outcomes
+
+
+def _job(kind, **payload):
+    return {"id": 1, "kind": kind, "payload": payload, "attempts": 1, "max_attempts": 3}
+
+
+def test_worker_records_result_error_and_cancellation(monkeypatch):
+    worker, outcomes = _worker(monkeypatch)
+
+    def boom(ctx):
+        raise RuntimeError("ELI timeout")
+
+    def cancelled(ctx):
+        raise JobCancelled()
+
+    monkeypatch.setitem(jobs.HANDLERS, "test.ok", lambda ctx: {"echo": ctx.payload["value"]})
+    monkeypatch.setitem(jobs.HANDLERS, "test.boom", boom)
+    monkeypatch.setitem(jobs.HANDLERS, "test.cancel", cancelled)
+
+    conn = FakeConnection()
+    worker.execute(conn, _job("test.ok", value=42))
+    worker.execute(conn, _job("test.boom"))
+    worker.execute(conn, _job("test.cancel"))
+    worker.execute(conn, _job("test.unknown"))
+
+    assert outcomes[0] == ("succeeded", {"echo": 42})
+    assert outcomes[1] == ("failed", "RuntimeError: ELI timeout", True)
+    assert outcomes[2] == ("cancelled",)
+    assert outcomes[3][0] == "failed" and outcomes[3][2] is False  # brak handlera - bez ponowień
+    assert conn.rollbacks == 2
+
+
+def test_results_are_written_only_by_the_owning_worker():
+    conn = FakeConnection()
+    jobs.complete(conn, 1, {"ok": True}, "worker-a")
+    sql, params = conn.statements[-1]
+    assert "locked_by = %s AND status = 'running'" in sql and params[-2:] == (1, "worker-a")
+    assert "WHEN cancel_requested THEN 'cancelled'" in sql
+
+    jobs.fail(conn, 1, "boom", "worker-a")
+    sql, params = conn.statements[-1]
+    assert "locked_by = %s AND status = 'running'" in sql and params[-2:] == (1, "worker-a")
+
+    conn.owned = False  # requeue_stale oddał zadanie innemu workerowi
+    assert jobs.complete(conn, 1, {"ok": True}, "worker-a") is None
+    assert jobs.fail(conn, 1, "boom", "worker-a") is None
+
+
+def test_progress_is_throttled_and_raises_on_cancel():
+    conn = FakeConnection()
+    ctx = JobContext(conn, _job("test.ok"))
+    ctx.progress(1, 100)
+    ctx.progress(2, 100)  # w oknie JOB_PROGRESS_INTERVAL - bez zapisu
+    ctx.progress(100, 100)  # ostatni krok - zawsze
+    assert [params[0] for _, params in conn.statements] == [1, 100]
+
+    conn.cancel_requested = True
+    try:
+        JobContext(conn, _job("test.ok")).progress(1, 10)
+    except JobCancelled:
+        pass
+    else:
+        raise AssertionError("expected JobCancelled")
+
+
+def test_enqueue_rejects_unknown_kind():
+    try:
+        jobs.enqueue("no.such.kind")
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError")
+
+
+def test_jobs_api(monkeypatch):
+    app = FastAPI()
+    app.include_router(jobs_router.router)
+    client = TestClient(app)
+    enqueued = []
+    monkeypatch.setattr(jobs, "enqueue", lambda *args: enqueued.append(args) or 7)
+    monkeypatch.setattr(jobs, "cancel", lambda job_id: None)
+    monkeypatch.setattr(jobs, "get_job", lambda job_id: {"id": 7, "status": "succeeded"} if job_id == 7 else None)
+
+    created = client.post("/jobs", json={"kind": "ingestion.reindex", "payload": {"only_missing": False}})
+    assert created.status_code == 202
+    assert created.json()["id"] == 7
+    assert enqueued[0][:2] == ("ingestion.reindex", {"only_missing": False})
+
+    assert client.post("/jobs", json={"kind": "rm -rf"}).status_code == 400
+    assert client.get("/jobs/7").json()["status"] == "succeeded"
+    assert client.get("/jobs/8").status_code == 404
+    assert client.post("/jobs/7/cancel").status_code == 409
+    assert client.post("/jobs/8/cancel").status_code == 404
+
+
+def test_periodic_jobs_are_scheduled_once_per_kind(monkeypatch):
+    monkeypatch.setitem(jobs.HANDLERS, "test.periodic", lambda ctx: None)
+    monkeypatch.setattr(jobs, "PERIODIC", {})
+    jobs.every("test.periodic", 120)
+
+    class Cursor(FakeCursor):
+        rowcount = 1
+
+    conn = FakeConnection()
+    conn.cursor = lambda **kwargs: Cursor(conn)
+    assert jobs.schedule_periodic(conn) == ["test.periodic"]
+    assert jobs.schedule_periodic(conn, kinds=["isap.sync"]) == []
+    lock, insert = conn.statements[:2]
+    assert "pg_advisory_xact_lock" in lock[0]
+    assert "NOT EXISTS" in insert[0] and insert[1][0] == "test.periodic" and 120 in insert[1]
@@ -0,0 +1,106 @@
+"""
+Testy układów dashboardu: profil z tokenu, cache write-through, ETag/304.
+"""
+import jwt
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import layout
+from services import auth
+from services.layouts import DEFAULT_LAYOUT, LayoutStore
+
+
+class FakeStore(LayoutStore):
+    """LayoutStore z bazą w słowniku i licznikiem zapytań."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.rows = {}
+        self.queries = 0
+
+    def _load(self, profile):
+        self.queries += 1
+        row = self.rows.get(profile)
+        return row or (dict(DEFAULT_LAYOUT), 0)
+
+    def _store(self, profile, data):
+        self.queries += 1
+        version = self.rows.get(profile, (None, 0))[1] + 1
+        self.rows[profile] = (data, version)
+        return version
+
+
+def _client(monkeypatch, store):
+    monkeypatch.setattr(layout, "layout_store", store)
+    app = FastAPI()
+    app.include_router(layout.router)
+    return TestClient(app)
+
+
+def _auth(sub):
+    return {"Authorization": f"Bearer {jwt.encode({'sub': sub}, auth.JWT_SECRET, algorithm='HS256')}"}
+
+
+LAYOUT = {"modules": [{"id": "chat", "column": "right", "order": 0}]}
+
+
+def test_repeated_reads_hit_cache_and_revalidate_with_304(monkeypatch):
+    store = FakeStore()
+    client = _client(monkeypatch, store)
+
+    first = client.get("/layout")
+    assert first.status_code == 200
+    assert first.json() == DEFAULT_LAYOUT
+    etag = first.headers["etag"]
+
+    second = client.get("/layout", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert store.queries == 1
+
+
+def test_layouts_are_per_user_and_write_through(monkeypatch):
+    store = FakeStore()
+    client = _client(monkeypatch, store)
+
+    saved = client.post("/layout", json=LAYOUT, headers=_auth("user-1"))
+    assert saved.json() == {"status": "ok", "version": 1}
+    queries = store.queries
+
+    mine = client.get("/layout", headers=_auth("user-1"))
+    assert mine.json() == LAYOUT
+    assert mine.headers["etag"] == saved.headers["etag"]
+    assert store.queries == queries  # zapis trafił od razu do cache
+
+    assert client.get("/layout", headers=_auth("user-2")).json() == DEFAULT_LAYOUT
+    assert client.get("/layout").json() == DEFAULT_LAYOUT
+
+
+def test_save_with_invalid_token_does_not_touch_default_profile(monkeypatch):
+    store = FakeStore()
+    client = _client(monkeypatch, store)
+    expired = jwt.encode({"sub": "user-1", "exp": 1}, auth.JWT_SECRET, algorithm="HS256")
+
+    for headers in ({"Authorization": f"Bearer {expired}"}, {"Authorization": "Bearer forged"}):
+        response = client.post("/layout", json=LAYOUT, headers=headers)
+        assert response.status_code == 401
+    assert store.rows == {}
+    assert client.post("/layout", json=LAYOUT).json() == {"status": "ok", "version": 1}  # anonimowo bez nagłówka
+
+
+def test_save_changes_etag(monkeypatch):
+    store = FakeStore()
+    client = _client(monkeypatch, store)
+    before = client.get("/layout", headers=_auth("user-1")).headers["etag"]
+
+    client.post("/layout", json=LAYOUT, headers=_auth("user-1"))
+    after = client.get("/layout", headers={**_auth("user-1"), "If-None-Match": before})
+    assert after.status_code == 200
+    assert after.headers["etag"] != before
+
+
+def test_expired_entry_is_reloaded():
+    store = FakeStore(ttl=-1)
+    store.get("default")
+    store.get("default")
+    assert store.queries == 2
@@ -0,0 +1,50 @@
+"""
+Testy podziału aktów prawnych na artykuły, paragrafy i punkty.
+"""
+from services.ingestion import estimate_tokens
+from services.legal_chunker import LegalChunker, citation_path, looks_like_legal_text
+
+ACT = """USTAWA z dnia 26 czerwca 1974 r. Kodeks pracy
+
+Art. 1. Kodeks pracy określa prawa i obowiązki pracowników i pracodawców.
+
+Art. 22. § 1. Przez nawiązanie stosunku pracy pracownik zobowiązuje się do wykonywania pracy. """ + "a" * 2000 + """
+§ 1¹. Zatrudnienie w warunkach określonych w § 1 jest zatrudnieniem na podstawie stosunku pracy.
+§ 2. Pracownikiem może być osoba, która ukończyła 18 lat.
+
+Art. 106na. 1. Faktury ustrukturyzowane wystawia się przy użyciu KSeF. """ + "b" * 2000 + """
+2. Fakturę uznaje się za wystawioną w dniu:
+""" + "\n".join(f"{i}) przypadek {i} " + "c" * 300 for i in range(1, 7))
+
+
+def test_short_article_is_single_chunk():
+    chunks = LegalChunker(max_tokens=400).chunk(ACT, act="kodeks_pracy")
+    art1 = [c for c in chunks if c.metadata["article"] == "1"]
+    assert len(art1) == 1
+    assert art1[0].metadata["path"] == "art. 1"
+    assert chunks[0].metadata["unit"] == "preamble"
+
+
+def test_long_article_is_split_into_paragraphs_with_superscripts():
+    chunks = LegalChunker(max_tokens=400).chunk(ACT, act="kodeks_pracy")
+    paths = [c.metadata["path"] for c in chunks if c.metadata["article"] == "22"]
+    assert "art. 22 § 1¹" in paths and "art. 22 § 2" in paths
+    sup = next(c for c in chunks if c.metadata["path"] == "art. 22 § 1¹")
+    assert sup.content.startswith("Art. 22 § 1¹.")
+    assert sup.metadata["act"] == "kodeks_pracy"
+
+
+def test_points_are_grouped_within_token_bound():
+    max_tokens = 300
+    chunks = LegalChunker(max_tokens=max_tokens).chunk(ACT, act="ustawa_vat")
+    points = [c for c in chunks if c.metadata["unit"] == "point"]
+    assert points and all(c.metadata["paragraph"] == "2" for c in points)
+    assert points[0].metadata["path"].startswith("art. 106na ust. 2 pkt 1")
+    assert all("Fakturę uznaje się za wystawioną" in c.content for c in points)
+    assert all(estimate_tokens(c.content) <= max_tokens for c in chunks)
+
+
+def test_detection_and_citation_path():
+    assert looks_like_legal_text(ACT)
+    assert not looks_like_legal_text("Zwykły list bez artykułów.\n\nDrugi akapit.")
+    assert citation_path("106na", "1", "2", "section") == "art. 106na ust. 1 pkt 2"
@@ -0,0 +1,86 @@
+"""
+Testy metryk Prometheus (/metrics, histogramy tras i etapów).
+"""
+from contextlib import contextmanager
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import metrics
+from services.data_sources import get_data_sources_service
+from services.metrics import MetricsMiddleware, observe_generation, stage
+from services.rag import RAGService
+
+
+def _client():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics.router)
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int):
+        return {"id": item_id}
+
+    return TestClient(app)
+
+
+def test_request_histogram_uses_route_template():
+    client = _client()
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/missing")
+    body = client.get("/metrics").text
+    assert 'bielik_http_request_duration_seconds_count{method="GET",route="/items/{item_id}",status="200"}' in body
+    assert 'route="unmatched",status="404"' in body
+    assert "/items/1" not in body
+
+
+def test_stage_and_generation_metrics_are_exported():
+    # Serwis rejestrów powstaje leniwie - statystyki cache pojawiają się po pierwszym użyciu
+    get_data_sources_service()
+    with stage("embedding"):
+        pass
+    observe_generation({"eval_count": 100, "eval_duration": 5_000_000_000,
+                        "prompt_eval_count": 400, "prompt_eval_duration": 2_000_000_000})
+    body = _client().get("/metrics").text
+    assert 'bielik_stage_duration_seconds_count{stage="embedding"}' in body
+    assert "bielik_ollama_generation_tokens_per_second_bucket" in body
+    assert 'bielik_ollama_tokens_total{kind="prompt"}' in body
+    assert 'bielik_db_pool_connections{state="max"}' in body
+    assert 'bielik_cache_hit_ratio{cache="ceidg"}' in body
+
+
+def test_no_embeddings_fallback_runs_after_connection_is_released(monkeypatch):
+    held = []
+
+    class Cursor:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            pass
+
+        def execute(self, sql, params=None):
+            pass
+
+        def fetchone(self):
+            return {"count": 0}
+
+    class Connection:
+        def cursor(self, cursor_factory=None):
+            return Cursor()
+
+    @contextmanager
+    def connection():
+        held.append(1)
+        try:
+            yield Connection()
+        finally:
+            held.pop()
+
+    rag = RAGService()
+    monkeypatch.setattr(rag, "get_db_connection", connection)
+    # z DB_POOL_MAX równoległymi wyszukiwaniami drugi slot puli nigdy by się nie zwolnił
+    monkeypatch.setattr(rag, "_text_search", lambda *args: [{"held": len(held)}])
+    assert rag.search_similar("VAT", embedding=[0.1]) == [{"held": 0}]
+    assert 'bielik_search_fallbacks_total{reason="no_embeddings"}' in _client().get("/metrics").text
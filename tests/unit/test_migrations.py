@@ -0,0 +1,52 @@
+"""
+Testy runnera migracji (odkrywanie plików, podział instrukcji).
+"""
+import re
+
+import pytest
+
+from services.migrations import MIGRATIONS_DIR, discover, split_statements
+
+
+def test_repository_migrations_are_ordered_and_start_with_baseline():
+    migrations = discover(MIGRATIONS_DIR)
+    versions = [m.version for m in migrations]
+    assert versions[0] == "0001" and versions == sorted(versions)
+    assert all(m.transactional for m in migrations[:2])
+    assert "CREATE TABLE documents" in migrations[0].sql
+
+
+def test_upgrades_after_baseline_are_idempotent():
+    """Baza z pierwotnego init.sql dostaje 0001 jako baseline - kolejne migracje muszą ją dogonić."""
+    migrations = discover(MIGRATIONS_DIR)
+    assert "user_id" not in migrations[0].sql and "PARTITION BY" not in migrations[0].sql
+    upgrades = [m for m in migrations if "0002" <= m.version <= "0008"]
+    assert len(upgrades) == 7
+    for migration in upgrades:
+        statements = re.findall(r"^(CREATE (?:TABLE|INDEX)|ALTER TABLE \w+ ADD COLUMN)\b(.*)$", migration.sql, re.M)
+        assert statements and all(rest.lstrip().startswith("IF NOT EXISTS") or "IF NOT EXISTS" in rest
+                                  for _, rest in statements), migration.name
+
+
+def test_discover_rejects_duplicate_versions(tmp_path):
+    (tmp_path / "0001_a.sql").write_text("SELECT 1;")
+    (tmp_path / "0001_b.sql").write_text("SELECT 2;")
+    (tmp_path / "notes.sql").write_text("-- pominięty")
+    with pytest.raises(ValueError):
+        discover(tmp_path)
+
+
+def test_no_transaction_migration_is_split_into_statements(tmp_path):
+    path = tmp_path / "0003_index.sql"
+    path.write_text(
+        "-- migrate:no-transaction\n"
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_a ON t(a);\n"
+        "\n"
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_b\n    ON t(b);\n"
+    )
+    migration = discover(tmp_path)[0]
+    assert not migration.transactional
+    assert split_statements(migration.sql) == [
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_a ON t(a);",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_b\n    ON t(b);",
+    ]
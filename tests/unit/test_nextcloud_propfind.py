@@ -0,0 +1,115 @@
+"""
+Testy parsowania odpowiedzi WebDAV PROPFIND z Nextcloud i kolejki indeksowania.
+"""
+import io
+import xml.etree.ElementTree as ET
+
+import requests
+
+from services import nextcloud
+from services.nextcloud import DAV, _parse_response
+
+MULTISTATUS = b"""<?xml version="1.0"?>
+<d:multistatus xmlns:d="DAV:">
+  <d:response>
+    <d:href>/remote.php/dav/files/admin/e-Doreczenia/INBOX/</d:href>
+    <d:propstat>
+      <d:prop><d:getetag>"folder-etag"</d:getetag><d:resourcetype><d:collection/></d:resourcetype></d:prop>
+      <d:status>HTTP/1.1 200 OK</d:status>
+    </d:propstat>
+  </d:response>
+  <d:response>
+    <d:href>/remote.php/dav/files/admin/e-Doreczenia/INBOX/Pismo%20US.eml</d:href>
+    <d:propstat>
+      <d:prop>
+        <d:getetag>"abc123"</d:getetag>
+        <d:getlastmodified>Mon, 05 Jan 2026 10:15:00 GMT</d:getlastmodified>
+        <d:getcontentlength>2048</d:getcontentlength>
+        <d:resourcetype/>
+      </d:prop>
+      <d:status>HTTP/1.1 200 OK</d:status>
+    </d:propstat>
+  </d:response>
+</d:multistatus>"""
+
+
+def _parse_all():
+    entries = []
+    for _, elem in ET.iterparse(io.BytesIO(MULTISTATUS), events=("end",)):
+        if elem.tag == f"{DAV}response":
+            entries.append(_parse_response(elem))
+    return entries
+
+
+class TestPropfindParsing:
+    """Strumieniowy parser <d:response>."""
+
+    def test_folder_entry(self):
+        folder = _parse_all()[0]
+        assert folder["is_dir"] is True
+        assert folder["etag"] == "folder-etag"
+        assert folder["filename"] == "INBOX"
+
+    def test_file_entry(self):
+        message = _parse_all()[1]
+        assert message["filename"] == "Pismo US.eml"
+        assert message["etag"] == "abc123"
+        assert message["size"] == 2048
+        assert message["is_dir"] is False
+        assert message["last_modified"].year == 2026
+
+
+class _IngestCursor:
+    def __init__(self, log, rows):
+        self.log, self.rows = log, rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.log.append(" ".join(sql.split()))
+
+    def fetchone(self):
+        return (True,)
+
+    def fetchall(self):
+        return self.rows
+
+
+class _IngestConnection:
+    def __init__(self, log, rows):
+        self.log, self.rows = log, rows
+
+    def cursor(self, **kwargs):
+        return _IngestCursor(self.log, self.rows)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_every_ingest_failure_is_recorded_with_backoff(monkeypatch):
+    log = []
+    rows = [{"path": f"INBOX/{i}.pdf", "etag": f'"{i}"'} for i in range(2)]
+    errors = iter([requests.HTTPError("403 Forbidden"), KeyError("parser")])
+
+    def fail(conn, client, user_id, entry):
+        raise next(errors)
+
+    monkeypatch.setattr(nextcloud.psycopg2, "connect", lambda url: _IngestConnection(log, rows))
+    monkeypatch.setattr(nextcloud, "_remove_deleted", lambda conn, owner: 0)
+    monkeypatch.setattr(nextcloud, "_ingest_file", fail)
+
+    summary = nextcloud.ingest_pending(user_id="u1", batch=20)
+    assert summary["failed"] == 2
+    assert "s.retry_after <= NOW()" in next(sql for sql in log if sql.startswith("SELECT f.path"))
+    recorded = [sql for sql in log if sql.startswith("INSERT INTO nextcloud_ingest_state")]
+    assert len(recorded) == 2 and all("retry_after" in sql and "attempts" in sql for sql in recorded)
@@ -0,0 +1,88 @@
+"""
+Testy routingu pytań z modułu "default" do modułów tematycznych.
+"""
+import contextlib
+import threading
+
+from services import rag, shared_state
+from services.query_router import QueryRouter, keyword_modules
+
+
+def test_keywords_pick_unambiguous_module():
+    router = QueryRouter()
+    assert router.route_keywords("Od kiedy KSeF jest obowiązkowy dla faktur?").module == "ksef"
+    assert router.route_keywords("Ile wynosi składka zdrowotna w ZUS?").module == "zus"
+    assert not router.route_keywords("Jak założyć firmę?").routed
+    assert not router.route_keywords("VAT a ZUS").routed  # remis -> centroidy
+
+
+def test_centroids_break_ties():
+    router = QueryRouter(check_interval=3600)
+    router.set_centroids({"vat": [1.0, 0.0, 0.0], "zus": [0.0, 1.0, 0.0], "other": [0.0, 0.0, 1.0]})
+    route = router.route_embedding([0.9, 0.1, 0.0])
+    assert (route.module, route.method) == ("vat", "centroid")
+    assert not router.route_embedding([0.5, 0.5, 0.0]).routed
+    assert not router.route_embedding([]).routed
+
+
+def test_centroids_reload_in_background_only_after_version_change(monkeypatch):
+    versions, loads, release = [1], [], threading.Event()
+
+    class Connection:
+        def cursor(self, **kwargs):
+            return contextlib.nullcontext()
+
+        def close(self):
+            pass
+
+    def load(conn):
+        loads.append(versions[-1])
+        if versions[-1] > 1:
+            release.wait(5)
+            return {"vat": [0.0, 1.0], "zus": [1.0, 0.0]}
+        return {"vat": [1.0, 0.0], "zus": [0.0, 1.0]}
+
+    monkeypatch.setattr(shared_state.psycopg2, "connect", lambda url: Connection())
+    monkeypatch.setattr(shared_state, "knowledge_base_version", lambda cur: versions[-1])
+    router = QueryRouter(check_interval=0)
+    monkeypatch.setattr(router, "_load", load)
+
+    assert router.warm() == 2 and router.warm() == 2
+    assert router.route_embedding([1.0, 0.1]).module == "vat"
+    router._refresh_thread.join(5)
+    assert loads == [1]  # ta sama wersja - bez przeładowania
+
+    versions.append(2)
+    assert router.route_embedding([1.0, 0.1]).module == "vat"
+    # Ładowanie trwa w tle, a routing od razu używa poprzednich centroidów
+    assert router.route_embedding([1.0, 0.1]).module == "vat"
+    release.set()
+    router._refresh_thread.join(5)
+    assert loads == [1, 2]
+    assert router.route_embedding([1.0, 0.1]).module == "zus"
+
+
+def test_channel_heuristic_shares_keywords():
+    assert keyword_modules("umowa b2b - faktury ksef.pdf") == {"b2b", "ksef"}
+
+
+def test_default_chat_is_routed_without_extra_embedding(monkeypatch):
+    service = rag.RAGService()
+    calls = {}
+
+    def search(query, category=None, limit=5, user_id=None, embedding=None):
+        calls["category"], calls["embedding"] = category, embedding
+        return [{"title": "Składki", "source": "ZUS", "category": "zus", "similarity": 0.8}]
+
+    def generate(query, context, module):
+        calls["module"] = module
+        return "odpowiedź"
+
+    monkeypatch.setattr(service, "citation_context", lambda query: [])
+    monkeypatch.setattr(service, "get_embedding", lambda text: (_ for _ in ()).throw(AssertionError()))
+    monkeypatch.setattr(service, "search_similar", search)
+    monkeypatch.setattr(service, "generate_response", generate)
+
+    result = service.chat("Ile wynosi składka emerytalna?")
+    assert result["module"] == "default" and result["routed_module"] == "zus"
+    assert calls == {"category": "zus", "embedding": None, "module": "zus"}
@@ -0,0 +1,103 @@
+"""
+Testy cache rejestrów (services/cache.py) - tylko poziom L1, bez bazy.
+"""
+import threading
+import time
+
+from services.cache import RegistryCache
+
+
+def make_cache(**kwargs):
+    kwargs.setdefault("use_db", False)
+    return RegistryCache("test", **kwargs)
+
+
+def test_positive_and_negative_results_have_separate_ttls():
+    cache = make_cache(positive_ttl=60, negative_ttl=0, stale_ttl=0)
+    calls = []
+
+    def loader(value):
+        def load():
+            calls.append(value)
+            return value
+        return load
+
+    assert cache.get("found", loader({"name": "ACME"})) == {"name": "ACME"}
+    assert cache.get("found", loader({"name": "other"})) == {"name": "ACME"}
+    assert cache.get("missing", loader(None)) is None
+    assert cache.get("missing", loader(None)) is None
+    assert calls == [{"name": "ACME"}, None, None]
+
+
+def test_stale_entry_is_served_and_refreshed_in_background():
+    cache = make_cache(positive_ttl=0, stale_ttl=60)
+    cache.get("nip", lambda: {"v": 1})
+    refreshed = threading.Event()
+
+    def refresh():
+        refreshed.set()
+        return {"v": 2}
+
+    assert cache.get("nip", refresh) == {"v": 1}
+    assert refreshed.wait(2)
+    for _ in range(50):
+        if cache._l1_get("nip").value == {"v": 2}:
+            break
+        time.sleep(0.01)
+    assert cache._l1_get("nip").value == {"v": 2}
+    assert cache.stats["stale_hits"] == 1
+
+
+def test_peek_never_waits_for_the_registry():
+    cache = make_cache(positive_ttl=60)
+    release, loaded = threading.Event(), threading.Event()
+
+    def slow():
+        release.wait(2)
+        loaded.set()
+        return {"name": "ACME"}
+
+    assert cache.peek("nip") is None
+    assert cache.peek("nip", slow) is None  # brak wpisu - pobranie w tle
+    release.set()
+    assert loaded.wait(2)
+    for _ in range(50):
+        if cache.peek("nip") is not None:
+            break
+        time.sleep(0.01)
+    assert cache.peek("nip") == {"name": "ACME"}
+
+
+def test_registry_errors_are_not_cached_and_fall_back():
+    cache = make_cache(positive_ttl=0, stale_ttl=0)
+    cache.get("nip", lambda: {"v": 1})
+
+    def failing():
+        raise RuntimeError("timeout")
+
+    assert cache.get("nip", failing) == {"v": 1}
+    assert cache.get("nip", lambda: {"v": 3}) == {"v": 3}
+    assert cache.stats["errors"] == 1
+
+
+def test_concurrent_lookups_share_one_upstream_call():
+    cache = make_cache()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(2)
+        return {"v": 1}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("nip", slow))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert calls == [1]
+    assert results == [{"v": 1}] * 5
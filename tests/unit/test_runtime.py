@@ -0,0 +1,100 @@
+"""
+Testy wdrożenia wieloprocesowego: budżety per worker, preload przed fork,
+konfiguracja gunicorna.
+"""
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+
+from services import migrations, warmup
+from services.citations import citation_index
+from services.db import db_pool
+from services.query_router import query_router
+from services.runtime import per_worker, per_worker_int
+from services.tracing import SpanExporter
+
+GUNICORN_CONF = Path(__file__).resolve().parents[2] / "modules" / "api" / "gunicorn.conf.py"
+
+
+def test_per_worker_splits_budget():
+    assert per_worker_int(64, minimum=2, workers=16) == 4
+    assert per_worker_int(10, minimum=2, workers=16) == 2
+    assert per_worker_int(10, workers=1) == 10
+    assert per_worker(5.0, minimum=0.1, workers=16) == 5.0 / 16
+    assert per_worker(1.0, minimum=0.1, workers=100) == 0.1
+    # 0 = bez limitu - nie zamienia się w minimalny limit
+    assert per_worker(0.0, minimum=0.1, workers=16) == 0.0
+
+
+def test_preload_warms_state_and_releases_connections(monkeypatch):
+    calls = []
+    monkeypatch.setattr(migrations, "MIGRATE_ON_STARTUP", True)
+    monkeypatch.setattr(migrations, "migrate", lambda: calls.append("migrate") or ["0001_initial"])
+    monkeypatch.setattr(citation_index, "warm", lambda: 42)
+    monkeypatch.setattr(query_router, "warm", lambda: 0)
+    monkeypatch.setattr(query_router, "invalidate", lambda: calls.append("router-invalidate"))
+    monkeypatch.setattr(db_pool, "close", lambda: calls.append("pool-close"))
+
+    report = warmup.preload()
+
+    assert report["migrations"] == ["0001_initial"]
+    assert report["citation_index"]["size"] == 42
+    assert report["query_router"]["size"] == 0
+    # migracje raz w masterze, workery pomijają je w lifespan
+    assert migrations.MIGRATE_ON_STARTUP is False
+    assert calls == ["migrate", "router-invalidate", "pool-close"]
+
+
+def test_preload_survives_database_errors(monkeypatch):
+    invalidated = []
+
+    def fail():
+        raise OSError("connection refused")
+
+    monkeypatch.setattr(migrations, "MIGRATE_ON_STARTUP", False)
+    monkeypatch.setattr(citation_index, "warm", fail)
+    monkeypatch.setattr(citation_index, "invalidate", lambda: invalidated.append("citations"))
+    monkeypatch.setattr(query_router, "warm", lambda: 3)
+    monkeypatch.setattr(db_pool, "close", lambda: None)
+
+    report = warmup.preload()
+
+    assert report["citation_index"] is None
+    assert report["query_router"]["size"] == 3
+    assert invalidated == ["citations"]
+
+
+def test_preload_stops_on_failed_migration(monkeypatch):
+    def fail():
+        raise RuntimeError("relation documents has no column user_id")
+
+    monkeypatch.setattr(migrations, "MIGRATE_ON_STARTUP", True)
+    monkeypatch.setattr(migrations, "migrate", fail)
+    with pytest.raises(RuntimeError):
+        warmup.preload()
+
+
+def test_exporter_reset_after_fork_drops_parent_thread():
+    exporter = SpanExporter(path="/dev/null", max_queue=5)
+    exporter._thread = object()
+    exporter._queue.put_nowait("span")
+    exporter.reset_after_fork()
+    assert exporter._thread is None
+    assert exporter._queue.empty()
+    assert exporter._queue.maxsize == 5
+
+
+def test_gunicorn_config_exports_worker_count(monkeypatch, tmp_path):
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path / "prom"))
+    spec = importlib.util.spec_from_file_location("gunicorn_conf", GUNICORN_CONF)
+    conf = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(conf)
+
+    assert conf.workers == 3
+    assert conf.preload_app is True
+    assert conf.worker_class == "uvicorn.workers.UvicornWorker"
+    assert os.environ["WEB_CONCURRENCY"] == "3"
+    assert (tmp_path / "prom").is_dir()
@@ -0,0 +1,68 @@
+"""
+Testy zimnego startu: czas importu aplikacji (-X importtime) i leniwe
+tworzenie serwisów.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from services import warmup
+
+API_DIR = Path(__file__).resolve().parents[2] / "modules" / "api"
+
+# Łączny czas własny modułów aplikacji (main, routers.*, services.*) - bez
+# fastapi/pydantic, na które nie mamy wpływu. Budżet z zapasem na wolne CI.
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
+
+PROBE = (
+    "import main\n"
+    "from services import data_sources, rag\n"
+    "assert rag._rag_service is None, 'rag_service created at import'\n"
+    "assert data_sources._service is None, 'data_sources_service created at import'\n"
+)
+
+
+def _import_report():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=API_DIR, capture_output=True, text=True, timeout=120,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def test_app_import_within_budget_and_without_side_effects():
+    modules = _import_report()
+    own = {name: times for name, times in modules.items()
+           if name == "main" or name.startswith(("routers.", "services."))}
+    total_ms = sum(self_us for self_us, _ in own.values()) / 1000
+    slowest = sorted(own.items(), key=lambda item: item[1][0], reverse=True)[:5]
+    report = ", ".join(f"{name}={self_us / 1000:.1f}ms" for name, (self_us, _) in slowest)
+    assert total_ms < IMPORT_TIME_BUDGET_MS, f"app import {total_ms:.0f}ms > {IMPORT_TIME_BUDGET_MS:.0f}ms ({report})"
+    # Parser PDF potrzebny tylko przy ingestii
+    assert "pypdf" not in modules
+
+
+def test_warm_reports_failed_steps_without_raising(monkeypatch):
+    def unavailable():
+        raise ConnectionError("ollama down")
+
+    monkeypatch.setattr(warmup, "warm_database", lambda: 1)
+    monkeypatch.setattr(warmup, "warm_models", unavailable)
+    from services.citations import citation_index
+    from services.query_router import query_router
+    monkeypatch.setattr(citation_index, "warm", lambda: 10)
+    monkeypatch.setattr(query_router, "warm", lambda: 4)
+
+    report = warmup.warm()
+
+    assert report["database"]["ok"] and report["citation_index"]["result"] == 10
+    assert report["models"] == {"ok": False, "error": "ollama down"}
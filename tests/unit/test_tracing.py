@@ -0,0 +1,80 @@
+"""
+Testy tracingu: hierarchia spanów, traceparent i eksport JSONL.
+"""
+import json
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from services import rag, tracing
+from services.tracing import SpanExporter, TraceContextFilter, TracingMiddleware, parse_traceparent, span
+
+
+def test_child_spans_share_trace(monkeypatch):
+    exported = []
+    monkeypatch.setattr(tracing.exporter, "export", exported.append)
+    with span("rag.chat", module="vat") as root:
+        with span("embedding"):
+            pass
+        with span("db.vector_search"):
+            tracing.set_attribute("db.rows", 3)
+    names = [s.name for s in exported]
+    assert names == ["embedding", "db.vector_search", "rag.chat"]
+    assert {s.trace_id for s in exported} == {root.trace_id}
+    assert exported[1].parent_id == root.span_id and exported[1].attributes["db.rows"] == 3
+    assert tracing.current_span() is None
+
+
+def test_middleware_continues_incoming_trace_and_sets_headers(monkeypatch):
+    exported = []
+    monkeypatch.setattr(tracing.exporter, "export", exported.append)
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware)
+
+    @app.get("/api/v1/items/{item_id}")
+    def item(item_id: int):
+        with span("work"):
+            return {"trace": tracing.current_trace_id()}
+
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+    response = TestClient(app).get(
+        "/api/v1/items/7", headers={"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"}
+    )
+    assert response.json()["trace"] == trace_id
+    assert response.headers["x-trace-id"] == trace_id
+    assert parse_traceparent(response.headers["traceparent"])[0] == trace_id
+    server = exported[-1]
+    assert server.name == "GET /api/v1/items/{item_id}" and server.parent_id == "00f067aa0ba902b7"
+    assert server.attributes["http.status_code"] == 200
+
+
+def test_jsonl_export_and_log_filter(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    exporter = SpanExporter(path=str(path), otlp_endpoint="")
+    with span("generate") as current:
+        record = logging.LogRecord("x", logging.INFO, __file__, 1, "msg", None, None)
+        TraceContextFilter().filter(record)
+        assert record.trace_id == current.trace_id
+    exporter.flush([current])
+    line = json.loads(path.read_text().splitlines()[0])
+    assert line["name"] == "generate" and line["duration_ms"] is not None
+    assert parse_traceparent("00-" + "0" * 32 + "-00f067aa0ba902b7-01") is None
+
+
+def test_generation_token_counts_are_set_before_span_ends(monkeypatch):
+    exported = []
+    monkeypatch.setattr(tracing.exporter, "export", lambda s: exported.append((s.name, dict(s.attributes))))
+
+    class Response:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"response": "Odpowiedź", "prompt_eval_count": 120, "eval_count": 30}
+
+    monkeypatch.setattr(rag.requests, "post", lambda *args, **kwargs: Response())
+    assert rag.RAGService().generate_response("Pytanie", []) == "Odpowiedź"
+    # migawka atrybutów w chwili eksportu - później ustawione już by do niej nie trafiły
+    attributes = dict(exported)["generate"]
+    assert attributes["llm.prompt_tokens"] == 120 and attributes["llm.completion_tokens"] == 30